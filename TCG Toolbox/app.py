@@ -1,24 +1,35 @@
+import time
+_T0 = time.perf_counter()  # startup timing includes our own imports
+
 import sys
+import atexit
 import logging
 import threading
 from pathlib import Path
 from datetime import datetime
 from shutil import copy2
+from typing import Optional
 
-from PySide6.QtWidgets import QApplication
+from PySide6.QtWidgets import QApplication, QLabel
 from PySide6.QtGui import QAction
 from PySide6.QtCore import QTimer
 
 from ui.main_window import MainWindow
-from modules.logger.plugin import register as register_logger
+from ui.plugins import register_plugins
+from ui.watchdog import UiWatchdog, watch_timer
 
 from core.log_stream import QueueLogHandler
-from providers.scryfall.ingest import run_scryfall_sets_cards
-from modules.catalog_browser.plugin import register as register_catalog_browser
+from core.log_writer import RotatingLogWriter
+from core.startup import PhaseTimer
 
 
 DEFAULT_LOG_LEVEL = "DEBUG"  # INFO for quieter runs
 
+LOG_MAX_BYTES = 20 * 1024 * 1024
+LOG_BACKUPS = 10
+
+_log_writer: Optional[RotatingLogWriter] = None
+
 
 def _install_file_logging() -> Path:
     log_dir = Path.home() / ".tcg_toolbox"
@@ -26,7 +37,8 @@ def _install_file_logging() -> Path:
     return log_dir / "app.log"
 
 
-def setup_logging(log_file: Path):
+def setup_logging(log_file: Path) -> RotatingLogWriter:
+    global _log_writer
     fmt = logging.Formatter("%(asctime)s | %(levelname)s | %(name)s | %(message)s")
 
     root = logging.getLogger()
@@ -34,36 +46,46 @@ def setup_logging(log_file: Path):
 
     # Prevent duplicates if you rerun in IDE
     root.handlers = []
+    if _log_writer is not None:
+        _log_writer.stop()
 
     # UI queue handler
     qh = QueueLogHandler()
     qh.setLevel(logging.NOTSET)
-    qh.setFormatter(fmt)
     root.addHandler(qh)
 
-    # File handler (full fidelity)
-    fh = logging.FileHandler(log_file, encoding="utf-8")
-    fh.setLevel(logging.NOTSET)
-    fh.setFormatter(fmt)
-    root.addHandler(fh)
+    # File output (full fidelity) happens on a writer thread: callers only enqueue
+    _log_writer = RotatingLogWriter(log_file, fmt, max_bytes=LOG_MAX_BYTES, backup_count=LOG_BACKUPS)
+    _log_writer.start()
+    atexit.register(_log_writer.stop)
+    root.addHandler(_log_writer.handler())
 
     # Silence noisy libs if you run DEBUG
     logging.getLogger("urllib3").setLevel(logging.WARNING)
     logging.getLogger("requests").setLevel(logging.WARNING)
+    return _log_writer
 
 
 def main():
+    phases = PhaseTimer(_T0)
+    phases.mark("imports")
+
+    # Logging first: records queue up until the Logger dock exists
+    log_file = _install_file_logging()
+    log_writer = setup_logging(log_file)
+    phases.mark("logging")
+
     app = QApplication(sys.argv)
+    app.aboutToQuit.connect(log_writer.stop)
+    phases.mark("qt")
 
     window = MainWindow()
     window.resize(1200, 800)
+    phases.mark("window")
 
-    # Register Logger dock first (so UI exists)
-    register_logger(window)
-    register_catalog_browser(window)
-
-    log_file = _install_file_logging()
-    setup_logging(log_file)
+    # Panels are discovered here but only imported/built when first shown
+    plugins = register_plugins(window)
+    phases.mark(f"plugins ({len(plugins)})")
 
     log = logging.getLogger("TCG Toolbox")
     log.info("Logger pipeline online")
@@ -78,7 +100,9 @@ def main():
 
         def _target():
             try:
-                run_scryfall_sets_cards(max_sets=5, throttle_seconds=0.12)
+                from providers.scryfall.ingest import run_scryfall_sets_cards
+
+                run_scryfall_sets_cards(max_sets=5, concurrency=4)
             except Exception:
                 log.exception("Scryfall ingest thread crashed unexpectedly")
 
@@ -86,6 +110,22 @@ def main():
         window._bg_threads.append(t)
         t.start()
 
+    def start_scryfall_bulk_ingest():
+        log.info("Menu action: syncing Scryfall bulk data")
+        window.statusBar().showMessage("Syncing Scryfall bulk data...")
+
+        def _target():
+            try:
+                from providers.scryfall.ingest import run_scryfall_bulk
+
+                run_scryfall_bulk("default_cards")
+            except Exception:
+                log.exception("Scryfall bulk ingest thread crashed unexpectedly")
+
+        t = threading.Thread(target=_target, daemon=True)
+        window._bg_threads.append(t)
+        t.start()
+
     def save_log_snapshot():
         try:
             ts = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -93,6 +133,7 @@ def main():
             dst_dir = Path.home() / ".tcg_toolbox" / "log_snapshots"
             dst_dir.mkdir(parents=True, exist_ok=True)
             dst = dst_dir / f"app_{ts}.log"
+            log_writer.flush()
             copy2(src, dst)
             log.info(f"Saved log snapshot: {dst}")
             window.statusBar().showMessage(f"Saved log snapshot: {dst}")
@@ -105,22 +146,80 @@ def main():
     run_ingest_action.triggered.connect(start_scryfall_ingest)
     window.file_menu.addAction(run_ingest_action)
 
+    run_bulk_action = QAction("Sync Scryfall Bulk Data (all cards)", window)
+    run_bulk_action.triggered.connect(start_scryfall_bulk_ingest)
+    window.file_menu.addAction(run_bulk_action)
+
     save_snapshot_action = QAction("Save Log Snapshot", window)
     save_snapshot_action.triggered.connect(save_log_snapshot)
     window.file_menu.addAction(save_snapshot_action)
 
+    # Profiling: one run at a time, toggled from the menu; files go to ~/.tcg_toolbox/profiles
+    profile_menu = window.file_menu.addMenu("Profile")
+    profile_actions = {}
+    profile_session = []
+    profile_label = QLabel()
+    profile_label.hide()
+    window.statusBar().addPermanentWidget(profile_label)
+
+    def toggle_profile(mode: str, checked: bool):
+        from core.profiling import ProfileSession
+
+        try:
+            if checked:
+                session = ProfileSession(mode)
+                session.start()
+                profile_session[:] = [session]
+            elif profile_session:
+                written = profile_session.pop().stop()
+                if written:
+                    window.statusBar().showMessage(f"Profile saved: {written[0]}", 10_000)
+        except Exception:
+            profile_session.clear()
+            log.exception("Profiling failed")
+            window.statusBar().showMessage("Profiling failed (see app.log)")
+        running = bool(profile_session)
+        profile_label.setText(f"Profiling ({mode}) - File > Profile to stop")
+        profile_label.setVisible(running)
+        for other, action in profile_actions.items():
+            action.setEnabled(not running or other == mode)
+            if not running:
+                action.setChecked(False)
+
+    for mode, label in (("cprofile", "cProfile (GUI thread)"), ("sampling", "Sampling (all threads, incl. ingest)")):
+        action = QAction(label, window)
+        action.setCheckable(True)
+        action.toggled.connect(lambda checked, m=mode: toggle_profile(m, checked))
+        profile_menu.addAction(action)
+        profile_actions[mode] = action
+
     # Status polling (no Qt from worker threads)
     def poll_threads():
+        # "Ready" only when the last sync finishes, so other status messages stay up
+        was_busy = bool(window._bg_threads)
         window._bg_threads[:] = [t for t in window._bg_threads if t.is_alive()]
-        if not window._bg_threads:
+        if was_busy and not window._bg_threads:
             window.statusBar().showMessage("Ready")
 
     status_timer = QTimer(window)
     status_timer.setInterval(200)
-    status_timer.timeout.connect(poll_threads)
+    watch_timer(status_timer, poll_threads, "app.poll_threads")
     status_timer.start()
 
+    # Names whatever blocks the event loop (timer callbacks and everything else)
+    watchdog = UiWatchdog(window)
+    watchdog.start()
+    app.aboutToQuit.connect(watchdog.stop)
+
+    # First event-loop turn = window up and taking input. Queued before show()
+    # so it runs ahead of the lazy panels, which build on the following turns.
+    def interactive():
+        phases.mark("first event loop turn")
+        log.info(f"Startup: {phases.summary()}")
+
+    QTimer.singleShot(0, interactive)
     window.show()
+    phases.mark("show")
     sys.exit(app.exec())
 
 
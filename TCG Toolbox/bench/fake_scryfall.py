@@ -0,0 +1,366 @@
+"""
+Local stand-in for the parts of the Scryfall API the toolbox uses:
+
+    GET /sets                              every synthetic set
+    GET /cards/search?q=e:<code>&page=N    one page of a set's cards
+    POST /cards/collection                 up to 75 identifiers (id / name / set + collector_number)
+
+Payloads are deterministic for a given (sets, cards_per_set, seed), so
+runs are comparable across commits. Latency, 5xx errors and 429s (with
+Retry-After) can be injected to exercise the transport's retry paths.
+ETag / If-None-Match is honoured like the real API.
+
+Run it standalone and point the app or cli.py at it:
+
+    python -m bench.fake_scryfall --port 8765 --latency 0.05
+    TCG_SCRYFALL_BASE_URL=http://127.0.0.1:8765 python cli.py sync --sets 0
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, quote, urlsplit
+
+_SYLLABLES = ("ar", "bel", "cor", "dra", "el", "fen", "gor", "hal", "ith", "jor", "kel", "lum",
+              "mor", "nyx", "or", "pyr", "quel", "ras", "sil", "tor", "ul", "vor", "wyn", "zel")
+_TYPES = ("Creature — Elf Druid", "Instant", "Sorcery", "Enchantment", "Artifact",
+          "Creature — Human Wizard", "Land", "Legendary Creature — Dragon", "Planeswalker — Vess")
+_RARITIES = ("common", "common", "common", "uncommon", "uncommon", "rare", "mythic")
+_NAMESPACE = uuid.UUID("6f1c1f0e-2a52-4c0b-9a7e-5c6b2f0d7a11")
+
+
+@dataclass
+class FakeScryfallConfig:
+    sets: int = 20
+    cards_per_set: int = 350
+    page_size: int = 175          # Scryfall's own page size
+    latency: float = 0.0          # seconds added to every response
+    jitter: float = 0.0           # + uniform(0, jitter)
+    error_rate: float = 0.0       # fraction of requests answered with 503
+    rate_limit_rate: float = 0.0  # fraction answered with 429 + Retry-After
+    retry_after: float = 0.05
+    seed: int = 0
+
+
+class FakeScryfall:
+    """
+    Threaded HTTP server on 127.0.0.1 (port 0 = pick a free one).
+
+        with FakeScryfall(FakeScryfallConfig(sets=50)) as fake:
+            client = ScryfallClient(base_url=fake.url)
+
+    `stats` counts responses by status code (plus "requests").
+    """
+
+    def __init__(self, config: Optional[FakeScryfallConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or FakeScryfallConfig()
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.fake = self
+        self._thread: Optional[threading.Thread] = None
+
+        self._lock = threading.Lock()
+        self._rng = random.Random(self.config.seed)
+        self._pages: Dict[Tuple[str, int], bytes] = {}
+        self._sets_body: Optional[bytes] = None
+        self._lookup: Optional[Dict[tuple, Tuple[int, int]]] = None
+        self._extra: Counter = Counter()  # set index -> cards added by grow_sets()
+        self.stats: Counter = Counter()
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def total_cards(self) -> int:
+        return sum(self.cards_in(i) for i in range(self.config.sets))
+
+    def cards_in(self, set_index: int) -> int:
+        return self.config.cards_per_set + self._extra[set_index]
+
+    def grow_sets(self, set_indices, by: int = 1) -> None:
+        """Add cards to some sets (new printings after release), changing their /sets entry."""
+        with self._lock:
+            for i in set_indices:
+                self._extra[i] += by
+                code = self.set_code(i)
+                self._pages = {k: v for k, v in self._pages.items() if k[0] != code}
+            self._sets_body = None
+            self._lookup = None
+
+    def start(self) -> "FakeScryfall":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._server.serve_forever, name="fake-scryfall", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeScryfall":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # ---------- payloads ----------
+    def set_code(self, i: int) -> str:
+        return f"f{i:03d}"
+
+    def search_uri(self, code: str) -> str:
+        return f"{self.url}/cards/search?order=set&q={quote(f'e:{code}')}&unique=prints"
+
+    def sets_body(self) -> bytes:
+        with self._lock:
+            if self._sets_body is None:
+                data = []
+                for i in range(self.config.sets):
+                    code = self.set_code(i)
+                    data.append({
+                        "object": "set",
+                        "id": str(uuid.uuid5(_NAMESPACE, f"set:{code}")),
+                        "code": code,
+                        "name": f"Fake Set {i:03d}",
+                        "set_type": "expansion",
+                        "released_at": f"{2000 + i // 12 % 30:04d}-{i % 12 + 1:02d}-01",
+                        "card_count": self.cards_in(i),
+                        "search_uri": self.search_uri(code),
+                    })
+                self._sets_body = _dumps({"object": "list", "has_more": False, "data": data})
+            return self._sets_body
+
+    def page_body(self, code: str, page: int) -> Optional[bytes]:
+        """One search page, or None for an unknown set / page past the end."""
+        cfg = self.config
+        try:
+            set_index = int(code[1:])
+        except ValueError:
+            return None
+        size = self.cards_in(set_index)
+        pages = -(-size // cfg.page_size)
+        if code != self.set_code(set_index) or not 0 <= set_index < cfg.sets or not 1 <= page <= pages:
+            return None
+
+        with self._lock:
+            body = self._pages.get((code, page))
+        if body is not None:
+            return body
+
+        first = (page - 1) * cfg.page_size
+        cards = [self._card(set_index, code, n) for n in range(first, min(first + cfg.page_size, size))]
+        payload = {"object": "list", "total_cards": size, "has_more": page < pages, "data": cards}
+        if page < pages:
+            payload["next_page"] = f"{self.search_uri(code)}&page={page + 1}"
+        body = _dumps(payload)
+        with self._lock:
+            self._pages[(code, page)] = body
+        return body
+
+    def card(self, set_index: int, n: int) -> dict:
+        """The n-th card of the set_index-th set, as served."""
+        return self._card(set_index, self.set_code(set_index), n)
+
+    def _card(self, set_index: int, code: str, n: int) -> dict:
+        rng = random.Random(f"{self.config.seed}:{code}:{n}")
+        name = " ".join(
+            "".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 3))).capitalize()
+            for _ in range(rng.randint(1, 3))
+        )
+        usd = round(rng.lognormvariate(-1.0, 1.2), 2)
+        return {
+            "object": "card",
+            "id": str(uuid.uuid5(_NAMESPACE, f"card:{code}:{n}")),
+            "lang": "en",
+            "name": name,
+            "set": code,
+            "set_id": str(uuid.uuid5(_NAMESPACE, f"set:{code}")),
+            "set_name": f"Fake Set {set_index:03d}",
+            "collector_number": str(n + 1),
+            "rarity": rng.choice(_RARITIES),
+            "mana_cost": "{%d}{G}" % rng.randint(0, 6),
+            "type_line": rng.choice(_TYPES),
+            "oracle_text": " ".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(10, 60))),
+            "prices": {
+                "usd": f"{usd:.2f}",
+                "usd_foil": f"{usd * 2.5:.2f}" if rng.random() < 0.6 else None,
+                "eur": f"{usd * 0.92:.2f}",
+                "tix": f"{usd / 10:.2f}",
+            },
+        }
+
+    def collection_body(self, identifiers: list) -> bytes:
+        """/cards/collection answer: found cards in request order, the rest in not_found."""
+        with self._lock:
+            if self._lookup is None:
+                lookup: Dict[tuple, Tuple[int, int]] = {}
+                for i in range(self.config.sets):
+                    code = self.set_code(i)
+                    for n in range(self.cards_in(i)):
+                        card = self._card(i, code, n)
+                        lookup[("id", card["id"])] = (i, n)
+                        lookup[("number", code, card["collector_number"])] = (i, n)
+                        lookup.setdefault(("name", card["name"].lower(), code), (i, n))
+                        lookup.setdefault(("name", card["name"].lower(), ""), (i, n))
+                self._lookup = lookup
+        data, not_found = [], []
+        for ident in identifiers:
+            if "id" in ident:
+                key = ("id", ident["id"])
+            elif "collector_number" in ident:
+                key = ("number", ident.get("set", "").lower(), ident["collector_number"])
+            else:
+                key = ("name", ident.get("name", "").lower(), ident.get("set", "").lower())
+            hit = self._lookup.get(key)
+            if hit is None:
+                not_found.append(ident)
+            else:
+                data.append(self._card(hit[0], self.set_code(hit[0]), hit[1]))
+        return _dumps({"object": "list", "not_found": not_found, "data": data})
+
+    # ---------- faults ----------
+    def fault(self) -> Optional[int]:
+        """Status to fail this request with (429 / 503), or None to serve it."""
+        cfg = self.config
+        with self._lock:
+            r = self._rng.random()
+        if r < cfg.rate_limit_rate:
+            return 429
+        if r < cfg.rate_limit_rate + cfg.error_rate:
+            return 503
+        return None
+
+    def delay(self) -> float:
+        cfg = self.config
+        if not cfg.jitter:
+            return cfg.latency
+        with self._lock:
+            return cfg.latency + self._rng.uniform(0, cfg.jitter)
+
+    def count(self, status: int) -> None:
+        with self._lock:
+            self.stats["requests"] += 1
+            self.stats[status] += 1
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+
+    def _delay_or_fault(self) -> bool:
+        """Apply latency; answer an injected fault and return True if there is one."""
+        fake: FakeScryfall = self.server.fake
+        delay = fake.delay()
+        if delay:
+            time.sleep(delay)
+
+        status = fake.fault()
+        if status is not None:
+            headers = {"Retry-After": f"{fake.config.retry_after:g}"} if status == 429 else {}
+            self._error(status, "rate_limited" if status == 429 else "unavailable", headers)
+            return True
+        return False
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if self._delay_or_fault():
+            return
+        if urlsplit(self.path).path != "/cards/collection":
+            return self._error(404, "not_found")
+        try:
+            identifiers = json.loads(body).get("identifiers", [])
+        except ValueError:
+            return self._error(400, "bad_request")
+        if not 0 < len(identifiers) <= 75:
+            return self._error(422, "validation_error")
+        self._send(200, self.server.fake.collection_body(identifiers))
+
+    def do_GET(self):
+        fake: FakeScryfall = self.server.fake
+        if self._delay_or_fault():
+            return
+
+        url = urlsplit(self.path)
+        if url.path == "/sets":
+            body = fake.sets_body()
+        elif url.path == "/cards/search":
+            qs = parse_qs(url.query)
+            query = qs.get("q", [""])[0]
+            code = query[2:] if query.startswith("e:") else ""
+            body = fake.page_body(code, int(qs.get("page", ["1"])[0]))
+        else:
+            body = None
+        if body is None:
+            return self._error(404, "not_found")
+
+        etag = '"%s"' % hashlib.blake2b(body, digest_size=8).hexdigest()
+        if self.headers.get("If-None-Match") == etag:
+            fake.count(304)
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        self._send(200, body, {"ETag": etag})
+
+    def _error(self, status: int, code: str, headers: Optional[Dict[str, str]] = None) -> None:
+        body = _dumps({"object": "error", "code": code, "status": status, "details": f"fake {code}"})
+        self._send(status, body, headers)
+
+    def _send(self, status: int, body: bytes, headers: Optional[Dict[str, str]] = None) -> None:
+        self.server.fake.count(status)
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # one line per request would dominate a benchmark
+
+
+def _dumps(payload: dict) -> bytes:
+    return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve synthetic Scryfall data on localhost")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--sets", type=int, default=20)
+    parser.add_argument("--cards-per-set", type=int, default=350)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    config = FakeScryfallConfig(sets=args.sets, cards_per_set=args.cards_per_set, latency=args.latency,
+                                jitter=args.jitter, error_rate=args.error_rate,
+                                rate_limit_rate=args.rate_limit_rate, seed=args.seed)
+    with FakeScryfall(config, port=args.port) as fake:
+        print(f"Fake Scryfall on {fake.url} ({fake.total_cards:,} cards in {config.sets} sets); Ctrl+C to stop")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
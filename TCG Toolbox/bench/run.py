@@ -0,0 +1,506 @@
+"""
+Offline benchmarks: no network, nothing under the real ~/.tcg_toolbox.
+
+    python -m bench.run                          # all benchmarks -> bench/results/<stamp>-<commit>.json
+    python -m bench.run --quick --only ingest,model
+    python -m bench.run --compare bench/results/<older>.json        # run, then diff against a baseline
+    python -m bench.run --compare old.json new.json                 # just diff two result files
+
+Scryfall traffic goes to bench.fake_scryfall; HOME points at a temp dir for
+the run, so the store, HTTP cache and name index start empty every time.
+Metric names end in their unit: *_per_s is better higher, *_ms / *_s lower.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from bench.fake_scryfall import FakeScryfall, FakeScryfallConfig
+
+ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+SCHEMA = 1
+
+Result = Dict[str, float]
+
+
+@dataclass
+class BenchConfig:
+    sets: int = 40
+    cards_per_set: int = 350
+    latency: float = 0.005
+    rps: float = 1000.0
+    concurrency: int = 4
+    model_rows: tuple = (10_000, 50_000, 100_000)
+    log_lines: int = 200_000
+    repeat: int = 3
+
+    @classmethod
+    def quick(cls) -> "BenchConfig":
+        return cls(sets=8, model_rows=(10_000,), log_lines=50_000, repeat=1)
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 2)
+
+
+def _best_of(repeat: int, fn: Callable[[], None]) -> float:
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+@contextmanager
+def _scryfall_at(url: str):
+    from providers.scryfall.client import ScryfallClient
+
+    old = os.environ.get(ScryfallClient.BASE_ENV)
+    os.environ[ScryfallClient.BASE_ENV] = url
+    try:
+        yield
+    finally:
+        if old is None:
+            os.environ.pop(ScryfallClient.BASE_ENV, None)
+        else:
+            os.environ[ScryfallClient.BASE_ENV] = old
+
+
+def _qt_app():
+    from PySide6.QtWidgets import QApplication
+
+    return QApplication.instance() or QApplication([])
+
+
+# ---------- benchmarks ----------
+def _ingest(cfg: BenchConfig, tmp: Path, name: str, fake_config: FakeScryfallConfig) -> Result:
+    from core.metrics import METRICS
+    from providers.scryfall.ingest import run_scryfall_sets_cards
+    from providers.scryfall.store import ScryfallStore
+
+    METRICS.reset()
+    with FakeScryfall(fake_config) as fake, _scryfall_at(fake.url):
+        store = ScryfallStore(tmp / f"{name}.db")
+        summary = run_scryfall_sets_cards(max_sets=0, concurrency=cfg.concurrency,
+                                          requests_per_second=cfg.rps, store=store)
+        stats = dict(fake.stats)
+    return {
+        "cards": summary.cards,
+        "complete": summary.ok,
+        "elapsed_s": round(summary.elapsed, 3),
+        "cards_per_s": round(summary.cards / max(summary.elapsed, 1e-9), 1),
+        "requests": stats.get("requests", 0),
+        "retried": stats.get(429, 0) + stats.get(503, 0),
+        "request_p50_ms": _ms(METRICS.histogram("http.request_s").snapshot().p50),
+        "parse_p50_ms": _ms(METRICS.histogram("http.parse_s").snapshot().p50),
+        "page_write_p50_ms": _ms(METRICS.histogram("ingest.page_write_s").snapshot().p50),
+    }
+
+
+def bench_ingest(cfg: BenchConfig, tmp: Path) -> Result:
+    """run_scryfall_sets_cards() over every fake set, clean responses."""
+    return _ingest(cfg, tmp, "ingest", FakeScryfallConfig(
+        sets=cfg.sets, cards_per_set=cfg.cards_per_set, latency=cfg.latency,
+    ))
+
+
+def bench_ingest_faults(cfg: BenchConfig, tmp: Path) -> Result:
+    """Same, with 2% 503s and 2% 429s (Retry-After 50 ms) to cost the retry paths."""
+    return _ingest(cfg, tmp, "ingest_faults", FakeScryfallConfig(
+        sets=cfg.sets, cards_per_set=cfg.cards_per_set, latency=cfg.latency,
+        error_rate=0.02, rate_limit_rate=0.02, retry_after=0.05, seed=1,
+    ))
+
+
+def bench_ingest_delta(cfg: BenchConfig, tmp: Path) -> Result:
+    """A full sync, then a nightly re-run where two sets grew: only those should be fetched."""
+    from providers.scryfall.ingest import run_scryfall_sets_cards
+    from providers.scryfall.store import ScryfallStore
+
+    fake_config = FakeScryfallConfig(sets=cfg.sets, cards_per_set=cfg.cards_per_set, latency=cfg.latency)
+    with FakeScryfall(fake_config) as fake, _scryfall_at(fake.url):
+        store = ScryfallStore(tmp / "delta.db")
+        full = run_scryfall_sets_cards(max_sets=0, concurrency=cfg.concurrency,
+                                       requests_per_second=cfg.rps, store=store)
+        full_requests = fake.stats["requests"]
+
+        fake.grow_sets([0, cfg.sets // 2], by=10)
+        t0 = time.perf_counter()
+        again = run_scryfall_sets_cards(max_sets=0, concurrency=cfg.concurrency,
+                                        requests_per_second=cfg.rps, store=store)
+        delta_s = time.perf_counter() - t0
+        delta_requests = fake.stats["requests"] - full_requests
+    return {
+        "full_s": round(full.elapsed, 3),
+        "full_requests": full_requests,
+        "delta_s": round(delta_s, 3),
+        "delta_requests": delta_requests,
+        "delta_sets": again.sets,
+        "delta_skipped": again.skipped,
+    }
+
+
+def bench_catalog(cfg: BenchConfig, tmp: Path) -> Result:
+    """ScryfallRepository as the Catalog panel drives it: network first, then the local store."""
+    from core.models import Set
+    from providers.scryfall.repository import ScryfallRepository
+    from providers.scryfall.store import ScryfallStore
+
+    fake_config = FakeScryfallConfig(sets=cfg.sets, cards_per_set=cfg.cards_per_set, latency=cfg.latency)
+    with FakeScryfall(fake_config) as fake, _scryfall_at(fake.url):
+        repo = ScryfallRepository(ScryfallStore(tmp / "catalog.db"))
+
+        t0 = time.perf_counter()
+        game = repo.load_mtg_sets()
+        sets_cold = time.perf_counter() - t0
+        sets_warm = _best_of(cfg.repeat, lambda: repo.load_mtg_sets(allow_stale=True))
+
+        sample = game.sets_sorted()[:5]
+        t0 = time.perf_counter()
+        for s in sample:
+            repo.load_cards_for_set(s)
+        cards_cold = (time.perf_counter() - t0) / len(sample)
+
+        def warm():
+            for s in sample:
+                repo.load_cards_for_set(Set(id=s.id, code=s.code, name=s.name,
+                                            released_at=s.released_at, search_uri=s.search_uri))
+
+        cards_warm = _best_of(cfg.repeat, warm) / len(sample)
+        requests = fake.stats["requests"]
+
+    return {
+        "sets": len(game.sets_by_code),
+        "sets_network_ms": _ms(sets_cold),
+        "sets_store_ms": _ms(sets_warm),
+        "set_cards_network_ms": _ms(cards_cold),
+        "set_cards_store_ms": _ms(cards_warm),
+        "requests": requests,
+    }
+
+
+def bench_import(cfg: BenchConfig, tmp: Path) -> Result:
+    """
+    A 10k-line list over a store holding half the fake sets: by name, by
+    set + number, with typos and junk. Cold import, then the same list again.
+    """
+    import random
+
+    from core.card_list import parse_card_list
+    from providers.scryfall.client import ScryfallClient
+    from providers.scryfall.importer import ListImporter
+    from providers.scryfall.ingest import run_scryfall_sets_cards
+    from providers.scryfall.ratelimit import TokenBucket
+    from providers.scryfall.store import ScryfallStore
+
+    fake_config = FakeScryfallConfig(sets=cfg.sets, cards_per_set=cfg.cards_per_set, latency=cfg.latency)
+    with FakeScryfall(fake_config) as fake, _scryfall_at(fake.url):
+        store = ScryfallStore(tmp / "import.db")
+        client = ScryfallClient(limiter=TokenBucket(cfg.rps))
+        local_sets = [fake.set_code(i) for i in range(0, cfg.sets, 2)]
+        run_scryfall_sets_cards(set_codes=local_sets, concurrency=cfg.concurrency,
+                                requests_per_second=cfg.rps, store=store)
+
+        rng = random.Random(7)
+        lines = []
+        for i in range(10_000):
+            card = fake.card(rng.randrange(cfg.sets), rng.randrange(cfg.cards_per_set))
+            kind = rng.random()
+            if kind < 0.5:
+                lines.append(f"{rng.randint(1, 4)} {card['name']}")
+            elif kind < 0.9:
+                lines.append(f"1 {card['name']} ({card['set'].upper()}) {card['collector_number']}")
+            elif kind < 0.98:
+                name = card["name"]
+                k = rng.randrange(1, len(name) - 1)
+                lines.append(f"1 {name[:k] + name[k + 1:]}")  # dropped letter
+            else:
+                lines.append(f"1 Not A Card {i}")
+        text = "\n".join(lines)
+
+        t0 = time.perf_counter()
+        entries = parse_card_list(text)
+        parse_s = time.perf_counter() - t0
+
+        before = fake.stats["requests"]
+        cold = ListImporter(store, client=client).resolve(entries)
+        cold_requests = fake.stats["requests"] - before
+        before = fake.stats["requests"]
+        warm = ListImporter(store, client=client).resolve(entries)
+        warm_requests = fake.stats["requests"] - before
+
+    return {
+        "lines": len(entries),
+        "parse_ms": _ms(parse_s),
+        "cold_ms": _ms(cold.elapsed),
+        "cold_requests": cold_requests,
+        "cold_unresolved": len(cold.unresolved),
+        "warm_ms": _ms(warm.elapsed),
+        "warm_requests": warm_requests,
+        "warm_unresolved": len(warm.unresolved),
+    }
+
+
+def bench_model(cfg: BenchConfig, tmp: Path) -> Result:
+    """SimpleListModel behind a (hidden) QListView: reset, diffed update, append, streamed growth."""
+    _qt_app()
+    from PySide6.QtWidgets import QListView
+
+    from core.models import CardTable
+    from ui.models.simple_list_model import SimpleListModel
+
+    def key(row):
+        return row[0]
+
+    out: Result = {}
+    for n in cfg.model_rows:
+        rows = [(f"id-{i:07d}", f"Card {i}") for i in range(n)]
+        model = SimpleListModel(display_fn=lambda r: r[1])
+        view = QListView()
+        view.setUniformItemSizes(True)
+        view.setModel(model)
+
+        out[f"set_items_{n}_ms"] = _ms(_best_of(cfg.repeat, lambda: model.set_items(rows)))
+
+        # 1% of rows renamed, one block inserted, one removed: a typical set refresh
+        changed = [(r[0], r[1] + " *") if i % 100 == 0 else r for i, r in enumerate(rows)]
+        changed[n // 2:n // 2] = [(f"new-{i}", f"New {i}") for i in range(100)]
+        del changed[n // 4:n // 4 + 100]
+
+        def update():
+            model.set_items(rows)
+            model.update_items(changed, key_fn=key)
+
+        reset = _best_of(cfg.repeat, lambda: model.set_items(rows))
+        out[f"update_items_{n}_ms"] = _ms(max(0.0, _best_of(cfg.repeat, update) - reset))
+
+        extra = [(f"x-{i}", f"Extra {i}") for i in range(1000)]
+
+        def append():
+            model.set_items(rows)
+            model.append_items(extra)
+
+        out[f"append_1000_to_{n}_ms"] = _ms(max(0.0, _best_of(cfg.repeat, append) - reset))
+
+        # Catalog streaming: a CardTable filled page by page, announced with grow_to()
+        cards = [(str(uuid.UUID(int=i)), name) for i, (_, name) in enumerate(rows)]
+
+        def stream():
+            table = CardTable()
+            model.set_items(table)
+            for start in range(0, n, 175):
+                table.extend(cards[start:start + 175])
+                model.grow_to(len(table))
+
+        out[f"stream_{n}_ms"] = _ms(_best_of(cfg.repeat, stream))
+        view.deleteLater()
+    return out
+
+
+def bench_log_panel(cfg: BenchConfig, tmp: Path) -> Result:
+    """Records through QueueLogHandler, then how fast a visible LogPanel takes them in."""
+    app = _qt_app()
+    from core.log_stream import LOG_QUEUE, QueueLogHandler
+    from modules.logger.panel import LogPanel
+
+    panel = LogPanel()
+    panel.resize(900, 600)
+    panel.show()
+    for _ in range(5):
+        app.processEvents()
+    base = panel.model.rowCount()
+
+    log = logging.getLogger("TCG Toolbox.bench")
+    log.propagate = False
+    log.setLevel(logging.DEBUG)
+    handler = QueueLogHandler()
+    log.addHandler(handler)
+    n = cfg.log_lines
+    try:
+        t0 = time.perf_counter()
+        for i in range(n):
+            log.info("Fake Set %03d : card %d of %d", i % 40, i, n)
+        emit = time.perf_counter() - t0
+    finally:
+        log.removeHandler(handler)
+
+    # Everything is queued; time the panel draining it with the event loop running
+    longest = 0.0
+    t0 = time.perf_counter()
+    deadline = t0 + 120
+    while panel.model.rowCount() - base < n and time.perf_counter() < deadline:
+        t1 = time.perf_counter()
+        app.processEvents()
+        longest = max(longest, time.perf_counter() - t1)
+        time.sleep(0.001)
+    drain = time.perf_counter() - t0
+    shown = panel.model.rowCount() - base
+
+    panel.close()
+    panel.deleteLater()
+    app.processEvents()
+    while not LOG_QUEUE.empty():
+        LOG_QUEUE.get_nowait()
+
+    return {
+        "lines": shown,
+        "emit_per_s": round(n / max(emit, 1e-9), 1),
+        "panel_lines_per_s": round(shown / max(drain, 1e-9), 1),
+        "longest_event_loop_turn_ms": _ms(longest),
+    }
+
+
+BENCHMARKS: Dict[str, Callable[[BenchConfig, Path], Result]] = {
+    "ingest": bench_ingest,
+    "ingest_faults": bench_ingest_faults,
+    "ingest_delta": bench_ingest_delta,
+    "catalog": bench_catalog,
+    "import": bench_import,
+    "model": bench_model,
+    "log_panel": bench_log_panel,
+}
+
+
+# ---------- results ----------
+def _git(*args: str) -> Optional[str]:
+    try:
+        out = subprocess.run(["git", *args], cwd=ROOT, capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    return out.stdout.strip() if out.returncode == 0 else None
+
+
+def run(names: List[str], cfg: BenchConfig) -> dict:
+    results: Dict[str, Result] = {}
+    with tempfile.TemporaryDirectory(prefix="tcg-bench-") as tmp:
+        home = Path(tmp) / "home"
+        home.mkdir()
+        old_home = {k: os.environ.get(k) for k in ("HOME", "USERPROFILE")}
+        os.environ["HOME"] = os.environ["USERPROFILE"] = str(home)
+        try:
+            for name in names:
+                print(f"{name} ...", file=sys.stderr, flush=True)
+                t0 = time.perf_counter()
+                try:
+                    results[name] = BENCHMARKS[name](cfg, Path(tmp))
+                except Exception as e:
+                    logging.getLogger("TCG Toolbox.bench").exception(f"{name} failed")
+                    results[name] = {"error": f"{type(e).__name__}: {e}"}
+                print(f"{name}: {time.perf_counter() - t0:.1f}s {json.dumps(results[name])}",
+                      file=sys.stderr, flush=True)
+        finally:
+            for key, value in old_home.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+
+    try:
+        from PySide6 import __version__ as qt_version
+    except ImportError:
+        qt_version = None
+    return {
+        "schema": SCHEMA,
+        "commit": _git("rev-parse", "--short", "HEAD"),
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pyside6": qt_version,
+        "platform": platform.platform(),
+        "config": asdict(cfg),
+        "results": results,
+    }
+
+
+def compare(base: dict, new: dict) -> str:
+    """Side-by-side table of every numeric metric both runs have."""
+    lines = [f"{'metric':<40} {base.get('commit') or 'base':>12} {new.get('commit') or 'new':>12}   change"]
+    if base.get("config") != new.get("config"):
+        lines.insert(0, "note: the runs used different configs; only *_per_s and per-item *_ms compare directly")
+    for bench, metrics in new.get("results", {}).items():
+        old_metrics = base.get("results", {}).get(bench, {})
+        for metric, value in metrics.items():
+            old = old_metrics.get(metric)
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or not isinstance(old, (int, float)):
+                continue
+            change = ""
+            if old:
+                pct = (value - old) / old * 100
+                if metric.endswith("_per_s"):
+                    change = f"{pct:+.1f}% ({'better' if pct > 0 else 'worse'})"
+                elif metric.endswith(("_ms", "_s")):
+                    change = f"{pct:+.1f}% ({'better' if pct < 0 else 'worse'})"
+                else:
+                    change = f"{pct:+.1f}%"
+            lines.append(f"{bench + '.' + metric:<40} {old:>12,.2f} {value:>12,.2f}   {change}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m bench.run", description="TCG Toolbox offline benchmarks")
+    parser.add_argument("--only", help=f"comma-separated subset of: {', '.join(BENCHMARKS)}")
+    parser.add_argument("--quick", action="store_true", help="smaller sizes, one repeat (smoke run)")
+    parser.add_argument("-o", "--output", help="result file ('-' = stdout; default bench/results/<stamp>-<commit>.json)")
+    parser.add_argument("--compare", nargs="+", metavar="RESULT",
+                        help="baseline to diff this run against, or two result files to diff without running")
+    parser.add_argument("--sets", type=int, help="fake sets served")
+    parser.add_argument("--latency", type=float, help="fake server latency per request (s)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="show app logging")
+    args = parser.parse_args(argv)
+
+    if args.compare and len(args.compare) == 2:
+        old, new = (json.loads(Path(p).read_text(encoding="utf-8")) for p in args.compare)
+        print(compare(old, new))
+        return 0
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.ERROR,
+                        format="%(asctime)s | %(levelname)s | %(name)s | %(message)s")
+    names = [n.strip() for n in args.only.split(",")] if args.only else list(BENCHMARKS)
+    unknown = [n for n in names if n not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+
+    cfg = BenchConfig.quick() if args.quick else BenchConfig()
+    if args.sets:
+        cfg.sets = args.sets
+    if args.latency is not None:
+        cfg.latency = args.latency
+
+    if str(ROOT) not in sys.path:
+        sys.path.insert(0, str(ROOT))
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    report = run(names, cfg)
+
+    text = json.dumps(report, indent=2)
+    if args.output == "-":
+        print(text)
+    else:
+        out = Path(args.output) if args.output else (
+            RESULTS_DIR / f"{datetime.now():%Y%m%d-%H%M%S}-{report['commit'] or 'nocommit'}.json"
+        )
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(text + "\n", encoding="utf-8")
+        print(f"results: {out}", file=sys.stderr)
+
+    if args.compare:
+        print(compare(json.loads(Path(args.compare[0]).read_text(encoding="utf-8")), report))
+    return 1 if any("error" in r for r in report["results"].values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,309 @@
+"""
+Headless entry point (no Qt): sync the Scryfall cache, show its status, export cards.
+
+    python cli.py sync --sets 0 --concurrency 6 --rps 8
+    python cli.py sync --codes neo,mom
+    python cli.py sync --sets 0 --full
+    python cli.py sync --bulk default_cards
+    python cli.py status --json
+    python cli.py export --format csv --set neo -o neo.csv
+    python cli.py fetch --codes neo,mom --format npz -o ./columns
+    python cli.py import collection.csv --portfolio binder
+    python cli.py prices --limit 20
+    python cli.py prices --card <scryfall id> --days 90
+
+Exit code is 0 on success, 1 if some sets didn't finish, 2 on errors.
+"""
+import argparse
+import csv
+import json
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+
+LOG_FORMAT = "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
+
+
+class _BriefFormatter(logging.Formatter):
+    """Console format without tracebacks (those still reach --log-file, or show with -v)."""
+
+    def formatException(self, ei) -> str:
+        return ""
+
+
+def _setup_logging(verbosity: int, log_file: Optional[Path]):
+    root = logging.getLogger()
+    root.setLevel(logging.DEBUG)
+    root.handlers = []
+
+    console = logging.StreamHandler(sys.stderr)
+    console.setLevel([logging.WARNING, logging.INFO, logging.DEBUG][min(verbosity, 2)])
+    console.setFormatter(logging.Formatter(LOG_FORMAT) if verbosity else _BriefFormatter(LOG_FORMAT))
+    root.addHandler(console)
+
+    logging.getLogger("urllib3").setLevel(logging.WARNING)
+    logging.getLogger("requests").setLevel(logging.WARNING)
+
+    if log_file is None:
+        return None
+    from core.log_writer import RotatingLogWriter
+
+    writer = RotatingLogWriter(log_file, logging.Formatter(LOG_FORMAT))
+    writer.start()
+    root.addHandler(writer.handler())
+    return writer
+
+
+def _store(args):
+    from providers.scryfall.store import ScryfallStore
+
+    return ScryfallStore(Path(args.db) if args.db else None)
+
+
+def _progress(args, text: str) -> None:
+    if not args.quiet:
+        print(text, flush=True)
+
+
+# ---------- commands ----------
+def cmd_sync(args) -> int:
+    from providers.scryfall.ingest import run_scryfall_bulk, run_scryfall_sets_cards
+
+    store = _store(args)
+    t0 = time.perf_counter()
+
+    def rate(cards: int) -> str:
+        return f"{cards / max(time.perf_counter() - t0, 1e-9):,.0f} cards/s"
+
+    if args.bulk:
+        summary = run_scryfall_bulk(
+            args.bulk, store=store,
+            on_progress=lambda cards: _progress(args, f"{cards:,} cards | {rate(cards)}"),
+        )
+    else:
+        codes = [c.strip() for c in args.codes.split(",") if c.strip()] if args.codes else None
+        summary = run_scryfall_sets_cards(
+            max_sets=args.sets, concurrency=args.concurrency, requests_per_second=args.rps,
+            store=store, set_codes=codes, delta=not args.full, reverify_days=args.reverify_days,
+            on_progress=lambda done, total, cards: _progress(
+                args, f"sets {done}/{total} | {cards:,} cards | {rate(cards)}"
+            ),
+        )
+
+    skipped = f", {summary.skipped} unchanged sets skipped" if summary.skipped else ""
+    _progress(args, f"done: {summary.cards:,} cards from {summary.sets} sets in {summary.elapsed:.1f}s{skipped}")
+    if args.metrics:
+        from core.metrics import METRICS
+
+        print(json.dumps(METRICS.as_dict(), indent=2), file=sys.stderr)
+    if summary.failed:
+        print(f"incomplete ({len(summary.failed)}): {', '.join(summary.failed)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def cmd_status(args) -> int:
+    from providers.scryfall.http_cache import shared_response_cache
+
+    store = _store(args)
+    status = {"db": str(store.path), **store.counts()}
+    status["db_bytes"] = store.path.stat().st_size if store.path.exists() else 0
+    cache = shared_response_cache().stats()  # hit counters are per process; only size matters here
+    status["http_cache"] = {"entries": cache["entries"], "size_bytes": cache["size_bytes"]}
+
+    if args.json:
+        print(json.dumps(status, indent=2))
+        return 0
+    for key, value in status.items():
+        if isinstance(value, dict):
+            value = ", ".join(f"{k}={v}" for k, v in value.items())
+        print(f"{key:>16}: {value}")
+    return 0
+
+
+def cmd_export(args) -> int:
+    store = _store(args)
+    codes = [c.strip().lower() for arg in args.set for c in arg.split(",") if c.strip()] if args.set else None
+
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+    count = 0
+    try:
+        if args.format == "jsonl":
+            for row in store.iter_cards(codes):
+                out.write((row["raw"] or json.dumps({"id": row["id"], "name": row["name"]})) + "\n")
+                count += 1
+        else:
+            writer = csv.writer(out)
+            writer.writerow(["set_code", "position", "collector_number", "name", "id"])
+            for row in store.iter_cards(codes):
+                writer.writerow([row["set_code"], row["position"], row["collector_number"], row["name"], row["id"]])
+                count += 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    # Data may be going to stdout, so the summary goes to stderr
+    if not args.quiet:
+        print(f"exported {count:,} cards", file=sys.stderr)
+    return 0
+
+
+def cmd_fetch(args) -> int:
+    from providers.scryfall.client import ScryfallClient
+    from providers.scryfall.pipeline import ColumnarSink, CsvSink, JsonlSink, run_sets
+
+    codes = {c.strip().lower() for c in args.codes.split(",") if c.strip()}
+    client = ScryfallClient(user_agent="TCG Toolbox (fetch)")
+    sets = [s for s in client.list_sets().get("data", []) if s.get("code") in codes]
+    missing = codes - {s.get("code") for s in sets}
+    if missing:
+        print(f"unknown set code(s): {', '.join(sorted(missing))}", file=sys.stderr)
+
+    out = None
+    if args.format == "npz":
+        sink = ColumnarSink(Path(args.output))
+    else:
+        out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+        sink = JsonlSink(out) if args.format == "jsonl" else CsvSink(out)
+    try:
+        results = run_sets(client, sets, [sink])
+    finally:
+        if out is not None and out is not sys.stdout:
+            out.close()
+
+    if not args.quiet:
+        print(f"fetched {sum(r.cards for r in results):,} cards from {len(results)} sets", file=sys.stderr)
+    return 1 if missing or any(not r.complete for r in results) else 0
+
+
+def cmd_import(args) -> int:
+    from core.card_list import parse_card_list
+    from providers.scryfall.repository import ScryfallRepository
+
+    store = _store(args)
+    entries = parse_card_list(Path(args.file))
+    if args.offline:
+        from providers.scryfall.importer import ListImporter
+
+        result = ListImporter(store, remote=False).resolve(entries)
+    else:
+        result = ScryfallRepository(store).import_list(entries)
+
+    counts = ", ".join(f"{how} {n}" for how, n in result.counts().most_common())
+    _progress(args, f"{len(entries):,} lines: {len(result.resolved):,} resolved ({counts}), "
+                    f"{len(result.unresolved):,} unresolved, {result.requests} request(s)")
+    for e in result.unresolved:
+        print(f"unresolved line {e.line}: {e.quantity} {e.name}", file=sys.stderr)
+    if args.portfolio:
+        rows = result.holdings()
+        store.upsert_holdings(args.portfolio, rows)
+        _progress(args, f"portfolio '{args.portfolio}': {len(rows):,} holdings written")
+    return 1 if result.unresolved else 0
+
+
+def cmd_prices(args) -> int:
+    from providers.scryfall.ingest import history_for_store
+
+    history = history_for_store(_store(args))
+    if args.card:
+        series = history.series(args.card, field=args.field, days=args.days)
+        writer = csv.writer(sys.stdout)
+        writer.writerow(["day", *series.card_ids])
+        for day, row in zip(series.days, series.values):
+            writer.writerow([day, *("" if v != v else f"{v:.2f}" for v in row)])
+        return 0
+
+    days = history.days()
+    if len(days) < 2:
+        print(f"need two synced days for changes (have {len(days)})", file=sys.stderr)
+        return 0
+    for c in history.changes(field=args.field, limit=args.limit):
+        print(f"{c.change:+10.2f}  {c.before:10.2f} -> {c.after:10.2f}  {c.card_id}")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    from providers.scryfall.manifest import REVERIFY_DAYS
+
+    parser = argparse.ArgumentParser(prog="tcg-toolbox", description="TCG Toolbox headless tools")
+    parser.add_argument("--db", help="SQLite store (default ~/.tcg_toolbox/scryfall.db); "
+                                      "its price history goes in <name>_price_history beside it")
+    parser.add_argument("--log-file", type=Path, help="also write a rotating log here")
+    parser.add_argument("-v", "--verbose", action="count", default=0, help="log to stderr (-v INFO, -vv DEBUG)")
+    parser.add_argument("-q", "--quiet", action="store_true", help="no progress output")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sync = sub.add_parser("sync", help="sync sets/cards from Scryfall into the local store")
+    sync.add_argument("--sets", type=int, default=5, help="first N sets from Scryfall's list (0 = all)")
+    sync.add_argument("--codes", help="comma-separated set codes instead of --sets")
+    sync.add_argument("--concurrency", type=int, default=4, help="sets paginated at once")
+    sync.add_argument("--rps", type=float, help="requests per second (default: Scryfall's limit)")
+    sync.add_argument("--full", action="store_true", help="refetch every chosen set, changed or not")
+    sync.add_argument("--reverify-days", type=int, default=REVERIFY_DAYS,
+                      help="always refetch sets released within this many days (-1 = never)")
+    sync.add_argument("--bulk", metavar="TYPE_OR_FILE",
+                      help="ingest a bulk-data file instead (e.g. default_cards, or a local .json)")
+    sync.add_argument("--metrics", action="store_true", help="print request/ingest metrics as JSON at the end")
+    sync.set_defaults(func=cmd_sync)
+
+    status = sub.add_parser("status", help="show what the local store holds")
+    status.add_argument("--json", action="store_true")
+    status.set_defaults(func=cmd_status)
+
+    export = sub.add_parser("export", help="export stored cards")
+    export.add_argument("--format", choices=["jsonl", "csv"], default="jsonl")
+    export.add_argument("--set", action="append", help="set code(s) to export (repeatable or comma-separated)")
+    export.add_argument("-o", "--output", default="-", help="output file ('-' = stdout)")
+    export.set_defaults(func=cmd_export)
+
+    fetch = sub.add_parser("fetch", help="stream sets from Scryfall straight to files (the store is not touched)")
+    fetch.add_argument("--codes", required=True, help="comma-separated set codes")
+    fetch.add_argument("--format", choices=["jsonl", "csv", "npz"], default="jsonl",
+                       help="npz = one columnar file per set in the --output directory")
+    fetch.add_argument("-o", "--output", default="-", help="output file ('-' = stdout) or directory for npz")
+    fetch.set_defaults(func=cmd_fetch)
+
+    imp = sub.add_parser("import", help="resolve a decklist / collection CSV to Scryfall cards")
+    imp.add_argument("file", help="text list ('4 Lightning Bolt (M10) 146') or CSV with a header row")
+    imp.add_argument("--portfolio", help="write the cards as this portfolio's holdings (quantities replace)")
+    imp.add_argument("--offline", action="store_true", help="local catalog only, no Scryfall requests")
+    imp.set_defaults(func=cmd_import)
+
+    prices = sub.add_parser("prices", help="price history: biggest changes since the last sync, or --card series")
+    prices.add_argument("--field", default="usd", choices=["usd", "usd_foil", "usd_etched", "eur", "eur_foil", "tix"])
+    prices.add_argument("--limit", type=int, default=20)
+    prices.add_argument("--card", action="append", help="print this card's daily prices as CSV (repeatable)")
+    prices.add_argument("--days", type=int, default=90)
+    prices.set_defaults(func=cmd_prices)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "fetch" and args.format == "npz" and args.output == "-":
+        parser.error("fetch --format npz writes one file per set; give a directory with -o")
+    writer = _setup_logging(args.verbose, args.log_file)
+    try:
+        return args.func(args)
+    except KeyboardInterrupt:
+        print("interrupted", file=sys.stderr)
+        return 2
+    except BrokenPipeError:
+        # Output piped into e.g. `head`; not an error for a CLI
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    except Exception as e:
+        logging.getLogger("TCG Toolbox.cli").exception(f"{args.command} failed")
+        print(f"{args.command} failed: {e}", file=sys.stderr)
+        return 2
+    finally:
+        if writer is not None:
+            writer.stop()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import csv
+import io
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+# "4 Lightning Bolt", "4x Lightning Bolt (M10) 146", "1 Sol Ring (CMR) 472 *F*"
+_LINE = re.compile(
+    r"^(?:(?P<qty>\d+)\s*x?\s+)?(?P<name>.+?)"
+    r"(?:\s+[(\[](?P<set>[A-Za-z0-9]{2,6})[)\]](?:\s+(?P<number>[^\s*]+))?)?"
+    r"(?:\s+\*(?P<finish>[FE])\*)?\s*$"
+)
+# Deck-section headers exported by Arena / MTGO / Moxfield
+_SECTIONS = {"deck", "sideboard", "commander", "companion", "maybeboard", "mainboard", "about"}
+_FINISH_MARK = {"F": "foil", "E": "etched"}
+
+# CSV header (lowercased) -> ListEntry field
+_COLUMNS: Dict[str, str] = {
+    "name": "name", "card": "name", "card name": "name", "card_name": "name",
+    "quantity": "quantity", "qty": "quantity", "count": "quantity", "amount": "quantity",
+    "set": "set_code", "set code": "set_code", "set_code": "set_code", "edition": "set_code",
+    "collector number": "collector_number", "collector_number": "collector_number",
+    "number": "collector_number", "cn": "collector_number", "card number": "collector_number",
+    "scryfall id": "card_id", "scryfall_id": "card_id", "id": "card_id",
+    "finish": "finish", "foil": "finish", "printing": "finish",
+}
+
+
+@dataclass
+class ListEntry:
+    """One line of an imported deck/collection list (1-based `line` in the source)."""
+    line: int
+    name: str
+    quantity: int = 1
+    set_code: Optional[str] = None
+    collector_number: Optional[str] = None
+    card_id: Optional[str] = None
+    finish: str = "nonfoil"
+
+
+def _finish(value: Optional[str]) -> str:
+    v = (value or "").strip().lower()
+    if v in ("etched", "e"):
+        return "etched"
+    if v in ("foil", "f", "true", "yes", "y", "1"):
+        return "foil"
+    return "nonfoil"
+
+
+def _quantity(value: Optional[str]) -> int:
+    try:
+        return max(0, int(float(value))) if value not in (None, "") else 1
+    except ValueError:
+        return 1
+
+
+def parse_text(lines: Iterable[str], first_line: int = 1) -> Iterator[ListEntry]:
+    """Plain decklist lines; blank lines, comments (//, #) and section headers are skipped."""
+    for n, raw in enumerate(lines, first_line):
+        line = raw.strip()
+        if not line or line.startswith(("//", "#")) or line.rstrip(":").lower() in _SECTIONS:
+            continue
+        m = _LINE.match(line)
+        if not m or not m.group("name"):
+            continue
+        yield ListEntry(
+            line=n,
+            name=m.group("name").strip(),
+            quantity=int(m.group("qty")) if m.group("qty") else 1,
+            set_code=m.group("set").lower() if m.group("set") else None,
+            collector_number=m.group("number"),
+            finish=_FINISH_MARK.get(m.group("finish") or "", "nonfoil"),
+        )
+
+
+def parse_csv(lines: Iterable[str]) -> Iterator[ListEntry]:
+    """CSV with a header row; column names are matched loosely (see _COLUMNS)."""
+    reader = csv.reader(lines)
+    header = next(reader, None)
+    if not header:
+        return
+    fields = [_COLUMNS.get(h.strip().lower()) for h in header]
+    for n, row in enumerate(reader, 2):
+        values = {f: v.strip() for f, v in zip(fields, row) if f and v and v.strip()}
+        if not values.get("name") and not values.get("card_id"):
+            continue
+        yield ListEntry(
+            line=n,
+            name=values.get("name", ""),
+            quantity=_quantity(values.get("quantity")),
+            set_code=values["set_code"].lower() if values.get("set_code") else None,
+            collector_number=values.get("collector_number"),
+            card_id=values.get("card_id"),
+            finish=_finish(values.get("finish")),
+        )
+
+
+def is_csv_header(line: str) -> bool:
+    cells = next(csv.reader([line]), [])
+    return len(cells) > 1 and any(_COLUMNS.get(c.strip().lower()) in ("name", "card_id") for c in cells)
+
+
+def parse_card_list(source: Union[str, Path, Iterable[str]]) -> List[ListEntry]:
+    """
+    Parse a decklist or collection export: a path, the text itself, or an
+    iterable of lines. CSV is detected from its header row.
+    """
+    if isinstance(source, Path):
+        with source.open("r", encoding="utf-8-sig", newline="") as fp:
+            return parse_card_list(fp)
+    if isinstance(source, str):
+        source = io.StringIO(source)
+
+    lines = iter(source)
+    first = next(lines, None)
+    if first is None:
+        return []
+    if is_csv_header(first):
+        return list(parse_csv(_chain(first, lines)))
+    return list(parse_text(_chain(first, lines)))
+
+
+def _chain(first: str, rest: Iterator[str]) -> Iterator[str]:
+    yield first
+    yield from rest
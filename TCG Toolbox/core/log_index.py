@@ -0,0 +1,291 @@
+from __future__ import annotations
+
+import gzip
+import mmap
+import os
+import re
+import shutil
+import threading
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from datetime import datetime
+from itertools import accumulate
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+from core.log import get_logger
+from core.workers import CancelToken
+
+STRIDE = 256                 # lines per checkpoint
+CHUNK = 4 * 1024 * 1024      # bytes scanned per step
+BLOCK_CACHE = 64             # split checkpoint blocks kept for scrolling
+SEARCH_BLOCKS = 128          # checkpoint blocks per search step
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def parse_time(line: bytes) -> Optional[float]:
+    """Epoch seconds of an app.log line ('YYYY-mm-dd HH:MM:SS,mmm | ...'), None for continuations."""
+    if len(line) < 23 or line[4:5] != b"-" or line[19:20] != b",":
+        return None
+    try:
+        secs = datetime.strptime(line[:19].decode("ascii"), TIME_FORMAT).timestamp()
+        return secs + int(line[20:23]) / 1000
+    except ValueError:
+        return None
+
+
+class LogFileIndex:
+    """
+    Sparse line index over a memory-mapped log file.
+
+    Only every STRIDE-th line start is recorded (with the time of the
+    nearest stamped line), so memory stays ~16 bytes per 256 lines whatever
+    the file size; rows in between are found by splitting one block. The
+    index is built incrementally by update() - call it from a worker, again
+    whenever the file may have grown. Gzipped segments are decompressed
+    into `cache_dir` first, since mmap needs a plain file.
+
+    Readers (line(), search(), ...) may run while update() extends the
+    index on another thread.
+    """
+
+    def __init__(self, path: Path, cache_dir: Optional[Path] = None):
+        self.source = Path(path)
+        self.cache_dir = cache_dir
+        self.path = self.source
+        self.log = get_logger("log_index")
+
+        self._lock = threading.RLock()
+        self._fp = None
+        self._mm: Optional[mmap.mmap] = None
+        self._inode: Optional[int] = None
+
+        self._offsets = array("Q")  # byte offset of line k * STRIDE
+        self._times = array("d")    # time at that checkpoint (carried forward over continuations)
+        self._lines = 0             # complete lines indexed
+        self._pos = 0               # byte offset just past the last indexed line
+        self._blocks: "OrderedDict[int, List[bytes]]" = OrderedDict()
+
+    # ---------- lifecycle ----------
+    def update(self, token: Optional[CancelToken] = None,
+               on_progress: Optional[Callable[[int], None]] = None) -> int:
+        """Index lines appended since the last call; returns the line count."""
+        with self._lock:
+            gz = self.source.with_name(self.source.name + ".gz")
+            if self.path == self.source and not self.source.exists() and gz.exists():
+                self.source = self.path = gz  # segment got compressed since it was listed
+            if self.source.suffix == ".gz" and self.path == self.source:
+                self.path = self._decompress()
+            size = self._remap()
+            end = self._mm.rfind(b"\n", self._pos, size) + 1 if self._mm is not None else 0
+
+        pos, n = self._pos, self._lines
+        last_time = self._times[-1] if self._times else 0.0
+        while pos < end:
+            if token is not None:
+                token.check()
+            stop = min(end, pos + CHUNK)
+            with self._lock:
+                if stop < end:
+                    stop = self._mm.rfind(b"\n", pos, stop) + 1 or self._mm.find(b"\n", stop, end) + 1
+                parts = self._mm[pos:stop].split(b"\n")
+            parts.pop()  # chunk ends with a newline
+            acc = list(accumulate(map(len, parts)))
+
+            with self._lock:
+                for k in range((-n) % STRIDE, len(parts), STRIDE):
+                    start = pos + (acc[k - 1] + k if k else 0)
+                    t = self._first_time(parts, k)
+                    last_time = t if t is not None else last_time
+                    self._offsets.append(start)
+                    self._times.append(last_time)
+                n += len(parts)
+                pos = stop
+                self._lines, self._pos = n, pos  # publish after the checkpoints
+            if on_progress is not None:
+                on_progress(n)
+        return self._lines
+
+    def close(self) -> None:
+        with self._lock:
+            self._unmap()
+
+    # ---------- reading ----------
+    @property
+    def line_count(self) -> int:
+        return self._lines
+
+    def line_bytes(self, i: int) -> bytes:
+        block = self._block(i // STRIDE)
+        return block[i % STRIDE]
+
+    def line(self, i: int) -> str:
+        return self.line_bytes(i).decode("utf-8", "replace")
+
+    def time_at(self, i: int) -> Optional[float]:
+        """Time of line i, or of the stamped line it continues (tracebacks)."""
+        b = i // STRIDE
+        block = self._block(b)
+        for k in range(i % STRIDE, -1, -1):
+            t = parse_time(block[k])
+            if t is not None:
+                return t
+        return self._times[b] or None
+
+    def line_for_time(self, ts: float) -> int:
+        """First line stamped at or after ts (line_count if none)."""
+        b = max(0, bisect_left(self._times, ts) - 1)
+        n = self._lines
+        for i in range(b * STRIDE, n):
+            t = parse_time(self.line_bytes(i))
+            if t is not None and t >= ts:
+                return i
+        return n
+
+    def offset_of(self, i: int) -> int:
+        """Byte offset where line i starts (self._pos for i == line_count)."""
+        if i >= self._lines:
+            return self._pos
+        b, k = divmod(i, STRIDE)
+        block = self._block(b)
+        return self._offsets[b] + sum(len(line) + 1 for line in block[:k])
+
+    def search(self, pattern: re.Pattern, token: CancelToken,
+               on_hits: Callable[[List[int], int], None], start_line: int = 0, limit: int = 10_000) -> int:
+        """
+        Stream line numbers matching a bytes regex to on_hits(lines, scanned_line),
+        one call per chunk. Stops after `limit` hits; returns how many were found.
+        """
+        found = 0
+        b = start_line // STRIDE
+        while b < len(self._offsets) and found < limit:
+            token.check()
+            b_end = min(b + SEARCH_BLOCKS, len(self._offsets))
+            with self._lock:
+                lo = self._offsets[b]
+                hi = self._offsets[b_end] if b_end < len(self._offsets) else self._pos
+                data = self._mm[lo:hi]
+            base = b * STRIDE
+            hits: List[int] = []
+            counted_to, line_no = 0, base
+            for m in pattern.finditer(data):
+                line_no += data.count(b"\n", counted_to, m.start())
+                counted_to = m.start()
+                if line_no >= start_line and (not hits or hits[-1] != line_no):
+                    hits.append(line_no)
+            hits = hits[:limit - found]
+            found += len(hits)
+            on_hits(hits, min(b_end * STRIDE, self._lines))
+            b = b_end
+        return found
+
+    def export(self, dest: Path, start_ts: Optional[float] = None, end_ts: Optional[float] = None) -> int:
+        """Copy the lines stamped in [start_ts, end_ts) to dest; returns bytes written."""
+        first = self.line_for_time(start_ts) if start_ts is not None else 0
+        last = self.line_for_time(end_ts) if end_ts is not None else self._lines
+        lo, hi = self.offset_of(first), self.offset_of(last)
+        written = 0
+        with open(dest, "wb") as f:
+            while lo < hi:
+                step = min(CHUNK, hi - lo)
+                with self._lock:
+                    f.write(self._mm[lo:lo + step])
+                lo += step
+                written += step
+        return written
+
+    # ---------- internals ----------
+    def _block(self, b: int) -> List[bytes]:
+        block = self._blocks.get(b)
+        if block is not None:
+            self._blocks.move_to_end(b)
+            return block
+        with self._lock:
+            lo = self._offsets[b]
+            full = b + 1 < len(self._offsets)
+            hi = self._offsets[b + 1] if full else self._pos
+            block = self._mm[lo:hi].split(b"\n")[:-1]
+        if full:  # the tail block still grows; only full ones are cached
+            self._blocks[b] = block
+            if len(self._blocks) > BLOCK_CACHE:
+                self._blocks.popitem(last=False)
+        return block
+
+    @staticmethod
+    def _first_time(parts: List[bytes], k: int) -> Optional[float]:
+        for line in parts[k:k + STRIDE]:
+            t = parse_time(line)
+            if t is not None:
+                return t
+        return None
+
+    def _remap(self) -> int:
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            self._unmap()
+            self._reset()
+            return 0
+        if self._inode is not None and (st.st_ino != self._inode or st.st_size < self._pos):
+            # Rotated or truncated underneath us: start over on the new file
+            self.log.debug(f"{self.path.name} was replaced; re-indexing")
+            self._unmap()
+            self._reset()
+        if self._mm is not None and len(self._mm) == st.st_size:
+            return st.st_size
+        self._unmap()
+        if st.st_size == 0:
+            return 0
+        self._fp = open(self.path, "rb")
+        self._mm = mmap.mmap(self._fp.fileno(), 0, access=mmap.ACCESS_READ)
+        self._inode = st.st_ino
+        return len(self._mm)
+
+    def _unmap(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if self._fp is not None:
+            self._fp.close()
+            self._fp = None
+
+    def _reset(self) -> None:
+        self._offsets = array("Q")
+        self._times = array("d")
+        self._lines = 0
+        self._pos = 0
+        self._inode = None
+        self._blocks.clear()
+
+    def _decompress(self) -> Path:
+        cache_dir = self.cache_dir or self.source.parent
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        target = cache_dir / self.source.stem  # app.<stamp>.log
+        src_mtime = self.source.stat().st_mtime
+        if target.exists() and target.stat().st_mtime >= src_mtime:
+            return target
+        part = target.with_name(target.name + ".part")
+        with gzip.open(self.source, "rb") as src, open(part, "wb") as dst:
+            shutil.copyfileobj(src, dst, CHUNK)
+        os.replace(part, target)
+        self.log.info(f"Decompressed {self.source.name} for viewing")
+        return target
+
+
+def prune_cache(cache_dir: Path, keep: List[Path]) -> None:
+    """Drop decompressed copies whose .gz segment is gone."""
+    if not cache_dir.is_dir():
+        return
+    wanted = {p.stem for p in keep if p.suffix == ".gz"}
+    for p in cache_dir.iterdir():
+        if p.name not in wanted:
+            p.unlink(missing_ok=True)
+
+
+def window_bounds(index: LogFileIndex) -> Tuple[Optional[float], Optional[float]]:
+    """(first, last) timestamps in the indexed part of the file."""
+    n = index.line_count
+    if not n:
+        return None, None
+    return index.time_at(0), index.time_at(n - 1)
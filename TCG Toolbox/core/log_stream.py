@@ -1,13 +1,59 @@
 import logging
 import queue
+import time
+from typing import NamedTuple, Optional
+
+
+class LogEntry(NamedTuple):
+    """What travels through LOG_QUEUE: the record's fields, not a formatted line."""
+    created: float
+    levelno: int
+    name: str
+    msg: object
+    args: tuple
+    exc_text: Optional[str] = None
+
+    @property
+    def levelname(self) -> str:
+        return logging.getLevelName(self.levelno)
+
+    def message(self) -> str:
+        msg = str(self.msg)
+        if self.args:
+            try:
+                msg = msg % self.args
+            except Exception:
+                msg = f"{msg} {self.args!r}"
+        return msg
+
+
+LOG_QUEUE: queue.SimpleQueue[LogEntry] = queue.SimpleQueue()
+
+_EXC_FORMATTER = logging.Formatter()
+
+
+def format_entry(entry: LogEntry) -> str:
+    """Same layout as the app's file Formatter: asctime | LEVEL | logger | message."""
+    secs = int(entry.created)
+    asctime = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(secs))
+    msecs = int((entry.created - secs) * 1000)
+    return f"{asctime},{msecs:03d} | {entry.levelname} | {entry.name} | {entry.message()}"
 
-LOG_QUEUE: queue.SimpleQueue[str] = queue.SimpleQueue()
 
 class QueueLogHandler(logging.Handler):
-    """A logging handler that pushes formatted log lines into a Python queue."""
+    """
+    A logging handler that pushes structured LogEntry tuples into a Python queue.
+
+    Nothing is formatted on the producing thread: the UI formats a row only
+    when it is painted. Tracebacks are the exception - they're rendered here
+    (rarely hit) so the queue doesn't keep frames alive. Like any deferred
+    formatting, mutable args are read at display time.
+    """
     def emit(self, record: logging.LogRecord) -> None:
         try:
-            msg = self.format(record)
-            LOG_QUEUE.put(msg)
+            exc_text = None
+            if record.exc_info:
+                exc_text = record.exc_text or _EXC_FORMATTER.formatException(record.exc_info)
+            LOG_QUEUE.put(LogEntry(record.created, record.levelno, record.name, record.msg, record.args, exc_text))
         except Exception:
             pass
@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import gzip
+import logging
+import logging.handlers
+import os
+import queue
+import re
+import shutil
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import BinaryIO, List, Optional
+
+_STOP = object()
+_EXC_FORMATTER = logging.Formatter()
+
+
+def log_segments(path: Path) -> List[Path]:
+    """Rotated segments of `path`, oldest first (.log while still being compressed, else .log.gz)."""
+    path = Path(path)
+    pattern = re.compile(
+        rf"^{re.escape(path.stem)}\.(\d{{8}}-\d{{6}})(?:-(\d+))?{re.escape(path.suffix)}(?:\.gz)?$"
+    )
+    found = []
+    if path.parent.is_dir():
+        for p in path.parent.iterdir():
+            m = pattern.match(p.name)
+            if m:
+                found.append(((m.group(1), int(m.group(2) or 0)), p))
+    return [p for _, p in sorted(found)]
+
+
+class LazyQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that leaves message formatting to the writer thread.
+
+    The stock prepare() formats on the calling thread and strips args; here
+    only the traceback is rendered (so frames aren't kept alive) and the
+    record is copied, since other handlers share it.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Shallow copy via __dict__: ~4x cheaper than copy.copy() on a LogRecord
+        shared, record = record, logging.LogRecord.__new__(logging.LogRecord)
+        record.__dict__.update(shared.__dict__)
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = _EXC_FORMATTER.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class RotatingLogWriter:
+    """
+    Background writer for app.log (the listener side of LazyQueueHandler).
+
+    One daemon thread drains the queue in batches, formats and writes them
+    and flushes at most every `flush_interval` seconds (or when idle). The
+    file rotates when it would pass `max_bytes` and at local midnight;
+    rotated segments (`app.YYYYmmdd-HHMMSS.log`) are gzipped on a second
+    thread and only the newest `backup_count` are kept.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        formatter: logging.Formatter,
+        max_bytes: int = 20 * 1024 * 1024,
+        backup_count: int = 10,
+        daily: bool = True,
+        flush_interval: float = 0.5,
+        max_batch: int = 2000,
+    ):
+        self.path = Path(path)
+        self.formatter = formatter
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.daily = daily
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+
+        self.queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._compress_q: "queue.SimpleQueue[Optional[Path]]" = queue.SimpleQueue()
+        self._fp: Optional[BinaryIO] = None
+        self._size = 0
+        self._next_rollover = 0.0
+        self._thread: Optional[threading.Thread] = None
+        self._compressor: Optional[threading.Thread] = None
+
+    # ---------- public ----------
+    def handler(self, level: int = logging.NOTSET) -> LazyQueueHandler:
+        h = LazyQueueHandler(self.queue)
+        h.setLevel(level)
+        return h
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        for leftover in self._uncompressed_segments():  # e.g. quit mid-compression
+            self._compress_q.put(leftover)
+        self._open()
+        if self._size and (self._size >= self.max_bytes or self._written_before_today()):
+            self._rotate()
+
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._compressor = threading.Thread(target=self._compress_loop, name="log-gzip", daemon=True)
+        self._thread.start()
+        self._compressor.start()
+
+    def flush(self, timeout: float = 2.0) -> bool:
+        """Wait until everything queued so far is on disk (e.g. before copying app.log)."""
+        if self._thread is None:
+            return False
+        done = threading.Event()
+        self.queue.put(done)
+        return done.wait(timeout)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        if self._thread is None:
+            return
+        self.queue.put(_STOP)
+        self._thread.join(timeout)
+        self._compress_q.put(None)
+        self._compressor.join(timeout)
+        self._thread = None
+        self._compressor = None
+
+    def segments(self) -> List[Path]:
+        return log_segments(self.path)
+
+    # ---------- writer thread ----------
+    def _run(self) -> None:
+        last_flush = time.monotonic()
+        while True:
+            try:
+                item = self.queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                self._flush()
+                last_flush = time.monotonic()
+                continue
+
+            records: List[logging.LogRecord] = []
+            waiters: List[threading.Event] = []
+            stop = False
+            while True:
+                if item is _STOP:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    records.append(item)
+                if stop or len(records) >= self.max_batch:
+                    break
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            if records:
+                self._write(records)
+            now = time.monotonic()
+            if waiters or stop or now - last_flush >= self.flush_interval:
+                self._flush()
+                last_flush = now
+            for w in waiters:
+                w.set()
+            if stop:
+                self._close()
+                return
+
+    def _write(self, records: List[logging.LogRecord]) -> None:
+        lines = []
+        for r in records:
+            try:
+                lines.append(self.formatter.format(r))
+            except Exception:
+                lines.append(f"<unformattable log record from {r.name}: {r.msg!r}>")
+        data = ("\n".join(lines) + "\n").encode("utf-8", "backslashreplace")
+
+        if self.daily and time.time() >= self._next_rollover:
+            self._rotate()
+        elif self._size and self._size + len(data) > self.max_bytes:
+            self._rotate()
+        try:
+            self._fp.write(data)
+            self._size += len(data)
+        except OSError as e:
+            sys.stderr.write(f"log writer: failed to write {self.path}: {e}\n")
+
+    def _flush(self) -> None:
+        try:
+            if self._fp is not None:
+                self._fp.flush()
+        except OSError as e:
+            sys.stderr.write(f"log writer: failed to flush {self.path}: {e}\n")
+
+    def _open(self) -> None:
+        self._fp = open(self.path, "ab", buffering=1024 * 1024)
+        self._size = self._fp.tell()
+        tomorrow = datetime.now().date() + timedelta(days=1)
+        self._next_rollover = datetime.combine(tomorrow, datetime.min.time()).timestamp()
+
+    def _close(self) -> None:
+        if self._fp is not None:
+            self._fp.close()
+            self._fp = None
+
+    def _rotate(self) -> None:
+        self._close()
+        target = self._segment_path()
+        try:
+            os.replace(self.path, target)
+            self._compress_q.put(target)
+        except OSError as e:
+            # e.g. the file is open in a viewer on Windows; try again after another max_bytes
+            sys.stderr.write(f"log writer: failed to rotate {self.path}: {e}\n")
+            self._open()
+            self._size = 0
+            return
+        self._open()
+
+    def _segment_path(self) -> Path:
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        base = f"{self.path.stem}.{stamp}"
+        target = self.path.with_name(f"{base}{self.path.suffix}")
+        n = 1
+        while target.exists() or target.with_name(target.name + ".gz").exists():
+            target = self.path.with_name(f"{base}-{n}{self.path.suffix}")
+            n += 1
+        return target
+
+    def _written_before_today(self) -> bool:
+        midnight = datetime.combine(datetime.now().date(), datetime.min.time()).timestamp()
+        return self.path.stat().st_mtime < midnight
+
+    def _uncompressed_segments(self) -> List[Path]:
+        return [p for p in self.segments() if p.suffix != ".gz"]
+
+    # ---------- compressor thread ----------
+    def _compress_loop(self) -> None:
+        while True:
+            path = self._compress_q.get()
+            if path is None:
+                return
+            try:
+                self._compress(path)
+                self._prune()
+            except OSError as e:
+                sys.stderr.write(f"log writer: failed to compress {path}: {e}\n")
+
+    @staticmethod
+    def _compress(path: Path) -> None:
+        gz = path.with_name(path.name + ".gz")
+        part = gz.with_name(gz.name + ".part")
+        with open(path, "rb") as src, gzip.open(part, "wb", compresslevel=6) as dst:
+            shutil.copyfileobj(src, dst, 1024 * 1024)
+        os.replace(part, gz)
+        path.unlink()
+
+    def _prune(self) -> None:
+        compressed = [p for p in self.segments() if p.suffix == ".gz"]
+        for old in compressed[:max(0, len(compressed) - self.backup_count)]:
+            old.unlink(missing_ok=True)
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Dict, List, Tuple, Union
+
+# Histogram bucket upper bounds: 100 µs .. ~100 s, four per doubling (~19% wide)
+_BOUNDS: Tuple[float, ...] = tuple(0.0001 * 2 ** (i / 4) for i in range(81))
+
+
+class Counter:
+    """Monotonic total (requests, bytes, seconds slept, ...)."""
+
+    __slots__ = ("_value", "_lock")
+
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+
+class Gauge:
+    """Last value set (e.g. a set's current cards/s)."""
+
+    __slots__ = ("_value",)
+
+    def __init__(self):
+        self._value = 0.0
+
+    def set(self, value: float) -> None:
+        self._value = value
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+
+@dataclass(frozen=True)
+class HistogramSnapshot:
+    count: int
+    total: float
+    min: float
+    max: float
+    p50: float
+    p95: float
+    p99: float
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+class Histogram:
+    """
+    Distribution of durations (seconds) in fixed log-spaced buckets, so
+    observe() is O(log buckets) and memory is constant; percentiles are
+    interpolated within a bucket (~19% wide), min/max/sum are exact.
+    """
+
+    __slots__ = ("_counts", "_count", "_total", "_min", "_max", "_lock")
+
+    def __init__(self):
+        self._counts = [0] * (len(_BOUNDS) + 1)
+        self._count = 0
+        self._total = 0.0
+        self._min = float("inf")
+        self._max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        b = bisect_left(_BOUNDS, value)
+        with self._lock:
+            self._counts[b] += 1
+            self._count += 1
+            self._total += value
+            if value < self._min:
+                self._min = value
+            if value > self._max:
+                self._max = value
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def snapshot(self) -> HistogramSnapshot:
+        with self._lock:
+            counts = list(self._counts)
+            n, total, lo, hi = self._count, self._total, self._min, self._max
+        if not n:
+            return HistogramSnapshot(0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+
+        def quantile(q: float) -> float:
+            rank = q * n
+            seen = 0
+            for b, c in enumerate(counts):
+                if c and seen + c >= rank:
+                    # Interpolate inside the bucket, clamped to what was actually seen
+                    lower = _BOUNDS[b - 1] if b else 0.0
+                    upper = _BOUNDS[b] if b < len(_BOUNDS) else hi
+                    value = lower + (upper - lower) * (rank - seen) / c
+                    return min(max(value, lo), hi)
+                seen += c
+            return hi
+
+        return HistogramSnapshot(n, total, lo, hi, quantile(0.50), quantile(0.95), quantile(0.99))
+
+
+Metric = Union[Counter, Gauge, Histogram]
+
+
+class MetricsRegistry:
+    """
+    In-process metrics by (name, label). Recording is a dict lookup plus a
+    short lock, cheap enough for per-request / per-page call sites; readers
+    (the Metrics dock, cli.py) poll snapshot-style accessors.
+
+        METRICS.counter("http.bytes").inc(len(body))
+        METRICS.histogram("http.request_s").observe(elapsed)
+        METRICS.gauge("ingest.set_cards_per_s", label=set_code).set(rate)
+    """
+
+    def __init__(self):
+        self._metrics: Dict[Tuple[str, str], Metric] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, label: str = "") -> Counter:
+        return self._get(name, label, Counter)
+
+    def gauge(self, name: str, label: str = "") -> Gauge:
+        return self._get(name, label, Gauge)
+
+    def histogram(self, name: str, label: str = "") -> Histogram:
+        return self._get(name, label, Histogram)
+
+    def value(self, name: str, label: str = "") -> float:
+        """Counter/gauge value, 0 if nothing was recorded yet."""
+        metric = self._metrics.get((name, label))
+        return metric.value if isinstance(metric, (Counter, Gauge)) else 0.0
+
+    def labels(self, name: str) -> Dict[str, Metric]:
+        """Every labelled series of `name` (label -> metric)."""
+        with self._lock:
+            return {label: m for (n, label), m in self._metrics.items() if n == name and label}
+
+    def items(self) -> List[Tuple[str, str, Metric]]:
+        with self._lock:
+            return [(name, label, m) for (name, label), m in sorted(self._metrics.items())]
+
+    def as_dict(self) -> dict:
+        """Plain-data dump (for JSON / the CLI)."""
+        out: dict = {}
+        for name, label, m in self.items():
+            key = f"{name}[{label}]" if label else name
+            if isinstance(m, Histogram):
+                s = m.snapshot()
+                out[key] = {"count": s.count, "sum": s.total, "min": s.min, "max": s.max,
+                            "p50": s.p50, "p95": s.p95, "p99": s.p99}
+            else:
+                out[key] = m.value
+        return out
+
+    def reset(self) -> None:
+        with self._lock:
+            self._metrics.clear()
+
+    def _get(self, name: str, label: str, kind: type) -> Metric:
+        key = (name, label)
+        metric = self._metrics.get(key)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(key)
+                if metric is None:
+                    metric = self._metrics[key] = kind()
+        if not isinstance(metric, kind):
+            raise TypeError(f"metric {name!r} is a {type(metric).__name__}, not a {kind.__name__}")
+        return metric
+
+
+# Process-wide registry used by the Scryfall client, transport and ingest
+METRICS = MetricsRegistry()
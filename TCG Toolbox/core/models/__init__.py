@@ -1,5 +1,6 @@
 from .game import Game
 from .set import Set
 from .card import Card
+from .card_table import CardRow, CardTable
 
-__all__ = ["Game", "Set", "Card"]
+__all__ = ["Game", "Set", "Card", "CardRow", "CardTable"]
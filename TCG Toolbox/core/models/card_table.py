@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import uuid
+from array import array
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple, Union, overload
+
+from core.strings import StringPool
+
+
+# Shared by every CardTable so a name is stored once for the whole catalog
+NAME_POOL = StringPool()
+
+_UUID_LEN = 16
+
+
+class CardRow:
+    """Lightweight view of one CardTable row; duck-types as Card (id, name)."""
+
+    __slots__ = ("_table", "_row")
+
+    def __init__(self, table: "CardTable", row: int):
+        self._table = table
+        self._row = row
+
+    @property
+    def id(self) -> str:
+        return self._table.id_at(self._row)
+
+    @property
+    def name(self) -> str:
+        return self._table.name_at(self._row)
+
+    def __eq__(self, other) -> bool:
+        return getattr(other, "id", None) == self.id and getattr(other, "name", None) == self.name
+
+    def __hash__(self) -> int:
+        return hash(self.id)
+
+    def __repr__(self) -> str:
+        return f"CardRow(id={self.id!r}, name={self.name!r})"
+
+
+class CardTable(Sequence[CardRow]):
+    """
+    Column-backed cards for one set.
+
+    Ids are packed as 16-byte UUIDs in one bytearray (Scryfall ids are UUIDs;
+    anything else goes to a small side table) and names are ids into NAME_POOL,
+    so a card costs ~20 bytes instead of a dataclass instance plus two strings.
+    Indexing returns a CardRow view; use name_at()/id_at() to skip even that.
+    """
+
+    __slots__ = ("_ids", "_names", "_odd_ids", "_pool")
+
+    def __init__(self, rows: Iterable[Tuple[str, str]] = (), pool: StringPool = NAME_POOL):
+        self._ids = bytearray()
+        self._names = array("I")
+        self._odd_ids: Dict[int, str] = {}
+        self._pool = pool
+        for card_id, name in rows:
+            self.append(card_id, name)
+
+    def append(self, card_id: str, name: str) -> None:
+        row = len(self._names)
+        try:
+            u = uuid.UUID(card_id)
+        except (ValueError, TypeError, AttributeError):
+            u = None
+        if u is not None and str(u) == card_id:
+            self._ids += u.bytes
+        else:
+            self._ids += bytes(_UUID_LEN)
+            self._odd_ids[row] = card_id
+        self._names.append(self._pool.intern(name))
+
+    def extend(self, rows: Iterable[Tuple[str, str]]) -> None:
+        for card_id, name in rows:
+            self.append(card_id, name)
+
+    def id_at(self, row: int) -> str:
+        odd = self._odd_ids.get(row)
+        if odd is not None:
+            return odd
+        start = row * _UUID_LEN
+        return str(uuid.UUID(bytes=bytes(self._ids[start:start + _UUID_LEN])))
+
+    def name_at(self, row: int) -> str:
+        return self._pool.get(self._names[row])
+
+    def name_id_at(self, row: int) -> int:
+        return self._names[row]
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    @overload
+    def __getitem__(self, i: int) -> CardRow: ...
+
+    @overload
+    def __getitem__(self, i: slice) -> List[CardRow]: ...
+
+    def __getitem__(self, i: Union[int, slice]):
+        if isinstance(i, slice):
+            return [CardRow(self, r) for r in range(*i.indices(len(self)))]
+        n = len(self._names)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("CardTable index out of range")
+        return CardRow(self, i)
+
+    def __iter__(self) -> Iterator[CardRow]:
+        for r in range(len(self._names)):
+            yield CardRow(self, r)
+
+    def nbytes(self) -> int:
+        """Approximate column memory (excludes the shared name pool)."""
+        return len(self._ids) + self._names.itemsize * len(self._names)
+
+    def __repr__(self) -> str:
+        return f"CardTable({len(self)} cards)"
@@ -2,7 +2,7 @@ from dataclasses import dataclass, field
 from typing import Dict, List, Optional
 from .set import Set
 
-@dataclass
+@dataclass(slots=True)
 class Game:
     id: str
     name: str
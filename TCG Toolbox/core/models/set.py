@@ -1,13 +1,13 @@
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import Optional, Sequence
 from .card import Card
 
-@dataclass
+@dataclass(slots=True)
 class Set:
     id: str
     code: str
     name: str
     released_at: Optional[str] = None
     search_uri: Optional[str] = None
-    cards: List[Card] = field(default_factory=list)
+    cards: Sequence[Card] = field(default_factory=list)  # usually a CardTable
     cards_loaded: bool = False
@@ -0,0 +1,8 @@
+from pathlib import Path
+
+
+def app_dir() -> Path:
+    """~/.tcg_toolbox (created on first use)."""
+    d = Path.home() / ".tcg_toolbox"
+    d.mkdir(parents=True, exist_ok=True)
+    return d
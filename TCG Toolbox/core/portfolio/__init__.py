@@ -0,0 +1,11 @@
+from .prices import CURRENCIES, FINISHES, PriceTable
+from .holdings import Holdings
+from .valuation import Mover, Valuation, top_movers, unit_prices, valuate
+from .portfolio import Portfolio
+from .history import HistorySnapshot, PriceChange, PriceHistory, PriceSeries
+
+__all__ = [
+    "CURRENCIES", "FINISHES", "PriceTable", "Holdings", "Mover", "Valuation",
+    "top_movers", "unit_prices", "valuate", "Portfolio",
+    "HistorySnapshot", "PriceChange", "PriceHistory", "PriceSeries",
+]
@@ -0,0 +1,346 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.log import get_logger
+from core.paths import app_dir
+from core.portfolio.prices import PRICE_FIELDS
+
+# Prices are stored as int32 cents; MISSING = no price that day
+MISSING = np.iinfo(np.int32).min
+# A full keyframe every N snapshots bounds how many deltas a query replays
+KEYFRAME_EVERY = 30
+
+_WIDTH = len(PRICE_FIELDS)
+# One day's delta: every (card, field) slot whose price differs from the day
+# before, as slot = card * _WIDTH + field (sorted) and the new price
+_CHUNK = np.dtype([("slot", "<i4"), ("price", "<i4")])
+
+
+def default_history_dir() -> Path:
+    return app_dir() / "price_history"
+
+
+def encode_prices(values: Sequence[Sequence[Optional[float]]]) -> np.ndarray:
+    """(n, len(PRICE_FIELDS)) floats/None -> int32 cents with MISSING."""
+    v = np.array(values, dtype=np.float64).reshape(len(values), _WIDTH)  # None -> nan
+    out = np.full(v.shape, MISSING, dtype=np.int32)
+    ok = ~np.isnan(v)
+    out[ok] = np.rint(v[ok] * 100)
+    return out
+
+
+def decode_prices(cents: np.ndarray) -> np.ndarray:
+    return np.where(cents == MISSING, np.nan, cents / 100.0)
+
+
+@dataclass
+class PriceSeries:
+    days: List[str]
+    card_ids: List[str]
+    values: np.ndarray  # float64 (len(days), len(card_ids)), NaN = no price / unknown card
+
+
+@dataclass(frozen=True)
+class PriceChange:
+    card_id: str
+    field: str
+    before: float
+    after: float
+
+    @property
+    def change(self) -> float:
+        return self.after - self.before
+
+
+class PriceHistory:
+    """
+    Daily price snapshots on disk, one file per day, memory-mapped on read.
+
+    Layout under `root`:
+      cards.txt            card id per line; line number = card index (append-only)
+      YYYY-MM-DD.npy       delta: (slot, price) for each card/field changed since the previous day
+      YYYY-MM-DD.key.npy   keyframe: int32 (n, 6) full prices, every KEYFRAME_EVERY days
+
+    A query starts from the nearest keyframe and replays at most
+    KEYFRAME_EVERY deltas, touching only the requested cards. Several
+    syncs on one day fold into that day's delta.
+    """
+
+    def __init__(self, root: Optional[Path] = None):
+        self.root = Path(root) if root else default_history_dir()
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.log = get_logger("portfolio.history")
+        self._lock = threading.Lock()
+        self._ids: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._load_ids()
+
+    # ---------- card index ----------
+    def _load_ids(self) -> None:
+        path = self.root / "cards.txt"
+        if path.exists():
+            self._ids = path.read_text(encoding="utf-8").splitlines()
+            self._index = {c: i for i, c in enumerate(self._ids)}
+
+    def _intern(self, card_ids: Sequence[str]) -> np.ndarray:
+        new = []
+        out = np.empty(len(card_ids), dtype=np.int32)
+        for i, card_id in enumerate(card_ids):
+            k = self._index.get(card_id)
+            if k is None:
+                k = self._index[card_id] = len(self._ids)
+                self._ids.append(card_id)
+                new.append(card_id)
+            out[i] = k
+        if new:
+            with (self.root / "cards.txt").open("a", encoding="utf-8") as fp:
+                fp.write("\n".join(new) + "\n")
+        return out
+
+    def index_of(self, card_ids: Iterable[str]) -> np.ndarray:
+        """Card index per id (-1 for ids never recorded)."""
+        get = self._index.get
+        return np.fromiter((get(c, -1) for c in card_ids), dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    # ---------- files ----------
+    def days(self) -> List[str]:
+        return sorted(p.name[:10] for p in self.root.glob("????-??-??.npy"))
+
+    def keyframes(self) -> List[str]:
+        return sorted(p.name[:10] for p in self.root.glob("????-??-??.key.npy"))
+
+    def _chunk(self, day: str) -> np.ndarray:
+        return np.load(self.root / f"{day}.npy", mmap_mode="r")
+
+    def _key(self, day: str) -> np.ndarray:
+        return np.load(self.root / f"{day}.key.npy", mmap_mode="r")
+
+    def _save(self, name: str, array: np.ndarray) -> None:
+        # Write-then-rename so readers never map a half-written file
+        tmp = self.root / f"{name}.tmp"
+        with tmp.open("wb") as fp:
+            np.save(fp, array)
+        os.replace(tmp, self.root / name)
+
+    # ---------- replay ----------
+    def _walk(self, cols: Optional[np.ndarray], first: str, last: str) -> Iterator[Tuple[str, np.ndarray]]:
+        """
+        Yield (day, int32 (len(cols), 6) prices) for each stored day in
+        [first, last]; cols=None means every card. The yielded array is
+        updated in place by the next step, so copy what you keep.
+        """
+        days = [d for d in self.days() if d <= last]
+        keys = [k for k in self.keyframes() if k <= first and k in days]
+        start = keys[-1] if keys else None
+        n = len(self._ids) if cols is None else len(cols)
+        state = np.full((n, _WIDTH), MISSING, dtype=np.int32)
+        flat = state.reshape(-1)
+        if cols is not None:
+            slots = (cols[:, None] * _WIDTH + np.arange(_WIDTH)).reshape(-1)
+
+        if start is not None:
+            key = self._key(start)
+            if cols is None:
+                state[:len(key)] = key
+            else:
+                ok = (cols >= 0) & (cols < len(key))
+                state[ok] = key[cols[ok]]
+
+        for day in days:
+            if start is not None and day <= start:
+                if day == start and day >= first:
+                    yield day, state
+                continue
+            chunk = self._chunk(day)
+            if len(chunk):
+                if cols is None:
+                    flat[chunk["slot"]] = chunk["price"]
+                else:
+                    changed = chunk["slot"]
+                    pos = np.minimum(np.searchsorted(changed, slots), len(changed) - 1)
+                    hit = changed[pos] == slots
+                    flat[hit] = chunk["price"][pos[hit]]
+            if day >= first:
+                yield day, state
+
+    def _state_at(self, day: Optional[str], cols: Optional[np.ndarray] = None) -> np.ndarray:
+        """Prices as of `day` (int32 (n, 6)); all MISSING when day is None."""
+        n = len(self._ids) if cols is None else len(cols)
+        if day is not None:
+            for d, state in self._walk(cols, day, day):
+                if d == day:
+                    return state
+        return np.full((n, _WIDTH), MISSING, dtype=np.int32)
+
+    # ---------- writing ----------
+    def snapshot(self, day: Optional[str] = None) -> "HistorySnapshot":
+        """A snapshot for `day` (default today) that ingest threads add cards to, then commit()."""
+        return HistorySnapshot(self, day or date.today().isoformat())
+
+    def _commit(self, day: str, card_ids: Sequence[str], cents: np.ndarray) -> int:
+        with self._lock:
+            days = self.days()
+            if days and day < days[-1]:
+                raise ValueError(f"Price history already has {days[-1]}; can't write {day}")
+            t0 = time.perf_counter()
+            cols = self._intern(card_ids)
+            n = len(self._ids)
+
+            current = np.full((n, _WIDTH), MISSING, dtype=np.int32)
+            if days:
+                latest = self._state_at(days[-1])
+                current[:len(latest)] = latest
+            new = current.copy()
+            new[cols] = cents
+
+            # Re-syncing the same day: the delta stays relative to the previous day
+            if days and days[-1] == day:
+                earlier = [d for d in days if d < day]
+                base = np.full_like(new, MISSING)
+                prev = self._state_at(earlier[-1] if earlier else None)
+                base[:len(prev)] = prev
+            else:
+                base = current
+                days.append(day)
+
+            changed = np.flatnonzero(new.reshape(-1) != base.reshape(-1))
+            chunk = np.empty(len(changed), dtype=_CHUNK)
+            chunk["slot"] = changed
+            chunk["price"] = new.reshape(-1)[changed]
+            self._save(f"{day}.npy", chunk)
+
+            keys = self.keyframes()
+            since_key = len(days) - 1 - days.index(keys[-1]) if keys else len(days)
+            if not keys or keys[-1] == day or since_key >= KEYFRAME_EVERY:
+                self._save(f"{day}.key.npy", new)
+
+            self.log.info(
+                f"Price history {day}: {len(changed)} prices changed over {n} cards "
+                f"({(time.perf_counter() - t0) * 1000:.0f} ms)"
+            )
+            return len(changed)
+
+    # ---------- queries ----------
+    def series(self, card_ids: Sequence[str], field: str = "usd", days: int = 90,
+               end: Optional[str] = None) -> PriceSeries:
+        """`field` price of each card on every stored day in the `days` calendar days up to `end` (default latest)."""
+        f = PRICE_FIELDS.index(field)
+        stored = self.days()
+        card_ids = list(card_ids)
+        if not stored:
+            return PriceSeries([], card_ids, np.empty((0, len(card_ids))))
+        last = end or stored[-1]
+        first = (date.fromisoformat(last) - timedelta(days=max(days, 1) - 1)).isoformat()
+
+        cols = self.index_of(card_ids)
+        out_days, rows = [], []
+        for day, state in self._walk(cols, first, last):
+            out_days.append(day)
+            rows.append(state[:, f].copy())
+        values = decode_prices(np.array(rows, dtype=np.int32).reshape(len(rows), len(card_ids)))
+        return PriceSeries(out_days, card_ids, values)
+
+    def changes(self, field: str = "usd", since: Optional[str] = None,
+                limit: int = 20) -> List[PriceChange]:
+        """
+        Largest absolute `field` changes between `since` (default the
+        snapshot before the latest) and the latest snapshot. A `since` with
+        no snapshot of its own means the latest snapshot on or before it.
+        Cards without a price on either side are skipped.
+        """
+        f = PRICE_FIELDS.index(field)
+        stored = self.days()
+        if not stored or (len(stored) < 2 and since is None):
+            return []
+        last = stored[-1]
+        if since is None:
+            since = stored[-2]
+        elif since not in stored:
+            earlier = [d for d in stored if d < since]
+            if not earlier:
+                return []
+            since = earlier[-1]
+        later = [d for d in stored if since < d <= last]
+        if not later:
+            return []
+        # Only cards with this field in a delta after `since` can have moved
+        slots = np.concatenate([np.asarray(self._chunk(d)["slot"]) for d in later])
+        cols = np.unique(slots[slots % _WIDTH == f] // _WIDTH)
+        before = self._state_at(since, cols)[:, f].copy()
+        after = self._state_at(last, cols)[:, f]
+
+        ok = (before != MISSING) & (after != MISSING) & (before != after)
+        cols, before, after = cols[ok], before[ok], after[ok]
+        delta = np.abs(after.astype(np.int64) - before)
+        k = min(limit, len(delta))
+        if not k:
+            return []
+        top = np.argpartition(-delta, k - 1)[:k]
+        top = top[np.argsort(-delta[top], kind="stable")]
+        return [
+            PriceChange(self._ids[cols[i]], field, int(before[i]) / 100.0, int(after[i]) / 100.0)
+            for i in top
+        ]
+
+
+class HistorySnapshot:
+    """
+    Collects one sync's prices; add()/add_cards() are thread-safe so ingest
+    workers can feed pages as they land. Nothing is written until commit().
+    """
+
+    def __init__(self, history: PriceHistory, day: str):
+        self.history = history
+        self.day = day
+        self._lock = threading.Lock()
+        self._ids: List[str] = []
+        self._cents: List[np.ndarray] = []
+
+    def add(self, card_ids: Sequence[str], prices: Sequence[Sequence[Optional[float]]]) -> None:
+        """card ids with their PRICE_FIELDS values (floats or None)."""
+        if not card_ids:
+            return
+        cents = encode_prices(prices)
+        with self._lock:
+            self._ids.extend(card_ids)
+            self._cents.append(cents)
+
+    def add_cards(self, cards: Sequence[dict]) -> None:
+        """Scryfall card objects (their `prices` dict is decimal strings or null)."""
+        ids, prices = [], []
+        for c in cards:
+            p = c.get("prices") or {}
+            ids.append(c.get("id", ""))
+            prices.append([_float(p.get(f)) for f in PRICE_FIELDS])
+        self.add(ids, prices)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def commit(self) -> int:
+        """Write the day's delta; returns the number of prices that changed."""
+        with self._lock:
+            if not self._ids:
+                return 0
+            cents = np.concatenate(self._cents)
+            ids, self._ids, self._cents = self._ids, [], []
+        return self.history._commit(self.day, ids, cents)
+
+
+def _float(value) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
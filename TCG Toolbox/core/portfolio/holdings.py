@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from core.portfolio.prices import FINISHES, PriceTable
+
+_FINISH_CODE = {name: i for i, name in enumerate(FINISHES)}
+
+
+@dataclass
+class Holdings:
+    """
+    A collection as parallel arrays: PriceTable row, finish code and
+    quantity per holding. Rows whose card id the price table doesn't know
+    are kept aside in `unresolved` (card_id, finish, quantity).
+    """
+    card: np.ndarray        # int64 rows into the PriceTable
+    finish: np.ndarray      # int8 index into FINISHES
+    quantity: np.ndarray    # int32
+    unresolved: List[Tuple[str, str, int]] = field(default_factory=list)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Sequence], prices: PriceTable) -> "Holdings":
+        """Build from (card_id, finish, quantity) rows, e.g. store.load_holdings()."""
+        rows = [(r[0], r[1], r[2]) for r in rows]
+        card = prices.index_of(r[0] for r in rows)
+        finish = np.fromiter((_FINISH_CODE.get(r[1], 0) for r in rows), dtype=np.int8, count=len(rows))
+        quantity = np.fromiter((r[2] for r in rows), dtype=np.int32, count=len(rows))
+
+        known = card >= 0
+        unresolved = [rows[i] for i in np.flatnonzero(~known)]
+        return cls(card[known], finish[known], quantity[known], unresolved)
+
+    def __len__(self) -> int:
+        return len(self.card)
+
+    @property
+    def total_quantity(self) -> int:
+        return int(self.quantity.sum())
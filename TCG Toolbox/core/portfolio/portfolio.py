@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING, Iterable, List, Optional, Tuple
+
+from core.log import get_logger
+from core.portfolio.holdings import Holdings
+from core.portfolio.prices import PriceTable
+from core.portfolio.valuation import Mover, Valuation, top_movers, valuate
+
+if TYPE_CHECKING:
+    from providers.scryfall.store import ScryfallStore
+
+
+class Portfolio:
+    """
+    One named collection from the store, valued against its stored prices.
+
+    Prices and holdings are loaded into arrays once; value() and movers()
+    are then pure NumPy. Call refresh_prices() after a sync: the price
+    table keeps its card rows, so the holdings don't need re-resolving.
+    """
+
+    def __init__(self, store: "ScryfallStore", name: str = "default",
+                 prices: Optional[PriceTable] = None):
+        self.store = store
+        self.name = name
+        self.log = get_logger("portfolio")
+        t0 = time.perf_counter()
+        self.prices = prices if prices is not None else PriceTable.from_rows(store.price_rows())
+        self.holdings = Holdings.from_rows(store.load_holdings(name), self.prices)
+        self.log.info(
+            f"Portfolio '{name}': {len(self.holdings)} holdings over {len(self.prices)} priced cards "
+            f"loaded in {(time.perf_counter() - t0) * 1000:.0f} ms"
+            + (f" ({len(self.holdings.unresolved)} unknown card ids)" if self.holdings.unresolved else "")
+        )
+
+    def set_holdings(self, rows: Iterable[Tuple[str, str, int]]) -> None:
+        """Write (card_id, finish, quantity) changes and reload the holdings."""
+        self.store.upsert_holdings(self.name, rows)
+        self.holdings = Holdings.from_rows(self.store.load_holdings(self.name), self.prices)
+
+    def refresh_prices(self) -> int:
+        """Reload prices from the store (current -> previous for movers); returns new cards seen."""
+        added = self.prices.refresh(self.store.price_rows())
+        if added or self.holdings.unresolved:
+            self.holdings = Holdings.from_rows(self.store.load_holdings(self.name), self.prices)
+        return added
+
+    def value(self, currency: str = "usd", foil_fallback: bool = False) -> Valuation:
+        return valuate(self.holdings, self.prices, currency, foil_fallback)
+
+    def movers(self, currency: str = "usd", limit: int = 10) -> Tuple[List[Mover], List[Mover]]:
+        return top_movers(self.holdings, self.prices, currency, limit)
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Finish codes used in Holdings.finish and as rows of a price matrix
+FINISHES = ("nonfoil", "foil", "etched")
+
+# Scryfall `prices` keys, in column order everywhere: the store's price columns,
+# price_rows(), card_row() tuples and price-history slots (a new key needs a store migration)
+PRICE_FIELDS = ("usd", "usd_foil", "usd_etched", "eur", "eur_foil", "tix")
+# Source column per finish, by currency; None = Scryfall has no such price
+CURRENCIES: Dict[str, Tuple[Optional[str], ...]] = {
+    "usd": ("usd", "usd_foil", "usd_etched"),
+    "eur": ("eur", "eur_foil", None),
+    "tix": ("tix", None, None),
+}
+
+
+class PriceTable:
+    """
+    Prices for every known card as float64 columns (NaN = no price), with
+    the set of each card as an int column for grouping.
+
+    Card rows are only ever appended, so indices handed out by index_of()
+    stay valid across refresh(); the prices from before the last refresh
+    are kept for movers.
+    """
+
+    def __init__(self):
+        self.ids: List[str] = []
+        self._index: Dict[str, int] = {}
+        self.set_codes: List[str] = []
+        self._set_index: Dict[str, int] = {}
+        self.card_set = np.zeros(0, dtype=np.int32)
+        self.current = np.full((len(PRICE_FIELDS), 0), np.nan)
+        self.previous = np.full((len(PRICE_FIELDS), 0), np.nan)
+        self._matrices: Dict[Tuple[str, bool], np.ndarray] = {}
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Sequence]) -> "PriceTable":
+        table = cls()
+        table.refresh(rows)
+        table.previous = table.current.copy()
+        return table
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def refresh(self, rows: Iterable[Sequence]) -> int:
+        """
+        Load (card_id, set_code, *PRICE_FIELDS) rows, e.g. store.price_rows().
+        The current prices become `previous`; cards missing from `rows`
+        keep their row with NaN prices. Returns how many cards were new.
+        """
+        rows = list(rows)
+        n_before = len(self.ids)
+        positions = np.empty(len(rows), dtype=np.int64)
+        set_of_row = np.empty(len(rows), dtype=np.int32)
+        for i, row in enumerate(rows):
+            card_id, set_code = row[0], row[1]
+            k = self._index.get(card_id)
+            if k is None:
+                k = self._index[card_id] = len(self.ids)
+                self.ids.append(card_id)
+            s = self._set_index.get(set_code)
+            if s is None:
+                s = self._set_index[set_code] = len(self.set_codes)
+                self.set_codes.append(set_code)
+            positions[i] = k
+            set_of_row[i] = s
+
+        n = len(self.ids)
+        values = np.array([row[2:2 + len(PRICE_FIELDS)] for row in rows], dtype=np.float64).reshape(
+            len(rows), len(PRICE_FIELDS)
+        )  # None -> nan
+        current = np.full((len(PRICE_FIELDS), n), np.nan)
+        current[:, positions] = values.T
+
+        previous = np.full((len(PRICE_FIELDS), n), np.nan)
+        previous[:, :n_before] = self.current
+        card_set = np.zeros(n, dtype=np.int32)
+        card_set[:n_before] = self.card_set
+        card_set[positions] = set_of_row
+
+        self.previous, self.current, self.card_set = previous, current, card_set
+        self._matrices.clear()
+        return n - n_before
+
+    def index_of(self, card_ids: Iterable[str]) -> np.ndarray:
+        """Row of each id (-1 for unknown ids)."""
+        get = self._index.get
+        return np.fromiter((get(c, -1) for c in card_ids), dtype=np.int64)
+
+    def matrix(self, currency: str = "usd", previous: bool = False) -> np.ndarray:
+        """(len(FINISHES), len(self)) prices in `currency`; index as m[finish, card]."""
+        key = (currency, previous)
+        m = self._matrices.get(key)
+        if m is None:
+            fields = CURRENCIES[currency]
+            source = self.previous if previous else self.current
+            m = np.full((len(FINISHES), len(self.ids)), np.nan)
+            for f, field in enumerate(fields):
+                if field is not None:
+                    m[f] = source[PRICE_FIELDS.index(field)]
+            self._matrices[key] = m
+        return m
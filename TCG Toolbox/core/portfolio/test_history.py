@@ -0,0 +1,32 @@
+import math
+
+from core.portfolio.history import PriceHistory
+
+
+def _record(history, day, prices):
+    snapshot = history.snapshot(day)
+    snapshot.add(list(prices), [[usd, None, None, None, None, None] for usd in prices.values()])
+    snapshot.commit()
+
+
+def test_series_and_changes(tmp_path):
+    history = PriceHistory(tmp_path)
+    assert history.changes(since="2026-01-03") == []
+
+    _record(history, "2026-01-01", {"a": 1.0, "b": 2.0})
+    _record(history, "2026-01-05", {"a": 1.5, "b": 2.0, "c": 9.0})
+    _record(history, "2026-01-09", {"a": 3.0, "b": 1.0, "c": 9.0})
+
+    series = history.series(["a", "c", "unknown"], days=30)
+    assert series.days == ["2026-01-01", "2026-01-05", "2026-01-09"]
+    assert series.values[:, 0].tolist() == [1.0, 1.5, 3.0]
+    assert math.isnan(series.values[0, 1]) and series.values[1:, 1].tolist() == [9.0, 9.0]
+    assert all(math.isnan(v) for v in series.values[:, 2])
+
+    moves = {c.card_id: (c.before, c.after) for c in history.changes()}
+    assert moves == {"a": (1.5, 3.0), "b": (2.0, 1.0)}
+    # A day between snapshots means the latest snapshot on or before it
+    moves = {c.card_id: (c.before, c.after) for c in history.changes(since="2026-01-03")}
+    assert moves == {"a": (1.0, 3.0), "b": (2.0, 1.0)}
+    assert [c.card_id for c in history.changes(limit=1)] == ["a"]
+    assert history.changes(since="2025-12-01") == []
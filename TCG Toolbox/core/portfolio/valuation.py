@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Tuple
+
+import numpy as np
+
+from core.portfolio.holdings import Holdings
+from core.portfolio.prices import FINISHES, PriceTable
+
+
+@dataclass
+class Valuation:
+    """
+    Per-holding unit prices and values (arrays parallel to the Holdings)
+    plus the aggregates. Holdings without a price count as 0 and are
+    reported in `unpriced`.
+    """
+    currency: str
+    unit: np.ndarray      # float64, NaN where unpriced
+    value: np.ndarray     # unit * quantity, 0 where unpriced
+    total: float
+    unpriced: int         # holdings with no price in this currency/finish
+    set_codes: List[str]
+    set_totals: np.ndarray  # float64 per PriceTable set index
+
+    def by_set(self, limit: int = 0) -> List[Tuple[str, float]]:
+        """(set_code, value) with value > 0, largest first."""
+        order = np.argsort(-self.set_totals, kind="stable")
+        order = order[self.set_totals[order] > 0]
+        if limit:
+            order = order[:limit]
+        return [(self.set_codes[i], float(self.set_totals[i])) for i in order]
+
+
+@dataclass(frozen=True)
+class Mover:
+    card_id: str
+    finish: str
+    quantity: int
+    before: float
+    after: float
+
+    @property
+    def change(self) -> float:
+        """Change in the holding's value (per unit change * quantity)."""
+        return (self.after - self.before) * self.quantity
+
+
+def unit_prices(holdings: Holdings, prices: PriceTable, currency: str = "usd",
+                previous: bool = False, foil_fallback: bool = False) -> np.ndarray:
+    """Price of each holding; with foil_fallback a missing foil/etched price uses the nonfoil one."""
+    m = prices.matrix(currency, previous)
+    unit = m[holdings.finish, holdings.card]
+    if foil_fallback:
+        missing = np.isnan(unit) & (holdings.finish != 0)
+        unit[missing] = m[0, holdings.card[missing]]
+    return unit
+
+
+def valuate(holdings: Holdings, prices: PriceTable, currency: str = "usd",
+            foil_fallback: bool = False) -> Valuation:
+    unit = unit_prices(holdings, prices, currency, foil_fallback=foil_fallback)
+    priced = ~np.isnan(unit)
+    value = np.where(priced, unit, 0.0) * holdings.quantity
+    set_totals = np.bincount(prices.card_set[holdings.card], weights=value, minlength=len(prices.set_codes))
+    return Valuation(
+        currency=currency,
+        unit=unit,
+        value=value,
+        total=float(value.sum()),
+        unpriced=int((~priced).sum()),
+        set_codes=prices.set_codes,
+        set_totals=set_totals,
+    )
+
+
+def top_movers(holdings: Holdings, prices: PriceTable, currency: str = "usd",
+               limit: int = 10, foil_fallback: bool = False) -> Tuple[List[Mover], List[Mover]]:
+    """
+    (gainers, losers) by change in holding value between the previous and
+    current prices; holdings unpriced on either side are skipped.
+    """
+    before = unit_prices(holdings, prices, currency, previous=True, foil_fallback=foil_fallback)
+    after = unit_prices(holdings, prices, currency, foil_fallback=foil_fallback)
+    delta = (after - before) * holdings.quantity
+    rows = np.flatnonzero(~np.isnan(delta) & (delta != 0))
+    if not len(rows):
+        return [], []
+
+    def pick(order: np.ndarray) -> List[Mover]:
+        return [
+            Mover(prices.ids[holdings.card[i]], FINISHES[holdings.finish[i]], int(holdings.quantity[i]),
+                  float(before[i]), float(after[i]))
+            for i in order
+        ]
+
+    d = delta[rows]
+    k = min(limit, len(rows))
+    up = rows[np.argpartition(-d, k - 1)[:k]]
+    down = rows[np.argpartition(d, k - 1)[:k]]
+    gainers = pick(up[np.argsort(-delta[up], kind="stable")])
+    losers = pick(down[np.argsort(delta[down], kind="stable")])
+    return [m for m in gainers if m.change > 0], [m for m in losers if m.change < 0]
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import cProfile
+import io
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from core.log import get_logger
+from core.paths import app_dir
+
+MODES = ("cprofile", "sampling")
+
+
+def profiles_dir() -> Path:
+    d = app_dir() / "profiles"
+    d.mkdir(parents=True, exist_ok=True)
+    return d
+
+
+class SamplingProfiler:
+    """
+    Wall-clock stack sampler for every thread (GUI, ingest workers, ...).
+
+    A daemon thread reads sys._current_frames() every `interval` seconds
+    and counts collapsed stacks per thread name; nothing is hooked into the
+    profiled threads, so overhead is independent of how busy they are.
+    write() produces a .folded file (flamegraph.pl / speedscope) and a
+    .txt summary of the hottest functions per thread.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started = 0.0
+        self.elapsed = 0.0
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="profiler-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.elapsed = time.perf_counter() - self._started
+
+    def _run(self) -> None:
+        me = threading.get_ident()
+        labels: Dict[object, str] = {}  # code object -> "func (file.py:line)", built once each
+        while not self._stop.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                parts = []
+                while frame is not None:
+                    code = frame.f_code
+                    label = labels.get(code)
+                    if label is None:
+                        label = labels[code] = f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+                    parts.append(label)
+                    frame = frame.f_back
+                parts.append(names.get(ident, f"thread-{ident}"))
+                self.stacks[";".join(reversed(parts))] += 1
+            self.samples += 1
+
+    def write(self, base: Path) -> List[Path]:
+        folded = base.with_suffix(".folded")
+        with folded.open("w", encoding="utf-8") as f:
+            for stack, n in self.stacks.most_common():
+                f.write(f"{stack} {n}\n")
+
+        # Per thread: samples where a function is on the stack (inclusive) / on top (self)
+        inclusive: Dict[str, Counter] = {}
+        own: Dict[str, Counter] = {}
+        totals: Counter = Counter()
+        for stack, n in self.stacks.items():
+            thread, *frames = stack.split(";")
+            totals[thread] += n
+            inc = inclusive.setdefault(thread, Counter())
+            for fn in set(frames):
+                inc[fn] += n
+            if frames:
+                own.setdefault(thread, Counter())[frames[-1]] += n
+
+        summary = base.with_suffix(".txt")
+        with summary.open("w", encoding="utf-8") as f:
+            f.write(f"{self.samples} samples every {self.interval * 1000:.0f} ms over {self.elapsed:.1f}s\n")
+            for thread, total in totals.most_common():
+                f.write(f"\n== {thread} ({total} samples)\n  inclusive:\n")
+                for fn, n in inclusive[thread].most_common(15):
+                    f.write(f"  {n / total:6.1%}  {fn}\n")
+                f.write("  self:\n")
+                for fn, n in own.get(thread, Counter()).most_common(15):
+                    f.write(f"  {n / total:6.1%}  {fn}\n")
+        return [folded, summary]
+
+
+class ProfileSession:
+    """
+    One start/stop profiling run, written under ~/.tcg_toolbox/profiles.
+
+    cprofile  deterministic profile of the thread that calls start() (the
+              GUI thread from the menu); .prof for snakeviz/pstats + a .txt
+    sampling  SamplingProfiler over all threads, so ingest threads started
+              before or during the run are included
+    """
+
+    def __init__(self, mode: str = "sampling", out_dir: Optional[Path] = None):
+        if mode not in MODES:
+            raise ValueError(f"unknown profile mode {mode!r} (expected one of {MODES})")
+        self.mode = mode
+        self.out_dir = out_dir
+        self.log = get_logger("profiling")
+        self._profile: Optional[cProfile.Profile] = None
+        self._sampler: Optional[SamplingProfiler] = None
+        self._started_at = datetime.now()
+
+    @property
+    def running(self) -> bool:
+        return self._profile is not None or self._sampler is not None
+
+    def start(self) -> None:
+        self._started_at = datetime.now()
+        if self.mode == "cprofile":
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        else:
+            self._sampler = SamplingProfiler()
+            self._sampler.start()
+        self.log.info(f"Profiling started ({self.mode})")
+
+    def stop(self) -> List[Path]:
+        """Stop and write the results; returns the files written."""
+        base = (self.out_dir or profiles_dir()) / f"{self.mode}-{self._started_at:%Y%m%d-%H%M%S}"
+        base.parent.mkdir(parents=True, exist_ok=True)
+        if self._profile is not None:
+            profile, self._profile = self._profile, None
+            profile.disable()
+            written = self._write_cprofile(profile, base)
+        elif self._sampler is not None:
+            sampler, self._sampler = self._sampler, None
+            sampler.stop()
+            written = sampler.write(base)
+        else:
+            return []
+        self.log.info(f"Profile written: {', '.join(str(p) for p in written)}")
+        return written
+
+    @staticmethod
+    def _write_cprofile(profile: cProfile.Profile, base: Path) -> List[Path]:
+        prof = base.with_suffix(".prof")
+        profile.dump_stats(prof)
+        out = io.StringIO()
+        stats = pstats.Stats(profile, stream=out).strip_dirs()
+        stats.sort_stats("cumulative").print_stats(40)
+        stats.sort_stats("tottime").print_stats(25)
+        summary = base.with_suffix(".txt")
+        summary.write_text(out.getvalue(), encoding="utf-8")
+        return [prof, summary]
@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+import base64
+import bisect
+import gzip
+import json
+import re
+import threading
+import unicodedata
+from array import array
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+# Applied after casefold; NFKD doesn't decompose ligatures like the Æ in "Æther"
+_FOLD = str.maketrans({"'": None, "’": None, "æ": "ae", "œ": "oe", "ø": "o", "ł": "l", "đ": "d", "þ": "th"})
+
+INDEX_VERSION = 1
+
+
+def normalize_name(s: str) -> str:
+    """Casefold and strip diacritics/punctuation: "Lim-Dûl's Vault" -> "lim duls vault"."""
+    if not s.isascii():
+        s = unicodedata.normalize("NFKD", s)
+        s = "".join(ch for ch in s if not unicodedata.combining(ch))
+    s = s.casefold().translate(_FOLD)
+    return _NON_ALNUM.sub(" ", s).strip()
+
+
+def trigrams(key: str) -> List[str]:
+    padded = f"  {key} "
+    return list({padded[i:i + 3] for i in range(len(padded) - 2)})
+
+
+def _prefix_entries(key: str, nid: int) -> List[Tuple[str, int]]:
+    """The full key plus every word-start suffix ("lightning bolt" -> "bolt")."""
+    words = key.split(" ")
+    return [(" ".join(words[i:]), nid) for i in range(len(words))]
+
+
+@dataclass(slots=True)
+class SearchHit:
+    name: str
+    score: float
+    printings: List[Tuple[str, str]]  # (card id, set code)
+
+    @property
+    def set_codes(self) -> List[str]:
+        return sorted({code for _, code in self.printings})
+
+
+class CardNameIndex:
+    """
+    In-memory card-name search over the whole catalog.
+
+    - prefix: sorted (key, name id) entries for the full name and every word
+      start, searched with bisect (a flat trie; same lookups, far less memory)
+    - fuzzy: trigram postings scored by Dice overlap, for typos/partial words
+    Names are normalized (case/diacritics/punctuation-insensitive). Adds are
+    incremental; the sorted prefix list is rebuilt lazily on the next search.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._names: List[str] = []
+        self._keys: List[str] = []
+        self._printings: List[List[Tuple[str, str]]] = []
+        self._by_key: Dict[str, int] = {}
+        self._by_name: Dict[str, int] = {}  # raw name -> id, skips re-normalizing reprints
+        self._seen_ids: set = set()
+        self._prefix: List[Tuple[str, int]] = []
+        self._prefix_pending: List[Tuple[str, int]] = []
+        self._trigrams: Dict[str, array] = {}
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    @property
+    def printing_count(self) -> int:
+        return len(self._seen_ids)
+
+    # ---------- building ----------
+    def add(self, card_id: str, name: str, set_code: str) -> None:
+        with self._lock:
+            if card_id in self._seen_ids:
+                return
+
+            nid = self._by_name.get(name)
+            if nid is None:
+                key = normalize_name(name)
+                if not key:
+                    return
+                nid = self._by_key.get(key)
+                if nid is None:
+                    nid = len(self._names)
+                    self._by_key[key] = nid
+                    self._names.append(name)
+                    self._keys.append(key)
+                    self._printings.append([])
+                    self._index_key(key, nid)
+                self._by_name[name] = nid
+
+            self._seen_ids.add(card_id)
+            self._printings[nid].append((card_id, set_code))
+
+    def add_many(self, rows: Iterable[Tuple[str, str, str]]) -> None:
+        with self._lock:
+            for card_id, name, set_code in rows:
+                self.add(card_id, name, set_code)
+            self._merge_pending()
+
+    def _index_key(self, key: str, nid: int) -> None:
+        self._prefix_pending.extend(_prefix_entries(key, nid))
+        for tri in trigrams(key):
+            postings = self._trigrams.get(tri)
+            if postings is None:
+                postings = self._trigrams[tri] = array("I")
+            postings.append(nid)
+
+    def _merge_pending(self) -> None:
+        if self._prefix_pending:
+            self._prefix.extend(self._prefix_pending)
+            self._prefix.sort()
+            self._prefix_pending = []
+
+    # ---------- querying ----------
+    def search(self, query: str, limit: int = 50) -> List[SearchHit]:
+        q = normalize_name(query)
+        if not q:
+            return []
+
+        with self._lock:
+            self._merge_pending()
+            scores: Dict[int, float] = {}
+
+            # Prefix matches on the full name (best) or any word start
+            lo = bisect.bisect_left(self._prefix, (q, -1))
+            for key, nid in self._prefix[lo:]:
+                if not key.startswith(q):
+                    break
+                full = self._keys[nid]
+                if full == q:
+                    score = 1000.0
+                elif key == full:
+                    score = 800.0 - len(full) * 0.1
+                else:
+                    score = 600.0 - len(full) * 0.1
+                if score > scores.get(nid, 0.0):
+                    scores[nid] = score
+                if len(scores) >= limit * 5:
+                    break
+
+            # Trigram fuzzy matching fills in when prefixes don't cover it
+            if len(q) >= 3 and len(scores) < limit:
+                q_tris = trigrams(q)
+                overlap: Counter = Counter()
+                for tri in q_tris:
+                    postings = self._trigrams.get(tri)
+                    if postings is not None:
+                        overlap.update(postings)
+
+                min_overlap = max(2, len(q_tris) // 2)
+                for nid, common in overlap.items():
+                    if common < min_overlap or nid in scores:
+                        continue
+                    n_tris = len(self._keys[nid]) + 1
+                    dice = 2.0 * common / (len(q_tris) + n_tris)
+                    if dice >= 0.3:
+                        scores[nid] = 500.0 * dice
+
+            ranked = sorted(scores.items(), key=lambda kv: (-kv[1], self._keys[kv[0]]))[:limit]
+            return [SearchHit(self._names[nid], score, list(self._printings[nid])) for nid, score in ranked]
+
+    def lookup(self, name: str) -> Optional[SearchHit]:
+        """
+        Exact match on the normalized name, or on one face of a multi-face
+        card ("Delver of Secrets" -> "Delver of Secrets // Insectile
+        Aberration"). No fuzzy pass, so it's cheap enough to call per line.
+        """
+        q = normalize_name(name)
+        if not q:
+            return None
+
+        with self._lock:
+            nid = self._by_key.get(q)
+            if nid is None:
+                self._merge_pending()
+                lo = bisect.bisect_left(self._prefix, (q, -1))
+                for key, cand in self._prefix[lo:lo + 50]:
+                    if key != q and not key.startswith(q + " "):
+                        break
+                    full = self._names[cand]
+                    if " // " in full and any(normalize_name(f) == q for f in full.split(" // ")):
+                        nid = cand
+                        break
+            if nid is None:
+                return None
+            return SearchHit(self._names[nid], 1000.0, list(self._printings[nid]))
+
+    # ---------- persistence ----------
+    def save(self, path: Path, meta: Optional[dict] = None) -> None:
+        """
+        gzip'd JSON. Postings/owners are packed arrays (base64) and the prefix
+        list is re-derived from the keys on load, which keeps save/load fast.
+        """
+        with self._lock:
+            owners = array("I")
+            ids: List[str] = []
+            sets: List[str] = []
+            for nid, ps in enumerate(self._printings):
+                for card_id, set_code in ps:
+                    owners.append(nid)
+                    ids.append(card_id)
+                    sets.append(set_code)
+            payload = {
+                "version": INDEX_VERSION,
+                "meta": meta or {},
+                "names": self._names,
+                "keys": self._keys,
+                "printing_owner": _pack(owners),
+                "printing_id": ids,
+                "printing_set": sets,
+                "trigrams": {tri: _pack(p) for tri, p in self._trigrams.items()},
+            }
+            data = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+        tmp = path.with_name(path.name + ".tmp")
+        with gzip.open(tmp, "wb", compresslevel=5) as f:
+            f.write(data)
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> Tuple["CardNameIndex", dict]:
+        """Returns (index, meta). Raises ValueError on version mismatch."""
+        with gzip.open(path, "rb") as f:
+            payload = json.loads(f.read())
+        if payload.get("version") != INDEX_VERSION:
+            raise ValueError("Stale name index format")
+
+        idx = cls()
+        idx._names = payload["names"]
+        idx._keys = payload["keys"]
+        idx._by_key = {k: i for i, k in enumerate(idx._keys)}
+        idx._by_name = {n: i for i, n in enumerate(idx._names)}
+
+        idx._printings = [[] for _ in idx._names]
+        for nid, card_id, set_code in zip(_unpack(payload["printing_owner"]),
+                                          payload["printing_id"], payload["printing_set"]):
+            idx._printings[nid].append((card_id, set_code))
+        idx._seen_ids = set(payload["printing_id"])
+
+        idx._trigrams = {tri: _unpack(p) for tri, p in payload["trigrams"].items()}
+        for nid, key in enumerate(idx._keys):
+            idx._prefix.extend(_prefix_entries(key, nid))
+        idx._prefix.sort()
+        return idx, payload.get("meta", {})
+
+
+def _pack(a: array) -> str:
+    return base64.b64encode(a.tobytes()).decode("ascii")
+
+
+def _unpack(s: str) -> array:
+    a = array("I")
+    a.frombytes(base64.b64decode(s))
+    return a
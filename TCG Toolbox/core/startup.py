@@ -0,0 +1,25 @@
+import time
+from typing import List, Optional, Tuple
+
+
+class PhaseTimer:
+    """Wall-clock breakdown of startup phases; summary() goes to the log once the window is usable."""
+
+    def __init__(self, t0: Optional[float] = None):
+        self.t0 = t0 if t0 is not None else time.perf_counter()
+        self._last = self.t0
+        self.phases: List[Tuple[str, float]] = []
+
+    def mark(self, name: str) -> float:
+        now = time.perf_counter()
+        self.phases.append((name, now - self._last))
+        self._last = now
+        return now - self.t0
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.t0
+
+    def summary(self) -> str:
+        parts = " | ".join(f"{name} {secs * 1000:.0f} ms" for name, secs in self.phases)
+        return f"{parts} | total {(self._last - self.t0) * 1000:.0f} ms"
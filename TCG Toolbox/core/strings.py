@@ -0,0 +1,37 @@
+import threading
+from typing import Dict, List
+
+
+class StringPool:
+    """Interns strings to small integer ids (card names, logger names, ...)."""
+
+    __slots__ = ("_ids", "_strings", "_lock")
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._strings: List[str] = []
+        self._lock = threading.Lock()
+
+    def intern(self, s: str) -> int:
+        i = self._ids.get(s)
+        if i is None:
+            with self._lock:  # pools get filled from worker threads
+                i = self._ids.get(s)
+                if i is None:
+                    i = len(self._strings)
+                    self._strings.append(s)
+                    self._ids[s] = i
+        return i
+
+    def lookup(self, s: str) -> int:
+        """Id of an already interned string, or -1."""
+        return self._ids.get(s, -1)
+
+    def get(self, i: int) -> str:
+        return self._strings[i]
+
+    def strings(self) -> List[str]:
+        return list(self._strings)
+
+    def __len__(self) -> int:
+        return len(self._strings)
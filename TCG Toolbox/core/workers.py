@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import itertools
+import queue
+import threading
+from typing import Callable, List, Optional
+
+from core.log import get_logger
+
+# Lower runs first
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 10
+PRIORITY_LOW = 20
+
+
+class Cancelled(Exception):
+    """Raised inside a job when its CancelToken was cancelled."""
+
+
+class CancelToken:
+    """Cooperative cancellation: long jobs call check() between steps (e.g. pages)."""
+
+    __slots__ = ("_event",)
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def check(self) -> None:
+        if self._event.is_set():
+            raise Cancelled()
+
+
+class Job:
+    __slots__ = ("name", "priority", "token", "started", "_fn", "_args", "_kwargs", "_done", "_on_done")
+
+    def __init__(self, name: str, priority: int, fn: Callable, args: tuple, kwargs: dict,
+                 on_done: Optional[Callable[["Job"], None]]):
+        self.name = name
+        self.priority = priority
+        self.token = CancelToken()
+        self.started = False
+        self._fn = fn
+        self._args = args
+        self._kwargs = kwargs
+        self._done = threading.Event()
+        self._on_done = on_done
+
+    def cancel(self) -> None:
+        self.token.cancel()
+
+    @property
+    def cancelled(self) -> bool:
+        return self.token.cancelled
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._done.wait(timeout)
+
+
+class WorkerPool:
+    """
+    Bounded pool of daemon threads with prioritized jobs.
+
+    submit(fn, ...) calls fn(token, *args, **kwargs); fn should call
+    token.check() between steps. Jobs cancelled while still queued are
+    dropped without running; on_done(job) always fires once (on the worker
+    thread) for every job that was submitted.
+    """
+
+    def __init__(self, max_workers: int = 3, name: str = "worker"):
+        self.max_workers = max_workers
+        self.name = name
+        self.log = get_logger(f"workers.{name}")
+
+        self._q: "queue.PriorityQueue[tuple]" = queue.PriorityQueue()
+        self._seq = itertools.count()
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._shutdown = False
+
+    def submit(self, fn: Callable, *args, priority: int = PRIORITY_NORMAL, name: str = "",
+               on_done: Optional[Callable[[Job], None]] = None, **kwargs) -> Job:
+        job = Job(name or getattr(fn, "__name__", "job"), priority, fn, args, kwargs, on_done)
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("WorkerPool is shut down")
+            self._q.put((priority, next(self._seq), job))
+            if len(self._threads) < self.max_workers:
+                t = threading.Thread(target=self._run, name=f"{self.name}-{len(self._threads)}", daemon=True)
+                self._threads.append(t)
+                t.start()
+        return job
+
+    def pending(self) -> int:
+        return self._q.qsize()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._shutdown = True
+            for _ in self._threads:
+                self._q.put((float("inf"), next(self._seq), None))
+
+    def _run(self) -> None:
+        while True:
+            _, _, job = self._q.get()
+            if job is None:
+                return
+            try:
+                if not job.cancelled:
+                    job.started = True
+                    job._fn(job.token, *job._args, **job._kwargs)
+            except Cancelled:
+                self.log.debug(f"Job cancelled: {job.name}")
+            except Exception:
+                self.log.exception(f"Job failed: {job.name}")
+            finally:
+                job._done.set()
+                if job._on_done is not None:
+                    try:
+                        job._on_done(job)
+                    except Exception:
+                        self.log.exception(f"on_done failed: {job.name}")
@@ -1,21 +1,25 @@
 from __future__ import annotations
 import logging
-import threading
 import queue
-from typing import Optional
+import time
+from typing import Dict, Optional
 
-from PySide6.QtWidgets import QWidget, QHBoxLayout, QListView, QVBoxLayout, QLabel
+from PySide6.QtWidgets import QWidget, QHBoxLayout, QListView, QVBoxLayout, QLabel, QLineEdit
 from PySide6.QtCore import QTimer, Qt
 
 from core.models import Game, Set, Card
+from core.search import SearchHit
+from core.workers import PRIORITY_HIGH, PRIORITY_LOW, PRIORITY_NORMAL, Cancelled, Job, WorkerPool
 from ui.models.simple_list_model import SimpleListModel
+from ui.watchdog import watch_timer
+from modules.catalog_browser.prefetch import LoadedSetLRU, neighbour_sets, recent_sets
 from providers.scryfall.repository import ScryfallRepository
 
 
 class CatalogBrowserPanel(QWidget):
     """
     Left: Sets (virtualized list)
-    Right: Cards (virtualized list)
+    Right: Cards (virtualized list), or name-search results across all sets
     Hover: tooltip via ToolTipRole (MVP)
     """
 
@@ -27,13 +31,20 @@ class CatalogBrowserPanel(QWidget):
 
         self.game: Optional[Game] = None
         self._loading_set_code: Optional[str] = None
-        self._loading_codes: set[str] = set()
+
+        # One shared bounded pool instead of a thread per click; jobs by set code
+        self._pool = WorkerPool(max_workers=3, name="catalog")
+        self._card_jobs: Dict[str, Job] = {}
+
+        # Warm neighbours of the selection in the background; bound what stays loaded
+        self.prefetch_radius = 2
+        self._lru = LoadedSetLRU(max_cards=50_000)
 
         self._uiq: "queue.Queue[tuple]" = queue.Queue()
 
         self._ui_timer = QTimer(self)
         self._ui_timer.setInterval(25)
-        self._ui_timer.timeout.connect(self._drain_uiq)
+        watch_timer(self._ui_timer, self._drain_uiq)
         self._ui_timer.start()
 
         # Views
@@ -53,9 +64,20 @@ class CatalogBrowserPanel(QWidget):
             tooltip_fn=lambda c: c.name,  # MVP hover
         )
 
+        self.search_model = SimpleListModel[SearchHit](
+            items=[],
+            display_fn=lambda h: f"{h.name}  ({len(h.printings)})" if h.printings else h.name,
+            tooltip_fn=lambda h: f"{h.name}\nSets: {', '.join(h.set_codes).upper()}",
+        )
+
         self.sets_view.setModel(self.sets_model)
         self.cards_view.setModel(self.cards_model)
 
+        self.search_box = QLineEdit()
+        self.search_box.setPlaceholderText("Search all cards…")
+        self.search_box.setClearButtonEnabled(True)
+        self.search_box.textChanged.connect(self._on_search_changed)
+
         # Layout
         left = QVBoxLayout()
         left.addWidget(QLabel("Sets"))
@@ -63,6 +85,7 @@ class CatalogBrowserPanel(QWidget):
 
         right = QVBoxLayout()
         right.addWidget(QLabel("Cards"))
+        right.addWidget(self.search_box)
         right.addWidget(self.cards_view)
 
         root = QHBoxLayout()
@@ -81,17 +104,52 @@ class CatalogBrowserPanel(QWidget):
         self.sets_model.set_items([])
         self.cards_model.set_items([Card(id="", name="Loading sets…")])
 
-        def worker():
+        def worker(token):
+            # Cached list first (no network, works offline); refresh behind it if stale
             try:
-                game = self.repo.load_mtg_sets()
+                game = self.repo.load_mtg_sets(allow_stale=True)
                 self.log.info(f"Loaded {len(game.sets_by_code)} sets into Game(mtg)")
             except Exception as e:
                 self.log.exception(f"Failed to load sets: {e}")
                 game = None
 
             self._post_ui(self._apply_game, game)
+            if game is not None and self.repo.sets_stale():
+                self._pool.submit(refresh, priority=PRIORITY_NORMAL, name="refresh sets")
+
+        def refresh(token):
+            try:
+                game = self.repo.load_mtg_sets(refresh=True)
+            except Exception as e:
+                self.log.warning(f"Set list refresh failed; keeping cached sets ({e})")
+                return
+            self._post_ui(self._merge_game, game)
 
-        threading.Thread(target=worker, daemon=True).start()
+        def build_index(token):
+            try:
+                self.repo.build_name_index()
+            except Exception as e:
+                self.log.exception(f"Failed to build name index: {e}")
+            self._post_ui(lambda: self._on_search_changed(self.search_box.text()))
+
+        self._pool.submit(worker, priority=PRIORITY_HIGH, name="load sets")
+        self._pool.submit(build_index, priority=PRIORITY_LOW, name="name index")
+
+    def _merge_game(self, fresh: Game):
+        """Fold a refreshed set list in without a reset; known sets keep their Set (and loaded cards)."""
+        if self.game is None:
+            self._apply_game(fresh)
+            return
+        added = 0
+        for code, s in fresh.sets_by_code.items():
+            current = self.game.get_set(code)
+            if current is None:
+                self.game.add_set(s)
+                added += 1
+            else:
+                current.name, current.released_at, current.search_uri = s.name, s.released_at, s.search_uri
+        self.sets_model.update_items(self.game.sets_sorted(), key_fn=lambda s: s.code)
+        self.log.info(f"Set list refreshed ({added} new)")
 
     def _apply_game(self, game: Optional[Game]):
         self.game = game
@@ -103,59 +161,156 @@ class CatalogBrowserPanel(QWidget):
         self.sets_model.set_items(game.sets_sorted())
         self.cards_model.set_items([Card(id="", name="Select a set…")])
 
+        today = time.strftime("%Y-%m-%d")
+        for s in recent_sets(self.sets_model.items, count=3, today=today):
+            self._prefetch(s)
+
     def _on_set_selected(self, selected, deselected):
         indexes = self.sets_view.selectedIndexes()
         if not indexes:
             return
 
-        set_obj = self.sets_model.item_at(indexes[0].row())
+        row = indexes[0].row()
+        set_obj = self.sets_model.item_at(row)
+        neighbours = neighbour_sets(self.sets_model.items, row, self.prefetch_radius)
+
+        # Picking a set leaves search mode
+        if self.search_box.text():
+            self.search_box.clear()
+
+        # The user moved on: stop paginating sets nobody is looking at (or near)
+        wanted = {set_obj.code} | {s.code for s in neighbours}
+        for code, job in self._card_jobs.items():
+            if code not in wanted:
+                job.cancel()
 
         # If already loaded, instant
         if set_obj.cards_loaded:
+            self._loading_set_code = None
             self.cards_model.set_items(set_obj.cards)
-            return
+            self._touch_loaded(set_obj)
+        else:
+            self._load_selected(set_obj)
 
-        # Otherwise load async
+        for s in neighbours:
+            self._prefetch(s)
+
+    def _shown_set_code(self) -> Optional[str]:
+        indexes = self.sets_view.selectedIndexes()
+        return self.sets_model.item_at(indexes[0].row()).code if indexes else None
+
+    def _load_selected(self, set_obj: Set):
         self._loading_set_code = set_obj.code
         self.cards_model.set_items([Card(id="", name=f"Loading cards for {set_obj.name}…")])
 
-        # If already being fetched, don’t start another thread
-        if set_obj.code in self._loading_codes:
+        job = self._card_jobs.get(set_obj.code)
+        if job is not None and not job.cancelled:
+            if job.started:
+                return  # already paginating (maybe as a prefetch); pages stream in from here
+            # Queued behind others at low priority: jump the queue
+            job.cancel()
+
+        # A cancelled job that is still running is restarted from
+        # _done_loading_set once it has stopped.
+        if job is not None and job.started and not job.done:
             return
-        self._loading_codes.add(set_obj.code)
 
         self._load_cards_for_set_async(set_obj)
 
-    def _load_cards_for_set_async(self, set_obj: Set):
-        def worker():
+    def _prefetch(self, set_obj: Set):
+        if set_obj.cards_loaded or set_obj.code in self._card_jobs:
+            return
+        self._load_cards_for_set_async(set_obj, priority=PRIORITY_LOW)
+
+    def _touch_loaded(self, set_obj: Set):
+        shown = self._shown_set_code()
+        for cold in self._lru.touch(set_obj, pinned=[shown] if shown else []):
+            self.log.debug(f"Evicted cards for {cold.name} (loaded total {self._lru.total_cards})")
+
+    def _load_cards_for_set_async(self, set_obj: Set, priority: int = PRIORITY_HIGH):
+        def on_page(cards):
+            # Row count is captured here: the table keeps growing on this thread
+            self._post_ui(self._apply_page, set_obj, cards, len(cards))
+
+        def worker(token):
             try:
-                self.repo.load_cards_for_set(set_obj)
+                self.repo.load_cards_for_set(set_obj, on_page=on_page, cancel=token)
                 self.log.info(f"{set_obj.name}: loaded {len(set_obj.cards)} cards")
+            except Cancelled:
+                self.log.debug(f"{set_obj.name}: load cancelled")
+                return
             except Exception as e:
                 self.log.exception(f"Failed to load cards for {set_obj.name}: {e}")
                 set_obj.cards = []
                 set_obj.cards_loaded = True
 
             self._post_ui(self._apply_cards, set_obj)
-            self._post_ui(self._done_loading_set, set_obj.code)
 
-        threading.Thread(target=worker, daemon=True).start()
+        self._card_jobs[set_obj.code] = self._pool.submit(
+            worker,
+            priority=priority,
+            name=f"cards {set_obj.code}",
+            on_done=lambda job: self._post_ui(self._done_loading_set, set_obj, job),
+        )
+
+    def _done_loading_set(self, set_obj: Set, job: Job):
+        if self._card_jobs.get(set_obj.code) is not job:
+            return  # superseded by a newer job for the same set
+        del self._card_jobs[set_obj.code]
 
-    def _done_loading_set(self, code: str):
-        self._loading_codes.discard(code)
+        if set_obj.cards_loaded:
+            self._touch_loaded(set_obj)
+        elif job.cancelled and self._loading_set_code == set_obj.code:
+            # Cancelled, but the user came back to it meanwhile
+            self._load_cards_for_set_async(set_obj)
+
+    def _apply_page(self, set_obj: Set, cards, count: int):
+        """Stream a freshly fetched page into the view (rows inserted, no reset)."""
+        if set_obj.code != self._loading_set_code:
+            return
+
+        if self.cards_model.items is cards:
+            self.cards_model.grow_to(count)
+        else:
+            # First page replaces the "Loading…" placeholder
+            self.cards_model.set_items(cards)
+            self.cards_model.grow_to(count)
 
     def _apply_cards(self, set_obj: Set):
-        # Don’t overwrite if user clicked away
-        if self._loading_set_code is not None and set_obj.code != self._loading_set_code:
+        # Don’t overwrite if user clicked away (or this was a prefetch)
+        if set_obj.code != self._loading_set_code:
             return
 
         self._loading_set_code = None  # clear once applied
 
-        if set_obj.cards:
+        if set_obj.cards and self.cards_model.items is set_obj.cards:
+            self.cards_model.grow_to(len(set_obj.cards))
+        elif set_obj.cards:
             self.cards_model.set_items(set_obj.cards)
         else:
             self.cards_model.set_items([Card(id="", name="No cards (or fetch error—see log)")])
 
+    # ---------- search ----------
+    def _on_search_changed(self, text: str):
+        query = text.strip()
+        if not query:
+            if self.cards_view.model() is not self.cards_model:
+                self.cards_view.setModel(self.cards_model)
+            return
+
+        t0 = time.perf_counter()
+        hits = self.repo.search_cards(query, limit=200)
+        elapsed_ms = (time.perf_counter() - t0) * 1000
+        if elapsed_ms > 10:
+            self.log.debug(f"Slow search {query!r}: {elapsed_ms:.1f} ms")
+
+        if self.repo.name_index is None:
+            hits = [SearchHit(name="Indexing card names…", score=0.0, printings=[])]
+
+        self.search_model.update_items(hits, key_fn=lambda h: h.name)
+        if self.cards_view.model() is not self.search_model:
+            self.cards_view.setModel(self.search_model)
+
     def _post_ui(self, fn, *args, **kwargs):
         self._uiq.put((fn, args, kwargs))
 
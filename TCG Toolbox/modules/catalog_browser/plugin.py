@@ -1,7 +1,14 @@
 from PySide6.QtCore import Qt
-from modules.catalog_browser.panel import CatalogBrowserPanel
+
+TITLE = "Catalog Browser"
+ORDER = 10
+
+
+def create():
+    from modules.catalog_browser.panel import CatalogBrowserPanel
+
+    return CatalogBrowserPanel()
 
 
 def register(main_window):
-    panel = CatalogBrowserPanel()
-    main_window.add_dock("Catalog Browser", panel, area=Qt.LeftDockWidgetArea)
+    main_window.add_lazy_dock(TITLE, create, area=Qt.LeftDockWidgetArea)
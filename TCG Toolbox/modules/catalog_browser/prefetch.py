@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Iterable, List, Sequence
+
+from core.models import Set
+
+
+class LoadedSetLRU:
+    """
+    Keeps loaded card lists under a card budget.
+
+    touch() marks a set as most recently used; once the total goes over
+    `max_cards`, the coldest sets are unloaded (cards dropped,
+    cards_loaded reset) so they reload from the store on next use.
+    """
+
+    def __init__(self, max_cards: int = 50_000):
+        self.max_cards = max_cards
+        self._sets: "OrderedDict[str, Set]" = OrderedDict()
+        self._total = 0
+
+    def touch(self, set_obj: Set, pinned: Iterable[str] = ()) -> List[Set]:
+        """
+        Record use of a loaded set; returns the sets that were evicted.
+        The touched set and `pinned` codes (e.g. the one on screen) are kept.
+        """
+        old = self._sets.pop(set_obj.code, None)
+        if old is not None:
+            self._total -= len(old.cards)
+        self._sets[set_obj.code] = set_obj
+        self._total += len(set_obj.cards)
+
+        keep = {set_obj.code, *pinned}
+        evicted = []
+        for code in list(self._sets):
+            if self._total <= self.max_cards:
+                break
+            if code in keep:
+                continue
+            cold = self._sets.pop(code)
+            self._total -= len(cold.cards)
+            cold.cards = []
+            cold.cards_loaded = False
+            evicted.append(cold)
+        return evicted
+
+    @property
+    def total_cards(self) -> int:
+        return self._total
+
+    def __len__(self) -> int:
+        return len(self._sets)
+
+
+def neighbour_sets(sets: Sequence[Set], row: int, radius: int = 2) -> List[Set]:
+    """Sets around `row`, nearest first (arrow-key browsing goes either way)."""
+    out = []
+    for d in range(1, radius + 1):
+        for r in (row + d, row - d):
+            if 0 <= r < len(sets):
+                out.append(sets[r])
+    return out
+
+
+def recent_sets(sets: Sequence[Set], count: int = 3, today: str = "") -> List[Set]:
+    """Most recently released sets (released_at is ISO, so string order works)."""
+    released = [s for s in sets if s.released_at and (not today or s.released_at <= today)]
+    released.sort(key=lambda s: s.released_at, reverse=True)
+    return released[:count]
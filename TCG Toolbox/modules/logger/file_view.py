@@ -0,0 +1,356 @@
+from __future__ import annotations
+
+import logging
+import queue
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QComboBox, QPushButton, QListView, QAbstractItemView,
+    QLineEdit, QCheckBox, QLabel, QDateTimeEdit, QSplitter
+)
+from PySide6.QtCore import QAbstractListModel, QDateTime, QModelIndex, QTimer, Qt
+
+from core.log_index import LogFileIndex, prune_cache, window_bounds
+from core.log_writer import log_segments
+from core.workers import PRIORITY_HIGH, Cancelled, Job, WorkerPool
+from modules.logger.log_model import LEVEL_COLORS, LEVELS, MAX_LINE
+from ui.models.simple_list_model import SimpleListModel
+
+REFRESH_MS = 2000
+
+
+class LogFileModel(QAbstractListModel):
+    """Rows of a LogFileIndex; grows as the background indexer announces lines."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.log_index: Optional[LogFileIndex] = None
+        self._rows = 0
+
+    def set_index(self, index: Optional[LogFileIndex]) -> None:
+        self.beginResetModel()
+        self.log_index = index
+        self._rows = 0
+        self.endResetModel()
+
+    def grow_to(self, rows: int) -> None:
+        if rows < self._rows:  # file was replaced underneath us
+            self.beginResetModel()
+            self._rows = rows
+            self.endResetModel()
+        elif rows > self._rows:
+            self.beginInsertRows(QModelIndex(), self._rows, rows - 1)
+            self._rows = rows
+            self.endInsertRows()
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return self._rows
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        if not index.isValid() or self.log_index is None:
+            return None
+        line = self.log_index.line(index.row())
+
+        if role == Qt.DisplayRole:
+            return line if len(line) <= MAX_LINE else line[:MAX_LINE] + " …"
+        if role == Qt.ForegroundRole:
+            parts = line.split(" | ", 2)
+            return LEVEL_COLORS.get(LEVELS.get(parts[1])) if len(parts) > 2 else None
+        return None
+
+
+class LogFileView(QWidget):
+    """
+    Browse app.log and its rotated segments without loading them: files are
+    memory-mapped and indexed in the background (see LogFileIndex), so
+    scrolling, jumping to a time, searching and exporting a time window
+    work the same on a multi-hundred-MB log.
+    """
+
+    def __init__(self, log_file: Path, parent=None):
+        super().__init__(parent)
+        self.log = logging.getLogger("TCG Toolbox.logger.files")
+        self.log_file = log_file
+        self.cache_dir = log_file.parent / "log_cache"
+        self.snapshot_dir = log_file.parent / "log_snapshots"
+
+        self._pool = WorkerPool(max_workers=2, name="log-files")
+        self._index: Optional[LogFileIndex] = None
+        self._index_job: Optional[Job] = None
+        self._search_job: Optional[Job] = None
+        self._search_gen = 0  # bumped per search; posts from an older one are dropped
+        self._uiq: "queue.Queue[tuple]" = queue.Queue()
+        self._opened = False
+
+        self.source_combo = QComboBox()
+        self.source_combo.currentIndexChanged.connect(self._on_source_changed)
+        refresh_btn = QPushButton("Rescan")
+        refresh_btn.clicked.connect(self._refresh_sources)
+
+        self.model = LogFileModel(self)
+        self.list = QListView()
+        self.list.setModel(self.model)
+        self.list.setUniformItemSizes(True)
+        self.list.setWordWrap(False)
+        self.list.setLayoutMode(QListView.Batched)
+        self.list.setBatchSize(500)
+
+        # Jump / export window
+        self.from_edit = QDateTimeEdit()
+        self.to_edit = QDateTimeEdit()
+        for edit in (self.from_edit, self.to_edit):
+            edit.setDisplayFormat("yyyy-MM-dd HH:mm:ss")
+            edit.setCalendarPopup(True)
+        jump_btn = QPushButton("Jump")
+        jump_btn.clicked.connect(self._jump_to_time)
+        export_btn = QPushButton("Export window")
+        export_btn.clicked.connect(self._export_window)
+
+        # Search
+        self.search_box = QLineEdit()
+        self.search_box.setPlaceholderText("Search file...")
+        self.search_box.returnPressed.connect(self._start_search)
+        self.regex_cb = QCheckBox("Regex")
+        find_btn = QPushButton("Find")
+        find_btn.clicked.connect(self._start_search)
+        self.hits_model: SimpleListModel[int] = SimpleListModel(display_fn=self._hit_text)
+        self.hits_view = QListView()
+        self.hits_view.setModel(self.hits_model)
+        self.hits_view.setUniformItemSizes(True)
+        self.hits_view.clicked.connect(lambda idx: self._show_line(self.hits_model.item_at(idx.row())))
+
+        self.status_label = QLabel("")
+
+        top = QHBoxLayout()
+        top.addWidget(self.source_combo, 1)
+        top.addWidget(refresh_btn)
+        top.addWidget(QLabel("From"))
+        top.addWidget(self.from_edit)
+        top.addWidget(jump_btn)
+        top.addWidget(QLabel("To"))
+        top.addWidget(self.to_edit)
+        top.addWidget(export_btn)
+
+        search_row = QHBoxLayout()
+        search_row.addWidget(self.search_box, 1)
+        search_row.addWidget(self.regex_cb)
+        search_row.addWidget(find_btn)
+        search_row.addWidget(self.status_label)
+
+        splitter = QSplitter(Qt.Vertical)
+        splitter.addWidget(self.list)
+        splitter.addWidget(self.hits_view)
+        splitter.setStretchFactor(0, 4)
+        splitter.setStretchFactor(1, 1)
+
+        layout = QVBoxLayout()
+        layout.addLayout(top)
+        layout.addLayout(search_row)
+        layout.addWidget(splitter)
+        self.setLayout(layout)
+
+        self._ui_timer = QTimer(self)
+        self._ui_timer.setInterval(50)
+        self._ui_timer.timeout.connect(self._drain_uiq)
+        self._ui_timer.start()
+
+        # app.log keeps growing; pick up new lines while it's on screen
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setInterval(REFRESH_MS)
+        self._refresh_timer.timeout.connect(self._refresh_live)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not self._opened:  # nothing is mapped until the tab is first shown
+            self._opened = True
+            self._refresh_sources()
+        self._refresh_timer.start()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self._refresh_timer.stop()
+
+    # ---------- sources ----------
+    def _refresh_sources(self):
+        segments = log_segments(self.log_file)
+        current = self.source_combo.currentData()
+        self.source_combo.blockSignals(True)
+        self.source_combo.clear()
+        self.source_combo.addItem(f"{self.log_file.name} (current)", str(self.log_file))
+        for seg in reversed(segments):
+            self.source_combo.addItem(seg.name, str(seg))
+        pos = self.source_combo.findData(current) if current else 0
+        self.source_combo.setCurrentIndex(max(0, pos))
+        self.source_combo.blockSignals(False)
+        self._pool.submit(lambda token: prune_cache(self.cache_dir, segments), name="prune log cache")
+        if current != self.source_combo.currentData() or self._index is None:
+            self._on_source_changed(self.source_combo.currentIndex())
+
+    def _on_source_changed(self, _row: int):
+        path = self.source_combo.currentData()
+        if not path:
+            return
+        old_jobs = [j for j in (self._index_job, self._search_job) if j is not None]
+        for job in old_jobs:
+            job.cancel()
+        self._index_job = self._search_job = None
+        self._search_gen += 1
+        old = self._index
+        self._index = LogFileIndex(Path(path), self.cache_dir)
+        self.model.set_index(self._index)
+        self.hits_model.set_items([])
+        self.status_label.setText("Indexing...")
+        if old is not None:
+            def close_old(token):
+                for job in old_jobs:
+                    job.wait(10)
+                old.close()
+
+            self._pool.submit(close_old, name="close log index")
+        self._update_index(first=True)
+
+    def _refresh_live(self):
+        index = self._index
+        if index is not None and index.source == self.log_file:
+            self._update_index()
+
+    # ---------- indexing ----------
+    def _update_index(self, first: bool = False):
+        if self._index_job is not None and not self._index_job.done:
+            return
+        index = self._index
+
+        def on_progress(lines):
+            self._post_ui(self._on_indexed, index, lines)
+
+        def worker(token):
+            try:
+                index.update(token, on_progress)
+            except Cancelled:
+                raise
+            except Exception as e:
+                self.log.exception(f"Failed to index {index.source.name}: {e}")
+                self._post_ui(self.status_label.setText, f"Failed to read {index.source.name}")
+                return
+            self._post_ui(self._on_indexed, index, index.line_count)
+            self._post_ui(self._on_index_done, index, first)
+
+        self._index_job = self._pool.submit(worker, priority=PRIORITY_HIGH, name=f"index {index.source.name}")
+
+    def _on_indexed(self, index: LogFileIndex, lines: int):
+        if index is not self._index:
+            return
+        bar = self.list.verticalScrollBar()
+        at_bottom = bar.value() == bar.maximum()
+        self.model.grow_to(lines)
+        if at_bottom and index.source == self.log_file:
+            self.list.scrollToBottom()
+
+    def _on_index_done(self, index: LogFileIndex, first: bool):
+        if index is not self._index:
+            return
+        if self._search_job is None:  # keep a finished search's hit count up
+            self.status_label.setText(f"{index.line_count:,} lines")
+        if first:
+            start, end = window_bounds(index)
+            if start is not None:
+                self.from_edit.setDateTime(QDateTime.fromSecsSinceEpoch(int(start)))
+                self.to_edit.setDateTime(QDateTime.fromSecsSinceEpoch(int(end) + 1))
+            self.list.scrollToBottom()
+
+    # ---------- jump / export ----------
+    def _jump_to_time(self):
+        if self._index is None:
+            return
+        row = self._index.line_for_time(self.from_edit.dateTime().toSecsSinceEpoch())
+        self._show_line(min(row, max(0, self.model.rowCount() - 1)))
+
+    def _show_line(self, row: int):
+        idx = self.model.index(row)
+        self.list.scrollTo(idx, QAbstractItemView.PositionAtTop)
+        self.list.setCurrentIndex(idx)
+
+    def _export_window(self):
+        index = self._index
+        if index is None:
+            return
+        start = self.from_edit.dateTime().toSecsSinceEpoch()
+        end = self.to_edit.dateTime().toSecsSinceEpoch()
+        stamp = lambda s: datetime.fromtimestamp(s).strftime("%Y%m%d_%H%M%S")
+        dest = self.snapshot_dir / f"{index.source.name.split('.')[0]}_{stamp(start)}-{stamp(end)}.log"
+
+        def worker(token):
+            try:
+                self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+                written = index.export(dest, start, end)
+                self.log.info(f"Exported log window to {dest} ({written:,} bytes)")
+                self._post_ui(self.status_label.setText, f"Exported {written:,} bytes to {dest.name}")
+            except Exception as e:
+                self.log.exception(f"Failed to export log window: {e}")
+                self._post_ui(self.status_label.setText, "Export failed (see app.log)")
+
+        self._pool.submit(worker, name="export log window")
+
+    # ---------- search ----------
+    def _start_search(self):
+        index = self._index
+        text = self.search_box.text()
+        if index is None or not text:
+            return
+        try:
+            raw = text.encode("utf-8")
+            pattern = re.compile(raw if self.regex_cb.isChecked() else re.escape(raw), re.IGNORECASE)
+        except re.error as e:
+            self.status_label.setText(f"Bad pattern: {e}")
+            return
+        if self._search_job is not None:
+            self._search_job.cancel()
+        self._search_gen += 1
+        gen = self._search_gen
+        self.hits_model.set_items([])
+        self.status_label.setText("Searching...")
+
+        def on_hits(hits, scanned):
+            self._post_ui(self._on_hits, index, gen, hits, scanned)
+
+        def worker(token):
+            found = index.search(pattern, token, on_hits)
+            self._post_ui(self._on_search_done, index, gen, found)
+
+        self._search_job = self._pool.submit(worker, name="search log file")
+
+    def _on_hits(self, index: LogFileIndex, gen: int, hits, scanned: int):
+        if index is not self._index or gen != self._search_gen:
+            return
+        self.hits_model.append_items(hits)
+        total = max(1, index.line_count)
+        self.status_label.setText(f"{self.hits_model.rowCount():,} hits (searching {100 * scanned // total}%)")
+
+    def _on_search_done(self, index: LogFileIndex, gen: int, found: int):
+        if index is self._index and gen == self._search_gen:
+            self.status_label.setText(f"{found:,} hits")
+
+    def _hit_text(self, row: int) -> str:
+        if self._index is None:
+            return str(row)
+        return f"{row + 1}: {self._index.line(row)[:300]}"
+
+    # ---------- UI queue ----------
+    def _post_ui(self, fn, *args, **kwargs):
+        self._uiq.put((fn, args, kwargs))
+
+    def _drain_uiq(self):
+        for _ in range(200):
+            try:
+                fn, args, kwargs = self._uiq.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                fn(*args, **kwargs)
+            except Exception:
+                self.log.exception("Log file view UI task failed")
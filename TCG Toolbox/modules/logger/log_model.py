@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+from array import array
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from PySide6.QtCore import QAbstractListModel, QModelIndex, Qt
+from PySide6.QtGui import QColor
+
+from core.log_stream import LogEntry, format_entry
+from core.strings import StringPool
+
+LEVELS = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40, "CRITICAL": 50}
+
+LEVEL_COLORS: Dict[int, Optional[QColor]] = {
+    10: QColor("#888888"),
+    20: None,
+    30: QColor("#d1a800"),
+    40: QColor("#d84315"),
+    50: QColor("#b00020"),
+}
+
+# (levelno, logger name id, entry) -> visible
+LogFilter = Callable[[int, int, LogEntry], bool]
+
+MAX_LINE = 500
+
+
+class LogRingModel(QAbstractListModel):
+    """
+    Fixed-capacity ring buffer of log records exposed as a list model.
+
+    Entries are addressed by an ever-increasing sequence number; slot
+    seq % capacity holds the LogEntry plus its level and logger id in compact
+    columns (for exact, cheap filtering). Rows are formatted only when the
+    view paints them. Appends are
+    row inserts at the end, and lines pushed out of the ring are row removes
+    at the front, so the view never resets while tailing.
+
+    A filter only rebuilds `_index` (visible sequence numbers); with no
+    filter every live entry is visible and no index is kept at all.
+
+    Filters can also be applied in the background: begin_filter() resets the
+    view and returns a snapshot for a worker to scan, add_matches() streams
+    its hits in (inserted above rows that arrived live meanwhile), and
+    finish_filter() marks the scan complete.
+    """
+
+    def __init__(self, capacity: int = 200_000, parent=None):
+        super().__init__(parent)
+        self.capacity = capacity
+        self._entries: List[Optional[LogEntry]] = [None] * capacity
+        self._levels = array("B", bytes(capacity))
+        self._loggers = array("I", bytes(4 * capacity))
+        self.logger_names = StringPool()
+        self._total = 0      # sequence number of the next append
+        self._row_first = 0  # seq shown in row 0 when unfiltered
+
+        self._filter: Optional[LogFilter] = None
+        self._index = array("Q")  # visible seqs when filtered
+        self._index_start = 0     # index entries before this were trimmed
+        self._generation = 0      # bumped per filter change; stale scan results are dropped
+        self._scan_end: Optional[int] = None  # seqs below this come from the scan (None: no scan running)
+        self._scan_rows = 0       # leading index entries that came from the scan
+
+    # ---------- ring ----------
+    @property
+    def first_seq(self) -> int:
+        return max(0, self._total - self.capacity)
+
+    @property
+    def total(self) -> int:
+        return self._total
+
+    def __len__(self) -> int:
+        return self._total - self.first_seq
+
+    def entry(self, seq: int) -> LogEntry:
+        return self._entries[seq % self.capacity]
+
+    def columns(self, seq: int) -> Tuple[int, int, LogEntry]:
+        slot = seq % self.capacity
+        return self._levels[slot], self._loggers[slot], self._entries[slot]
+
+    def iter_entries(self) -> Iterator[LogEntry]:
+        for seq in range(self.first_seq, self._total):
+            yield self.entry(seq)
+
+    def append_many(self, entries: Sequence[LogEntry]) -> None:
+        """Append entries; oldest entries fall off the front."""
+        if not entries:
+            return
+        if len(entries) > self.capacity:
+            entries = entries[-self.capacity:]
+
+        new_total = self._total + len(entries)
+        new_first = max(0, new_total - self.capacity)
+
+        # 1) Rows that are about to be overwritten leave from the top
+        self._drop_before(new_first)
+
+        # 2) Write the new entries; visible ones are inserted at the bottom
+        start = self._total
+        if self._filter is None:
+            first_row = start - self._row_first
+            self.beginInsertRows(QModelIndex(), first_row, first_row + len(entries) - 1)
+            self._write(start, entries)
+            self.endInsertRows()
+        else:
+            self._write(start, entries)
+            passing = [seq for seq in range(start, self._total) if self._filter(*self.columns(seq))]
+            if passing:
+                rows = len(self._index) - self._index_start
+                self.beginInsertRows(QModelIndex(), rows, rows + len(passing) - 1)
+                self._index.extend(passing)
+                self.endInsertRows()
+
+    def _write(self, start: int, entries: Sequence[LogEntry]) -> None:
+        cap = self.capacity
+        intern = self.logger_names.intern
+        for i, e in enumerate(entries):
+            slot = (start + i) % cap
+            self._levels[slot] = min(e.levelno, 255)
+            self._loggers[slot] = intern(e.name)
+            self._entries[slot] = e
+        self._total = start + len(entries)
+
+    def _drop_before(self, new_first: int) -> None:
+        if self._filter is None:
+            n = min(new_first, self._total) - self._row_first
+            if n > 0:
+                # Slots get overwritten right after; only the rows need to go
+                self.beginRemoveRows(QModelIndex(), 0, n - 1)
+                self._row_first += n
+                self.endRemoveRows()
+            return
+
+        n = 0
+        idx = self._index
+        while self._index_start + n < len(idx) and idx[self._index_start + n] < new_first:
+            n += 1
+        if n:
+            self.beginRemoveRows(QModelIndex(), 0, n - 1)
+            self._index_start += n
+            self._scan_rows = max(0, self._scan_rows - n)
+            self.endRemoveRows()
+            # Compact once the dead prefix dominates
+            if self._index_start > 4096 and self._index_start > len(idx) // 2:
+                del idx[:self._index_start]
+                self._index_start = 0
+
+    def clear(self) -> None:
+        self.beginResetModel()
+        self._entries = [None] * self.capacity
+        self._levels = array("B", bytes(self.capacity))
+        self._loggers = array("I", bytes(4 * self.capacity))
+        self._total = 0
+        self._row_first = 0
+        self._index = array("Q")
+        self._index_start = 0
+        self._scan_rows = 0
+        if self._scan_end is not None:
+            self._scan_end = 0
+        self.endResetModel()
+
+    # ---------- filtering ----------
+    def set_filter(self, predicate: Optional[LogFilter]) -> None:
+        """predicate(levelno, logger_id, entry) -> visible; None shows everything. Rebuilds the index only."""
+        self.beginResetModel()
+        self._generation += 1
+        self._scan_end = None
+        self._scan_rows = 0
+        self._filter = predicate
+        self._row_first = self.first_seq
+        self._index = array("Q")
+        self._index_start = 0
+        if predicate is not None:
+            self._index.extend(
+                seq for seq in range(self.first_seq, self._total) if predicate(*self.columns(seq))
+            )
+        self.endResetModel()
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    @property
+    def scanning(self) -> bool:
+        return self._scan_end is not None
+
+    def begin_filter(self, predicate: LogFilter) -> Tuple[int, int, bytes, array, List[LogEntry]]:
+        """
+        Show nothing but new matching rows until the scan catches up. Returns
+        (generation, first_seq, levels, logger_ids, entries) - a copy of the
+        live ring in sequence order, safe to read from a worker thread.
+        """
+        self.beginResetModel()
+        self._generation += 1
+        self._filter = predicate
+        self._row_first = self.first_seq
+        self._index = array("Q")
+        self._index_start = 0
+        self._scan_end = self._total
+        self._scan_rows = 0
+        self.endResetModel()
+
+        first, n, cap = self.first_seq, len(self), self.capacity
+        s = first % cap
+        if s + n <= cap:
+            levels = self._levels[s:s + n].tobytes()
+            loggers = self._loggers[s:s + n]
+            entries = self._entries[s:s + n]
+        else:
+            levels = (self._levels[s:] + self._levels[:s + n - cap]).tobytes()
+            loggers = self._loggers[s:] + self._loggers[:s + n - cap]
+            entries = self._entries[s:] + self._entries[:s + n - cap]
+        return self._generation, first, levels, loggers, entries
+
+    def add_matches(self, generation: int, seqs: Sequence[int]) -> None:
+        """Scan hits (ascending seqs) for the filter started as `generation`."""
+        if generation != self._generation or self._scan_end is None:
+            return
+        first = self.first_seq
+        seqs = [q for q in seqs if first <= q < self._scan_end]
+        if not seqs:
+            return
+        row = self._scan_rows
+        pos = self._index_start + row
+        self.beginInsertRows(QModelIndex(), row, row + len(seqs) - 1)
+        self._index[pos:pos] = array("Q", seqs)
+        self._scan_rows += len(seqs)
+        self.endInsertRows()
+
+    def finish_filter(self, generation: int) -> None:
+        if generation == self._generation:
+            self._scan_end = None
+
+    def _seq_for_row(self, row: int) -> int:
+        if self._filter is None:
+            return self._row_first + row
+        return self._index[self._index_start + row]
+
+    # ---------- Qt model ----------
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        if self._filter is None:
+            return self._total - self._row_first
+        return len(self._index) - self._index_start
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        entry = self.entry(self._seq_for_row(index.row()))
+
+        if role == Qt.DisplayRole:
+            return display_line(entry)
+        if role == Qt.ForegroundRole:
+            return LEVEL_COLORS.get(entry.levelno)
+        return None
+
+
+def display_line(entry: LogEntry) -> str:
+    """One UI row: formatted, single-line and bounded (app.log has the full text)."""
+    line = format_entry(entry)
+    if "\n" in line:
+        line = line.split("\n", 1)[0] + " …"
+    if len(line) > MAX_LINE:
+        line = line[:MAX_LINE] + " …(truncated; see app.log)"
+    if entry.exc_text:
+        line += " …(traceback in app.log)"
+    return line
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence
+
+from core.log_stream import LogEntry
+from core.strings import StringPool
+from core.workers import CancelToken
+
+SCAN_CHUNK = 20_000
+
+
+@dataclass(frozen=True)
+class LogQuery:
+    """
+    What the Logger panel shows: every criterion must pass.
+
+    text      substring (or regex when `regex`) searched in message + traceback
+    min_level threshold on levelno (0 = everything)
+    logger    case-insensitive substring of the logger name
+    since/until  epoch seconds bounds on the record time
+    """
+    text: str = ""
+    regex: bool = False
+    case_sensitive: bool = False
+    min_level: int = 0
+    logger: str = ""
+    since: Optional[float] = None
+    until: Optional[float] = None
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.text or self.min_level or self.logger
+                    or self.since is not None or self.until is not None)
+
+    def compile(self, logger_names: StringPool) -> Callable[[int, int, LogEntry], bool]:
+        """
+        predicate(levelno, logger_id, entry) for LogRingModel. Raises re.error
+        for a bad pattern. Column checks run first; the message is only
+        rendered for rows that survive them.
+        """
+        min_level = self.min_level
+        since, until = self.since, self.until
+        text_match = self._text_matcher()
+
+        logger_ok: Optional[Callable[[int], bool]] = None
+        if self.logger:
+            needle = self.logger.lower()
+            verdicts: Dict[int, bool] = {}
+
+            def logger_ok(logger_id: int) -> bool:
+                ok = verdicts.get(logger_id)
+                if ok is None:
+                    ok = verdicts[logger_id] = needle in logger_names.get(logger_id).lower()
+                return ok
+
+        def predicate(levelno: int, logger_id: int, entry: LogEntry) -> bool:
+            if levelno < min_level:
+                return False
+            if logger_ok is not None and not logger_ok(logger_id):
+                return False
+            if since is not None and entry.created < since:
+                return False
+            if until is not None and entry.created > until:
+                return False
+            if text_match is not None:
+                if text_match(entry.message()):
+                    return True
+                return entry.exc_text is not None and text_match(entry.exc_text)
+            return True
+
+        return predicate
+
+    def _text_matcher(self) -> Optional[Callable[[str], bool]]:
+        if not self.text:
+            return None
+        flags = 0 if self.case_sensitive else re.IGNORECASE
+        if self.regex:
+            search = re.compile(self.text, flags).search
+            return lambda s: search(s) is not None
+        if self.case_sensitive:
+            needle = self.text
+            return lambda s: needle in s
+        # Case-insensitive substring: an escaped regex beats lower() on every line
+        search = re.compile(re.escape(self.text), flags).search
+        return lambda s: search(s) is not None
+
+
+def scan_snapshot(
+    token: CancelToken,
+    predicate: Callable[[int, int, LogEntry], bool],
+    first_seq: int,
+    levels: Sequence[int],
+    loggers: Sequence[int],
+    entries: Sequence[LogEntry],
+    on_chunk: Callable[[List[int], int], None],
+) -> None:
+    """
+    Worker side of a search: run predicate over a model snapshot in chunks,
+    calling on_chunk(matching_seqs, scanned_so_far) after each one.
+    """
+    n = len(entries)
+    for start in range(0, n, SCAN_CHUNK):
+        token.check()
+        stop = min(start + SCAN_CHUNK, n)
+        hits = [first_seq + i for i in range(start, stop) if predicate(levels[i], loggers[i], entries[i])]
+        on_chunk(hits, stop)
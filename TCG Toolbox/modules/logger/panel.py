@@ -1,15 +1,31 @@
-from collections import deque
+import queue
+import re
+import time
 from pathlib import Path
 from datetime import datetime
+from typing import Optional
 
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QPushButton, QHBoxLayout, QComboBox, QCheckBox,
-    QListWidget, QListWidgetItem
+    QListView, QAbstractItemView, QLineEdit, QLabel, QTabWidget
 )
 from PySide6.QtCore import Qt, QTimer
-from PySide6.QtGui import QColor
 
-from core.log_stream import LOG_QUEUE
+from core.log_stream import LOG_QUEUE, LogEntry, format_entry
+from core.workers import Job, WorkerPool
+from modules.logger.file_view import LogFileView
+from modules.logger.log_model import LEVELS, LogRingModel
+from modules.logger.log_query import LogQuery, scan_snapshot
+from ui.watchdog import watch_timer
+
+# Time-range choices: label -> seconds back from "now" (None = whole session)
+TIME_RANGES = {
+    "Any time": None,
+    "Last 5 min": 5 * 60,
+    "Last 15 min": 15 * 60,
+    "Last hour": 60 * 60,
+    "Last 24 h": 24 * 60 * 60,
+}
 
 
 class LogPanel(QWidget):
@@ -19,31 +35,28 @@ class LogPanel(QWidget):
         self.min_level = "ALL"
         self.auto_scroll = True
 
-        # keep last 10k for filtering/redraw
-        self._log_buffer = deque(maxlen=10000)  # holds (level, line)
-
-        # pending UI items (level, line)
-        self._pending = []
-        self._dropped = 0
-        self._max_pending = 5000
-
-        # keep visible list bounded
-        self._max_visible = 2000
-
-        self.level_order = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40, "CRITICAL": 50}
-        self.level_colors = {
-            "DEBUG": QColor("#888888"),
-            "INFO": None,
-            "WARNING": QColor("#d1a800"),
-            "ERROR": QColor("#d84315"),
-            "CRITICAL": QColor("#b00020"),
-        }
-
-        # UI list (no QTextDocument, much more stable)
-        self.list = QListWidget()
-        self.list.setSelectionMode(QListWidget.NoSelection)
+        # Whole session (up to capacity) lives in the model; nothing is dropped
+        self.model = LogRingModel(capacity=300_000, parent=self)
+
+        self.level_order = LEVELS
+
+        # Searches run on their own worker; hits come back through _results
+        self._search_pool = WorkerPool(1, "log-search")
+        self._search_job: Optional[Job] = None
+        self._results: "queue.SimpleQueue[tuple]" = queue.SimpleQueue()
+        self._filtering = False
+        self._bad_pattern = False
+        self._scan_total = 0
+        self._scanned = 0
+
+        # Virtualized view: only visible rows are ever asked for
+        self.list = QListView()
+        self.list.setModel(self.model)
+        self.list.setSelectionMode(QAbstractItemView.NoSelection)
         self.list.setUniformItemSizes(True)
         self.list.setWordWrap(False)
+        self.list.setLayoutMode(QListView.Batched)
+        self.list.setBatchSize(500)
 
         clear_btn = QPushButton("Clear")
         clear_btn.clicked.connect(self._clear_logs)
@@ -54,8 +67,33 @@ class LogPanel(QWidget):
         self.level_combo = QComboBox()
         self.level_combo.addItems(["ALL", "DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"])
         self.level_combo.setCurrentText(self.min_level)
+        self.level_combo.setToolTip("Minimum level")
         self.level_combo.currentTextChanged.connect(self._on_level_changed)
 
+        self.search_box = QLineEdit()
+        self.search_box.setPlaceholderText("Search messages...")
+        self.search_box.setClearButtonEnabled(True)
+        self.regex_cb = QCheckBox("Regex")
+        self.case_cb = QCheckBox("Match case")
+        self.logger_box = QLineEdit()
+        self.logger_box.setPlaceholderText("Logger")
+        self.logger_box.setClearButtonEnabled(True)
+        self.logger_box.setMaximumWidth(160)
+        self.time_combo = QComboBox()
+        self.time_combo.addItems(list(TIME_RANGES))
+        self.status_label = QLabel("")
+
+        # Typing restarts a short debounce; toggles apply straight away
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(200)
+        self._debounce.timeout.connect(self._apply_query)
+        self.search_box.textChanged.connect(lambda _: self._debounce.start())
+        self.logger_box.textChanged.connect(lambda _: self._debounce.start())
+        self.regex_cb.stateChanged.connect(lambda _: self._apply_query())
+        self.case_cb.stateChanged.connect(lambda _: self._apply_query())
+        self.time_combo.currentTextChanged.connect(lambda _: self._apply_query())
+
         self.autoscroll_cb = QCheckBox("Autoscroll")
         self.autoscroll_cb.setChecked(self.auto_scroll)
         self.autoscroll_cb.stateChanged.connect(self._on_autoscroll_changed)
@@ -67,15 +105,36 @@ class LogPanel(QWidget):
         btn_row.addWidget(snapshot_btn)
         btn_row.addWidget(clear_btn)
 
+        search_row = QHBoxLayout()
+        search_row.addWidget(self.search_box, 1)
+        search_row.addWidget(self.regex_cb)
+        search_row.addWidget(self.case_cb)
+        search_row.addWidget(self.logger_box)
+        search_row.addWidget(self.time_combo)
+        search_row.addWidget(self.status_label)
+
+        live_layout = QVBoxLayout()
+        live_layout.setContentsMargins(0, 0, 0, 0)
+        live_layout.addLayout(btn_row)
+        live_layout.addLayout(search_row)
+        live_layout.addWidget(self.list)
+        live = QWidget()
+        live.setLayout(live_layout)
+
+        # Session buffer vs. app.log and rotated segments on disk
+        self.file_view = LogFileView(Path.home() / ".tcg_toolbox" / "app.log")
+        self.tabs = QTabWidget()
+        self.tabs.addTab(live, "Session")
+        self.tabs.addTab(self.file_view, "Log files")
+
         layout = QVBoxLayout()
-        layout.addLayout(btn_row)
-        layout.addWidget(self.list)
+        layout.addWidget(self.tabs)
         self.setLayout(layout)
 
-        # Timer: drain queue + flush UI
+        # Timer: drain queue into the model
         self._timer = QTimer(self)
         self._timer.setInterval(100)
-        self._timer.timeout.connect(self._tick)
+        watch_timer(self._timer, self._tick)
         self._timer.start()
 
         # immediate startup line
@@ -89,8 +148,10 @@ class LogPanel(QWidget):
         out_path = out_dir / f"ui_buffer_{ts}.txt"
 
         with out_path.open("w", encoding="utf-8") as f:
-            for lvl, line in self._log_buffer:
-                f.write(line + "\n")
+            for entry in self.model.iter_entries():
+                f.write(format_entry(entry) + "\n")
+                if entry.exc_text:
+                    f.write(entry.exc_text + "\n")
 
         return str(out_path)
 
@@ -101,127 +162,123 @@ class LogPanel(QWidget):
     # ---------- filtering ----------
     def _on_level_changed(self, new_level: str):
         self.min_level = new_level
-        self._redraw_from_buffer()
-
-    def _on_autoscroll_changed(self, state: int):
-        self.auto_scroll = (state == Qt.Checked)
-
-    def _detect_level(self, line: str) -> str:
-        detected = "INFO"
-        parts = [p.strip() for p in line.split("|")]
-        if len(parts) >= 2:
-            candidate = parts[1].upper().strip()
-            if candidate in self.level_order:
-                detected = candidate
-        return detected
-
-    def _passes_filter(self, level: str) -> bool:
-        if self.min_level == "ALL":
-            return True
-        return self.level_order[level] == self.level_order[self.min_level]
-
-    def _make_item(self, level: str, line: str) -> QListWidgetItem:
-        item = QListWidgetItem(line)
-        color = self.level_colors.get(level)
-        if color is not None:
-            item.setForeground(color)
-        return item
-
-    def _redraw_from_buffer(self):
-        self.list.setUpdatesEnabled(False)
-        self.list.clear()
-
-        buf = list(self._log_buffer)
-        if len(buf) > self._max_visible:
-            buf = buf[-self._max_visible:]
-
-        for lvl, line in buf:
-            if self._passes_filter(lvl):
-                self.list.addItem(self._make_item(lvl, line))
-
-        self.list.setUpdatesEnabled(True)
-        if self.auto_scroll:
-            self.list.scrollToBottom()
-
-    # ---------- ingestion from queue ----------
-    def _enqueue_ui(self, level: str, line: str):
-        """Internal messages that bypass LOG_QUEUE."""
-        self._log_buffer.append((level, line))
-        if self._passes_filter(level):
-            if len(self._pending) >= self._max_pending:
-                self._dropped += 1
-                return
-            self._pending.append((level, line))
-
-    def _tick(self):
-        # Drain global log queue into our buffer/pending
-        DRAIN = 500
-        for _ in range(DRAIN):
-            try:
-                msg = LOG_QUEUE.get_nowait()
-            except Exception:
-                break
-            self._handle_log_line(msg)
+        self._apply_query()
+
+    def current_query(self) -> LogQuery:
+        back = TIME_RANGES[self.time_combo.currentText()]
+        return LogQuery(
+            text=self.search_box.text(),
+            regex=self.regex_cb.isChecked(),
+            case_sensitive=self.case_cb.isChecked(),
+            min_level=self.level_order.get(self.min_level, 0),
+            logger=self.logger_box.text().strip(),
+            since=None if back is None else time.time() - back,
+        )
+
+    def _apply_query(self):
+        self._debounce.stop()
+        query = self.current_query()
+        try:
+            live = query.compile(self.model.logger_names)
+            scan = query.compile(self.model.logger_names)  # own caches for the worker
+        except re.error as e:
+            # Keep whatever is shown (and any scan still running) until the pattern is fixed
+            self._bad_pattern = True
+            self.status_label.setText(f"Bad pattern: {e}")
+            return
+        self._bad_pattern = False
 
-        # Flush pending items to UI
-        self._flush_pending()
+        if self._search_job is not None:
+            self._search_job.cancel()
+            self._search_job = None
 
-    def _handle_log_line(self, line: str):
-        # Keep UI safe
-        MAX_LEN = 500
-        if len(line) > MAX_LEN:
-            line = line[:MAX_LEN] + " …(truncated; see app.log)"
+        if query.is_empty:
+            self._filtering = False
+            self.model.set_filter(None)
+            self.status_label.setText("")
+            self._follow()
+            return
 
-        level = self._detect_level(line)
+        self._filtering = True
+        generation, first_seq, levels, loggers, entries = self.model.begin_filter(live)
+        self._scan_total = len(entries)
+        self._scanned = 0
+        self._update_status()
 
-        # Avoid big ERROR blobs in UI (file log has full traceback)
-        if level in {"ERROR", "CRITICAL"} and len(line) > 300:
-            line = line[:300] + " …(see app.log)"
+        def on_chunk(hits, scanned):
+            self._results.put((generation, hits, scanned))
 
-        self._log_buffer.append((level, line))
+        def on_done(job):
+            self._results.put((generation, None, None))
 
-        if not self._passes_filter(level):
-            return
-
-        if len(self._pending) >= self._max_pending:
-            self._dropped += 1
-            return
+        self._search_job = self._search_pool.submit(
+            scan_snapshot, scan, first_seq, levels, loggers, entries, on_chunk,
+            name="log search", on_done=on_done,
+        )
 
-        self._pending.append((level, line))
-
-    def _flush_pending(self):
-        if not self.isVisible():
-            self._pending.clear()
-            return
-        if not self._pending and self._dropped == 0:
+    def _drain_results(self):
+        while True:
+            try:
+                generation, hits, scanned = self._results.get_nowait()
+            except queue.Empty:
+                return
+            if generation != self.model.generation:
+                continue
+            if hits is None:
+                self.model.finish_filter(generation)
+                self._search_job = None
+            else:
+                self.model.add_matches(generation, hits)
+                self._scanned = scanned
+            self._update_status()
+            self._follow()
+
+    def _update_status(self):
+        if self._bad_pattern:
             return
+        if self.model.scanning and self._scan_total:
+            pct = 100 * self._scanned // self._scan_total
+            self.status_label.setText(f"{self.model.rowCount():,} matches (searching {pct}%)")
+        elif not self._filtering:
+            self.status_label.setText("")
+        else:
+            self.status_label.setText(f"{self.model.rowCount():,} matches")
 
-        self.list.setUpdatesEnabled(False)
+    def _on_autoscroll_changed(self, state: int):
+        self.auto_scroll = (state == Qt.Checked.value)
 
-        BATCH = 200
-        chunk = self._pending[:BATCH]
-        del self._pending[:BATCH]
+    # ---------- ingestion from queue ----------
+    def _enqueue_ui(self, level: str, line: str):
+        """Internal messages that bypass LOG_QUEUE."""
+        entry = LogEntry(time.time(), self.level_order[level], "TCG Toolbox.logger", line, ())
+        self.model.append_many([entry])
+        self._follow()
 
-        overflow = (self.list.count() + len(chunk)) - self._max_visible
-        if overflow > 0:
-            for _ in range(overflow):
-                item = self.list.takeItem(0)
-                del item
+    def _tick(self):
+        self._drain_results()
 
-        for lvl, line in chunk:
-            self.list.addItem(self._make_item(lvl, line))
+        # Drain the global log queue for at most ~15 ms per tick; records are
+        # batched into one row insert and formatted only when painted
+        batch = []
+        deadline = time.perf_counter() + 0.015
+        while True:
+            try:
+                entry = LOG_QUEUE.get_nowait()
+            except Exception:
+                break
+            batch.append(entry)
+            if len(batch) % 256 == 0 and time.perf_counter() > deadline:
+                break
 
-        if self._dropped > 0:
-            summary = f"[UI] Dropped {self._dropped} lines due to high rate (see app.log for full output)"
-            self.list.addItem(self._make_item("WARNING", summary))
-            self._dropped = 0
+        if batch:
+            self.model.append_many(batch)
+            if self._filtering:
+                self._update_status()
+            self._follow()
 
-        self.list.setUpdatesEnabled(True)
-        if self.auto_scroll:
+    def _follow(self):
+        if self.auto_scroll and self.isVisible():
             self.list.scrollToBottom()
 
     def _clear_logs(self):
-        self._log_buffer.clear()
-        self._pending.clear()
-        self._dropped = 0
-        self.list.clear()
+        self.model.clear()
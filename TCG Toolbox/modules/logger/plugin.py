@@ -1,7 +1,14 @@
 from PySide6.QtCore import Qt
-from modules.logger.panel import LogPanel
+
+TITLE = "Logger"
+ORDER = 0  # first, so it docks along the bottom before the others
+
+
+def create():
+    from modules.logger.panel import LogPanel
+
+    return LogPanel()
 
 
 def register(main_window):
-    panel = LogPanel()
-    main_window.add_dock("Logger", panel, area=Qt.BottomDockWidgetArea)
+    main_window.add_lazy_dock(TITLE, create, area=Qt.BottomDockWidgetArea)
@@ -0,0 +1,173 @@
+import time
+from typing import List, Optional, Tuple
+
+from PySide6.QtCore import Qt, QTimer
+from PySide6.QtWidgets import (
+    QAbstractItemView, QHBoxLayout, QHeaderView, QLabel, QPushButton, QTableWidget,
+    QTableWidgetItem, QVBoxLayout, QWidget
+)
+
+from core.metrics import METRICS, Histogram, MetricsRegistry
+from providers.scryfall.ingest import SET_DONE, SET_INCOMPLETE
+
+SET_COLUMNS = ("Set", "State", "Cards", "Pages", "Elapsed (s)", "Cards/s")
+STATE_NAMES = {SET_DONE: "done", SET_INCOMPLETE: "incomplete"}
+
+
+def _ms(seconds: float) -> str:
+    return f"{seconds * 1000:,.0f} ms" if seconds >= 0.01 else f"{seconds * 1000:.2f} ms"
+
+
+def _histogram_line(h: Optional[Histogram]) -> str:
+    if h is None or not h.count:
+        return "-"
+    s = h.snapshot()
+    return f"p50 {_ms(s.p50)} · p95 {_ms(s.p95)} · p99 {_ms(s.p99)} · max {_ms(s.max)} (n={s.count:,})"
+
+
+def _by_label(registry: MetricsRegistry, name: str) -> str:
+    parts = [f"{label} {m.value:,.0f}" for label, m in sorted(registry.labels(name).items())]
+    return ", ".join(parts) or "-"
+
+
+class MetricsPanel(QWidget):
+    """
+    Live view of METRICS: HTTP / ingest totals on top, one row per set below
+    (slowest first by default, so stalled sets stand out during a sync).
+    Polled once a second while visible; recording never touches Qt.
+    """
+
+    def __init__(self, registry: MetricsRegistry = METRICS, parent=None):
+        super().__init__(parent)
+        self.registry = registry
+        self._last_cards: Optional[Tuple[float, float]] = None  # (time, ingest.cards) at the last refresh
+        self._rate = 0.0
+
+        self.summary = QTableWidget(0, 2)
+        self.summary.setHorizontalHeaderLabels(["Metric", "Value"])
+        self.summary.verticalHeader().setVisible(False)
+        self.summary.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeToContents)
+        self.summary.horizontalHeader().setStretchLastSection(True)
+        self.summary.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.summary.setSelectionMode(QAbstractItemView.NoSelection)
+
+        self.sets = QTableWidget(0, len(SET_COLUMNS))
+        self.sets.setHorizontalHeaderLabels(SET_COLUMNS)
+        self.sets.verticalHeader().setVisible(False)
+        self.sets.horizontalHeader().setStretchLastSection(True)
+        self.sets.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.sets.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.sets.setSortingEnabled(True)
+        self.sets.sortByColumn(SET_COLUMNS.index("Cards/s"), Qt.AscendingOrder)
+
+        reset_btn = QPushButton("Reset")
+        reset_btn.clicked.connect(self._reset)
+        self.status_label = QLabel("")
+
+        controls = QHBoxLayout()
+        controls.addWidget(self.status_label, 1)
+        controls.addWidget(reset_btn)
+
+        layout = QVBoxLayout()
+        layout.addLayout(controls)
+        layout.addWidget(self.summary, 1)
+        layout.addWidget(QLabel("Sets (this session)"))
+        layout.addWidget(self.sets, 2)
+        self.setLayout(layout)
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(1000)
+        self._timer.timeout.connect(self.refresh)
+        self._timer.start()
+        self.refresh()
+
+    def refresh(self):
+        if not self.isVisible() and self.summary.rowCount():
+            return
+        self._update_rate()
+        self._fill_summary(self._summary_rows())
+        self._fill_sets()
+        self.status_label.setText(f"Updated {time.strftime('%H:%M:%S')}")
+
+    # ---------- summary ----------
+    def _summary_rows(self) -> List[Tuple[str, str]]:
+        r = self.registry
+        requests = sum(m.value for m in r.labels("http.responses").values())
+        retries = sum(m.value for m in r.labels("http.retries").values())
+        hists = {name: m for name, label, m in r.items() if not label and isinstance(m, Histogram)}
+        return [
+            ("HTTP requests", f"{requests:,.0f}  ({_by_label(r, 'http.responses')})"),
+            ("Request latency", _histogram_line(hists.get("http.request_s"))),
+            ("Transferred", f"{r.value('http.bytes') / 1e6:,.1f} MB"),
+            ("JSON parse", _histogram_line(hists.get("http.parse_s"))),
+            ("HTTP cache", _by_label(r, "http.cache")),
+            ("Retries", f"{retries:,.0f}  ({_by_label(r, 'http.retries')})"),
+            ("Errors", _by_label(r, "http.errors")),
+            ("Rate-limit waits", f"{r.value('http.throttle_s'):,.1f} s"),
+            ("Retry backoff", f"{r.value('http.backoff_s'):,.1f} s"),
+            ("Cards ingested", f"{r.value('ingest.cards'):,.0f}  ({self._rate:,.0f}/s now)"),
+            ("Page write", _histogram_line(hists.get("ingest.page_write_s"))),
+            ("UI timer lateness", _histogram_line(hists.get("ui.heartbeat_lateness_s"))),
+            ("UI stalls", f"{r.value('ui.stalls'):,.0f}  ({_histogram_line(hists.get('ui.stall_s'))})"),
+        ]
+
+    def _fill_summary(self, rows: List[Tuple[str, str]]):
+        self.summary.setRowCount(len(rows))
+        for i, (name, value) in enumerate(rows):
+            for col, text in enumerate((name, value)):
+                item = self.summary.item(i, col)
+                if item is None:
+                    self.summary.setItem(i, col, QTableWidgetItem(text))
+                elif item.text() != text:
+                    item.setText(text)
+
+    def _update_rate(self):
+        now, cards = time.monotonic(), self.registry.value("ingest.cards")
+        if self._last_cards is not None:
+            then, before = self._last_cards
+            self._rate = max(0.0, cards - before) / max(now - then, 1e-9)
+        self._last_cards = (now, cards)
+
+    # ---------- per set ----------
+    def _fill_sets(self):
+        r = self.registry
+        states = r.labels("ingest.set_state")
+        cards = r.labels("ingest.set_cards")
+        pages = r.labels("ingest.set_pages")
+        elapsed = r.labels("ingest.set_elapsed_s")
+        rates = r.labels("ingest.set_cards_per_s")
+
+        def value(series, code):
+            m = series.get(code)
+            return m.value if m is not None else 0.0
+
+        # Sorting moves rows under us while cells are set; switch it off for the refill
+        self.sets.setSortingEnabled(False)
+        self.sets.setRowCount(len(states))
+        for row, code in enumerate(sorted(states)):
+            cells = (
+                code,
+                STATE_NAMES.get(states[code].value, "running"),
+                int(value(cards, code)),
+                int(value(pages, code)),
+                round(value(elapsed, code), 1),
+                round(value(rates, code), 1),
+            )
+            for col, cell in enumerate(cells):
+                item = self.sets.item(row, col)
+                if item is None:
+                    item = QTableWidgetItem()
+                    self.sets.setItem(row, col, item)
+                if isinstance(cell, str):
+                    item.setText(cell)
+                else:
+                    item.setData(Qt.DisplayRole, cell)  # numeric, so the column sorts by value
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+        self.sets.setSortingEnabled(True)
+
+    def _reset(self):
+        self.registry.reset()
+        self._last_cards = None
+        self._rate = 0.0
+        self.sets.setRowCount(0)
+        self.refresh()
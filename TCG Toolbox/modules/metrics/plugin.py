@@ -0,0 +1,14 @@
+from PySide6.QtCore import Qt
+
+TITLE = "Metrics"
+ORDER = 20
+
+
+def create():
+    from modules.metrics.panel import MetricsPanel
+
+    return MetricsPanel()
+
+
+def register(main_window):
+    main_window.add_lazy_dock(TITLE, create, area=Qt.RightDockWidgetArea)
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, Iterator, TextIO
+
+_WS = re.compile(r"\s*")
+# What may follow a number decoded at the end of the buffer if the chunk cut it short ("1." / "1e" / "1e+")
+_NUMBER_TAIL = re.compile(r"[0-9.eE+-]*\Z")
+
+
+class BulkFormatError(ValueError):
+    pass
+
+
+def iter_json_array(fp: TextIO, chunk_size: int = 1 << 16) -> Iterator[Any]:
+    """
+    Yield the elements of a top-level JSON array one at a time.
+
+    Only the current element (plus one read chunk) is held in memory, so a
+    multi-hundred-MB Scryfall bulk file parses with flat memory.
+    """
+    decoder = json.JSONDecoder()
+    buf = ""
+    pos = 0
+    eof = False
+
+    def fill() -> None:
+        nonlocal buf, pos, eof
+        chunk = fp.read(chunk_size)
+        if not chunk:
+            eof = True
+        buf = buf[pos:] + chunk
+        pos = 0
+
+    def skip_ws() -> None:
+        nonlocal pos
+        while True:
+            pos = _WS.match(buf, pos).end()
+            if pos < len(buf) or eof:
+                return
+            fill()
+
+    fill()
+    skip_ws()
+    if buf[pos:pos + 1] != "[":
+        raise BulkFormatError("Expected a JSON array")
+    pos += 1
+
+    skip_ws()
+    if buf[pos:pos + 1] == "]":
+        return
+
+    while True:
+        skip_ws()
+        try:
+            value, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            fill()
+            continue
+
+        # A scalar cut off at the chunk boundary decodes "successfully" (a
+        # number as its leading part, e.g. "1.5" -> "1"); re-read to be sure.
+        if not eof and (end == len(buf) or (
+                isinstance(value, (int, float)) and _NUMBER_TAIL.match(buf, end))):
+            fill()
+            continue
+
+        pos = end
+        yield value
+
+        skip_ws()
+        sep = buf[pos:pos + 1]
+        if sep == ",":
+            pos += 1
+        elif sep == "]":
+            return
+        else:
+            raise BulkFormatError(f"Unexpected {sep!r} between array elements")
@@ -1,23 +1,110 @@
-import requests
+import json
+import os
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from core.metrics import METRICS
+from providers.scryfall.http_cache import ResponseCache, shared_response_cache
+from providers.scryfall.ratelimit import SCRYFALL_LIMITER, TokenBucket
+from providers.scryfall.transport import RetryPolicy, Transport, build_session
 
 
 class ScryfallClient:
     BASE = "https://api.scryfall.com"
+    BASE_ENV = "TCG_SCRYFALL_BASE_URL"  # points every client at e.g. bench/fake_scryfall.py
+    COLLECTION_MAX = 75  # identifiers per /cards/collection request
+
+    def __init__(self, user_agent: str = "TCG Toolbox (dev)", limiter: Optional[TokenBucket] = None,
+                 cache: Optional[ResponseCache] = None, use_cache: bool = True,
+                 pool_size: int = 16, retry: Optional[RetryPolicy] = None,
+                 base_url: Optional[str] = None):
+        self.base = (base_url or os.environ.get(self.BASE_ENV) or self.BASE).rstrip("/")
+        self.limiter = limiter or SCRYFALL_LIMITER
+        self.cache = (cache or shared_response_cache()) if use_cache else None
+        self.session = build_session(user_agent, pool_size=pool_size)
+        self.transport = Transport(self.session, self.limiter, retry)
+
+    def list_sets(self, revalidate: bool = False) -> dict:
+        return self._get_json(f"{self.base}/sets", revalidate)
+
+    def get_page(self, url: str, revalidate: bool = False) -> dict:
+        return self._get_json(url, revalidate)
+
+    def get_collection(self, identifiers: List[dict]) -> dict:
+        """
+        Up to COLLECTION_MAX card identifiers ({"id"}, {"name"}, {"name", "set"},
+        {"set", "collector_number"}) in one request; answers {"data", "not_found"}.
+        """
+        if len(identifiers) > self.COLLECTION_MAX:
+            raise ValueError(f"/cards/collection takes at most {self.COLLECTION_MAX} identifiers")
+        return self._post_json(f"{self.base}/cards/collection", {"identifiers": identifiers})
+
+    def get_bulk_data(self, bulk_type: str) -> dict:
+        """Metadata (incl. download_uri, updated_at) for one bulk file, e.g. 'default_cards'."""
+        return self._get_json(f"{self.base}/bulk-data/{bulk_type}")
+
+    def download(self, url: str, dest: Path, chunk_size: int = 1 << 20) -> Path:
+        """Stream a (large) file to disk; written to a .part file and renamed when complete."""
+        dest = Path(dest)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dest.with_name(dest.name + ".part")
 
-    def __init__(self, user_agent: str = "TCG Toolbox (dev)"):
-        self.session = requests.Session()
-        self.session.headers.update({
-            "User-Agent": user_agent,
-            "Accept": "application/json;q=0.9,*/*;q=0.8",
-        })
+        with self.transport.get(url, timeout=60, stream=True) as resp:
+            resp.raise_for_status()
+            with tmp.open("wb") as f:
+                for chunk in resp.iter_content(chunk_size=chunk_size):
+                    f.write(chunk)
 
-    def list_sets(self) -> dict:
-        return self._get_json(f"{self.BASE}/sets")
+        tmp.replace(dest)
+        return dest
 
-    def get_page(self, url: str) -> dict:
-        return self._get_json(url)
+    def cache_stats(self) -> dict:
+        return self.cache.stats() if self.cache else {}
+
+    def _get_json(self, url: str, revalidate: bool = False) -> dict:
+        """revalidate: ask the server even if the cached copy is fresh (a 304 still saves the body)."""
+        cached = self.cache.get(url) if self.cache else None
+        if cached is not None and not revalidate and self.cache.is_fresh(cached):
+            self.cache.record("hit", len(cached.body))
+            METRICS.counter("http.cache", label="hit").inc()
+            return self._parse(cached.body)
+
+        headers = {}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        resp = self.transport.get(url, headers=headers, timeout=30)
+
+        if resp.status_code == 304 and cached is not None:
+            self.cache.touch(url)
+            self.cache.record("revalidated", len(cached.body))
+            METRICS.counter("http.cache", label="revalidated").inc()
+            return self._parse(cached.body)
 
-    def _get_json(self, url: str) -> dict:
-        resp = self.session.get(url, timeout=30)
         resp.raise_for_status()
-        return resp.json()
+        body = resp.content
+        METRICS.counter("http.bytes").inc(len(body))
+        if self.cache is not None:
+            self.cache.put(url, body, resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+            self.cache.record("miss", len(body))
+            METRICS.counter("http.cache", label="miss").inc()
+        return self._parse(body)
+
+    def _post_json(self, url: str, payload: dict) -> dict:
+        # Never cached: the answer depends on the body, not just the URL
+        resp = self.transport.request("POST", url, json=payload, timeout=30)
+        resp.raise_for_status()
+        body = resp.content
+        METRICS.counter("http.bytes").inc(len(body))
+        return self._parse(body)
+
+    @staticmethod
+    def _parse(body: bytes) -> dict:
+        t0 = time.perf_counter()
+        payload = json.loads(body)
+        METRICS.histogram("http.parse_s").observe(time.perf_counter() - t0)
+        return payload
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Tuple
+
+from core.paths import app_dir
+
+
+HOUR = 3600.0
+
+# (url substring, ttl seconds): first match wins
+DEFAULT_TTLS: Tuple[Tuple[str, float], ...] = (
+    ("/sets", 24 * HOUR),
+    ("/cards/search", 6 * HOUR),
+    ("/bulk-data", 1 * HOUR),
+)
+DEFAULT_TTL = 1 * HOUR
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    url           TEXT PRIMARY KEY,
+    body          BLOB NOT NULL,
+    size          INTEGER NOT NULL,
+    etag          TEXT,
+    last_modified TEXT,
+    fetched_at    REAL NOT NULL,
+    last_access   REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_access ON responses(last_access);
+"""
+
+
+@dataclass
+class CachedResponse:
+    url: str
+    body: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+
+
+class ResponseCache:
+    """
+    On-disk HTTP response cache keyed by URL.
+
+    Fresh entries (younger than the endpoint's TTL) are served without touching
+    the network; stale ones are revalidated with If-None-Match /
+    If-Modified-Since. Bodies are zlib-compressed and the total is kept under
+    `max_bytes` by evicting least-recently-used entries.
+    """
+
+    def __init__(self, path: Optional[Path] = None, max_bytes: int = 256 * 1024 * 1024,
+                 ttls: Tuple[Tuple[str, float], ...] = DEFAULT_TTLS, default_ttl: float = DEFAULT_TTL):
+        self.path = Path(path) if path else app_dir() / "http_cache.db"
+        self.max_bytes = max_bytes
+        self.ttls = ttls
+        self.default_ttl = default_ttl
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._schema_ready = False
+
+        self.hits = 0          # served locally, no request
+        self.revalidated = 0   # 304 Not Modified
+        self.misses = 0        # full 200 download
+        self.bytes_saved = 0
+        self.bytes_downloaded = 0
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with self._lock:
+                if not self._schema_ready:
+                    conn.executescript(_SCHEMA)
+                    self._schema_ready = True
+            self._local.conn = conn
+        return conn
+
+    def ttl_for(self, url: str) -> float:
+        for needle, ttl in self.ttls:
+            if needle in url:
+                return ttl
+        return self.default_ttl
+
+    def is_fresh(self, entry: CachedResponse) -> bool:
+        return time.time() - entry.fetched_at < self.ttl_for(entry.url)
+
+    # ---------- entries ----------
+    def get(self, url: str) -> Optional[CachedResponse]:
+        conn = self._conn()
+        row = conn.execute(
+            "SELECT body, etag, last_modified, fetched_at FROM responses WHERE url = ?", (url,)
+        ).fetchone()
+        if row is None:
+            return None
+        conn.execute("UPDATE responses SET last_access = ? WHERE url = ?", (time.time(), url))
+        return CachedResponse(url, zlib.decompress(row[0]), row[1], row[2], row[3])
+
+    def put(self, url: str, body: bytes, etag: Optional[str], last_modified: Optional[str]) -> None:
+        packed = zlib.compress(body, 6)
+        now = time.time()
+        self._conn().execute(
+            """
+            INSERT OR REPLACE INTO responses (url, body, size, etag, last_modified, fetched_at, last_access)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            (url, packed, len(packed), etag, last_modified, now, now),
+        )
+        self._evict()
+
+    def touch(self, url: str) -> None:
+        """A 304 came back: the cached body is good for another TTL."""
+        now = time.time()
+        self._conn().execute(
+            "UPDATE responses SET fetched_at = ?, last_access = ? WHERE url = ?", (now, now, url)
+        )
+
+    def _evict(self) -> None:
+        conn = self._conn()
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        # Trim to 90% so we don't evict on every single put once full
+        target = int(self.max_bytes * 0.9)
+        doomed = []
+        for url, size in conn.execute("SELECT url, size FROM responses ORDER BY last_access"):
+            if total <= target:
+                break
+            doomed.append((url,))
+            total -= size
+        conn.executemany("DELETE FROM responses WHERE url = ?", doomed)
+
+    def clear(self) -> None:
+        self._conn().execute("DELETE FROM responses")
+
+    # ---------- stats ----------
+    def record(self, outcome: str, nbytes: int) -> None:
+        with self._lock:
+            if outcome == "hit":
+                self.hits += 1
+                self.bytes_saved += nbytes
+            elif outcome == "revalidated":
+                self.revalidated += 1
+                self.bytes_saved += nbytes
+            else:
+                self.misses += 1
+                self.bytes_downloaded += nbytes
+
+    def stats(self) -> dict:
+        entries, size = self._conn().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        with self._lock:
+            lookups = self.hits + self.revalidated + self.misses
+            return {
+                "hits": self.hits,
+                "revalidated": self.revalidated,
+                "misses": self.misses,
+                "hit_ratio": (self.hits + self.revalidated) / lookups if lookups else 0.0,
+                "bytes_saved": self.bytes_saved,
+                "bytes_downloaded": self.bytes_downloaded,
+                "entries": entries,
+                "size_bytes": size,
+            }
+
+
+_shared: Optional[ResponseCache] = None
+_shared_lock = threading.Lock()
+
+
+def shared_response_cache() -> ResponseCache:
+    """Process-wide cache so stats cover every client."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = ResponseCache()
+        return _shared
@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from core.card_list import ListEntry
+from core.log import get_logger
+from core.metrics import METRICS
+from core.search import CardNameIndex, SearchHit, normalize_name
+from providers.scryfall.store import ScryfallStore
+
+if TYPE_CHECKING:
+    from providers.scryfall.client import ScryfallClient
+
+# A fuzzy hit is accepted when it scores at least this (a prefix match, or a
+# trigram Dice >= 0.8) and beats the runner-up by FUZZY_MARGIN
+FUZZY_MIN = 400.0
+FUZZY_MARGIN = 50.0
+
+# Resolution keys: ("id", card_id) | ("number", set, collector_number) | ("name", normalized name, set or "")
+Key = Tuple[str, ...]
+
+
+@dataclass
+class Resolution:
+    entry: ListEntry
+    card_id: str
+    how: str  # "id", "number", "exact", "cached", "remote", "fuzzy" or "name" (requested set ignored)
+
+
+@dataclass
+class ImportResult:
+    resolved: List[Resolution] = field(default_factory=list)
+    unresolved: List[ListEntry] = field(default_factory=list)
+    requests: int = 0
+    elapsed: float = 0.0
+
+    def counts(self) -> Counter:
+        return Counter(r.how for r in self.resolved)
+
+    def holdings(self) -> List[Tuple[str, str, int]]:
+        """(card_id, finish, quantity) summed over lines, e.g. for ScryfallStore.upsert_holdings()."""
+        totals: Counter = Counter()
+        for r in self.resolved:
+            totals[(r.card_id, r.entry.finish)] += r.entry.quantity
+        return [(card_id, finish, qty) for (card_id, finish), qty in totals.items()]
+
+
+def entry_key(e: ListEntry) -> Key:
+    if e.card_id:
+        return ("id", e.card_id.lower())
+    if e.set_code and e.collector_number:
+        return ("number", e.set_code, e.collector_number)
+    return ("name", normalize_name(e.name), e.set_code or "")
+
+
+def _identifier(key: Key, entry: ListEntry) -> dict:
+    if key[0] == "id":
+        return {"id": key[1]}
+    if key[0] == "number":
+        return {"set": key[1], "collector_number": key[2]}
+    return {"name": entry.name, "set": key[2]} if key[2] else {"name": entry.name}
+
+
+def _card_keys(card: dict) -> List[Key]:
+    """Every key a returned card answers (names include each face of a multi-face card)."""
+    set_code = card.get("set", "")
+    keys: List[Key] = [("id", card.get("id", "")), ("number", set_code, card.get("collector_number", ""))]
+    names = [card.get("name", "")] + [f.get("name", "") for f in card.get("card_faces") or ()]
+    for name in names:
+        n = normalize_name(name)
+        keys += [("name", n, set_code), ("name", n, "")]
+    return keys
+
+
+class ListImporter:
+    """
+    Resolves parsed list entries to Scryfall card ids, cheapest source first:
+
+      1. the local store: Scryfall ids, (set, collector number), exact names
+         (or one face of a multi-face card) via the name index
+      2. remembered lookups from earlier imports (fuzzy hits and misses)
+      3. /cards/collection for what's left, COLLECTION_MAX identifiers per
+         request, through the client's rate limiter
+      4. unambiguous fuzzy name matches against the local index for what
+         Scryfall didn't know either (typos)
+
+    Fuzzy matching runs after the network on purpose: a card that simply
+    isn't in the local catalog yet would otherwise be "fuzzily" matched to a
+    similarly named card that is. Identical lines are resolved once. Fetched
+    cards go into the store and the index, fuzzy hits and misses into the
+    store's import aliases, so importing the same list again is local.
+    """
+
+    MISS_TTL = timedelta(days=7)  # forget misses after this; the card may have been released since
+
+    def __init__(self, store: ScryfallStore, index: Optional[CardNameIndex] = None,
+                 client: Optional["ScryfallClient"] = None, fuzzy: bool = True, remote: bool = True):
+        self.store = store
+        self.index = index
+        self.client = client
+        self.fuzzy = fuzzy
+        self.remote = remote
+        self.log = get_logger("scryfall.import")
+        self._released: Optional[Dict[str, str]] = None
+
+    def resolve(self, entries: Iterable[ListEntry]) -> ImportResult:
+        t0 = time.perf_counter()
+        entries = list(entries)
+        groups: Dict[Key, List[ListEntry]] = {}
+        for e in entries:
+            groups.setdefault(entry_key(e), []).append(e)
+
+        found: Dict[Key, Tuple[str, str]] = {}  # key -> (card id, how)
+        fallback: Dict[Key, str] = {}           # name known locally, but not in the requested set
+        self._resolve_local(groups, found, fallback)
+        local = len(found)
+
+        pending = [k for k in groups if k not in found]
+        since = (datetime.now(timezone.utc) - self.MISS_TTL).isoformat(timespec="seconds")
+        remembered = self.store.load_aliases(("\t".join(k) for k in pending), since) if pending else {}
+        for key in pending:
+            alias = remembered.get("\t".join(key), "")
+            if alias:
+                found[key] = (alias, "cached")
+        pending = [k for k in pending if k not in found and "\t".join(k) not in remembered]
+
+        requests = 0
+        answered: Set[Key] = set()  # keys Scryfall was actually asked about
+        if pending and self.remote:
+            requests = self._resolve_remote(pending, groups, found, answered)
+        pending = [k for k in pending if k not in found]
+
+        learned: List[Tuple[str, Optional[str]]] = []
+        if pending and self.fuzzy:
+            index = self._index()
+            for key in pending:
+                hit = self._fuzzy(index, key[1]) if key[0] == "name" and key[1] else None
+                card_id = self._pick_printing(hit.printings, key[2]) if hit is not None else None
+                if card_id is not None:
+                    found[key] = (card_id, "fuzzy")
+                    learned.append(("\t".join(key), card_id))
+        for key in pending:
+            if key not in found and key in fallback:
+                found[key] = (fallback[key], "name")
+                learned.append(("\t".join(key), fallback[key]))
+            elif key not in found and key in answered:
+                learned.append(("\t".join(key), None))
+        if learned:
+            self.store.save_aliases(learned)
+
+        result = ImportResult(requests=requests)
+        for key, group in groups.items():
+            hit = found.get(key)
+            for e in group:
+                if hit is None:
+                    result.unresolved.append(e)
+                else:
+                    result.resolved.append(Resolution(e, hit[0], hit[1]))
+        result.resolved.sort(key=lambda r: r.entry.line)
+        result.unresolved.sort(key=lambda e: e.line)
+        result.elapsed = time.perf_counter() - t0
+
+        METRICS.counter("import.lines").inc(len(entries))
+        for how, n in result.counts().items():
+            METRICS.counter("import.resolved", label=how).inc(n)
+        self.log.info(
+            f"Import: {len(entries)} lines ({len(groups)} distinct), {local} resolved locally, "
+            f"{len(found) - local} via cache/{requests} request(s)/fuzzy, {len(result.unresolved)} unresolved "
+            f"in {result.elapsed * 1000:.0f} ms"
+        )
+        return result
+
+    # ---------- local ----------
+    def _resolve_local(self, groups: Dict[Key, List[ListEntry]], found: Dict[Key, Tuple[str, str]],
+                       fallback: Dict[Key, str]) -> None:
+        ids = [k[1] for k in groups if k[0] == "id"]
+        if ids:
+            known = self.store.existing_card_ids(ids)
+            for card_id in ids:
+                if card_id in known:
+                    found[("id", card_id)] = (card_id, "id")
+
+        numbered = [k for k in groups if k[0] == "number"]
+        if numbered:
+            by_number = self.store.card_ids_by_number({k[1] for k in numbered})
+            for key in numbered:
+                card_id = by_number.get((key[1], key[2]))
+                if card_id:
+                    found[key] = (card_id, "number")
+
+        named = [k for k in groups if k[0] == "name" and k[1]]
+        if not named:
+            return
+        index = self._index()
+        for key in named:
+            hit = index.lookup(key[1])
+            if hit is None:
+                continue
+            card_id = self._pick_printing(hit.printings, key[2])
+            if card_id is not None:
+                found[key] = (card_id, "exact")
+            else:
+                fallback[key] = self._pick_printing(hit.printings, "")
+
+    def _index(self) -> CardNameIndex:
+        if self.index is None:
+            t0 = time.perf_counter()
+            self.index = CardNameIndex()
+            self.index.add_many(self.store.iter_card_names())
+            self.log.info(f"Name index built for import in {(time.perf_counter() - t0) * 1000:.0f} ms")
+        return self.index
+
+    def _fuzzy(self, index: CardNameIndex, q: str) -> Optional[SearchHit]:
+        hits = index.search(q, limit=2)
+        if not hits:
+            return None
+        top = hits[0]
+        if top.score >= FUZZY_MIN and (len(hits) < 2 or hits[1].score <= top.score - FUZZY_MARGIN):
+            return top
+        return None
+
+    def _pick_printing(self, printings: Sequence[Tuple[str, str]], set_code: str) -> Optional[str]:
+        """The printing in `set_code`, or with no set the one from the newest set (Scryfall's default)."""
+        if set_code:
+            return next((card_id for card_id, code in printings if code == set_code), None)
+        if not printings:
+            return None
+        if self._released is None:
+            self._released = self.store.set_release_dates()
+        released = self._released
+        return max(printings, key=lambda p: released.get(p[1], ""))[0]
+
+    # ---------- remote ----------
+    def _resolve_remote(self, pending: List[Key], groups: Dict[Key, List[ListEntry]],
+                        found: Dict[Key, Tuple[str, str]], answered: Set[Key]) -> int:
+        if self.client is None:
+            from providers.scryfall.client import ScryfallClient
+
+            self.client = ScryfallClient(user_agent="TCG Toolbox (list import)")
+        batch_size = self.client.COLLECTION_MAX
+        requests = 0
+        for i in range(0, len(pending), batch_size):
+            keys = pending[i:i + batch_size]
+            try:
+                payload = self.client.get_collection([_identifier(k, groups[k][0]) for k in keys])
+            except Exception:
+                self.log.exception(f"/cards/collection failed for {len(keys)} identifiers; left unresolved")
+                continue
+            requests += 1
+            answered.update(keys)
+            cards = payload.get("data", [])
+            self._remember(cards)
+
+            wanted = set(keys)
+            for card in cards:
+                for key in _card_keys(card):
+                    if key in wanted and key not in found:
+                        found[key] = (card["id"], "remote")
+        return requests
+
+    def _remember(self, cards: List[dict]) -> None:
+        if not cards:
+            return
+        self.store.insert_missing_cards(cards)
+        if self.index is not None:
+            self.index.add_many((c.get("id", ""), c.get("name", ""), c.get("set", "")) for c in cards)
@@ -1,62 +1,329 @@
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
 
 from core.log import get_logger
+from core.metrics import METRICS
+from core.paths import app_dir
+from core.portfolio.history import HistorySnapshot, PriceHistory, default_history_dir
+from core.portfolio.prices import PRICE_FIELDS
+from providers.scryfall.bulk import iter_json_array
 from providers.scryfall.client import ScryfallClient
+from providers.scryfall.manifest import REVERIFY_DAYS, plan_sync
+from providers.scryfall.pipeline import HistorySink, Page, Sink, StoreSink, run_set
+from providers.scryfall.ratelimit import TokenBucket
+from providers.scryfall.store import ScryfallStore, card_row, default_store_path, utc_now
 
 
-def run_scryfall_sets_cards(max_sets: int = 5, throttle_seconds: float = 0.12):
+@dataclass
+class IngestSummary:
+    cards: int = 0
+    sets: int = 0
+    failed: List[str] = field(default_factory=list)
+    skipped: int = 0  # sets left alone by a delta sync
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
+
+# on_progress(sets_done, sets_total, cards_so_far); called from the ingest threads
+ProgressFn = Callable[[int, int, int], None]
+
+# METRICS "ingest.set_state" values
+SET_RUNNING, SET_DONE, SET_INCOMPLETE = 0.0, 1.0, -1.0
+
+
+def run_scryfall_sets_cards(max_sets: int = 5, concurrency: int = 4,
+                            requests_per_second: Optional[float] = None,
+                            store: Optional[ScryfallStore] = None,
+                            set_codes: Optional[Sequence[str]] = None,
+                            on_progress: Optional[ProgressFn] = None,
+                            history: Optional[PriceHistory] = None,
+                            delta: bool = True,
+                            reverify_days: int = REVERIFY_DAYS) -> IngestSummary:
     """
     Ingest sets -> cards using Scryfall set search_uri pages.
 
+    `set_codes` restricts the run to those sets; otherwise the first
+    `max_sets` (0 = all) from Scryfall's list are taken.
+
+    With `delta`, each chosen set is compared with the manifest recorded at
+    its last complete sync (see manifest.plan_sync) and only new, changed,
+    interrupted or recently released (`reverify_days`) sets are fetched.
+    Skipped sets keep their stored cards and prices; delta=False refetches
+    everything.
+
+    Up to `concurrency` sets are paginated at once; every request goes through
+    one shared token bucket (Scryfall's ~10 req/s by default, or
+    `requests_per_second`), so the sync runs at the allowed rate instead of
+    sleeping between pages.
+
+    Each set streams through pipeline.run_set, so the next page downloads
+    while the current one is written. Every page is written to the local
+    store in one transaction; a set is only marked synced once all of its
+    pages made it in.
+
+    Each page's prices are also fed to today's price-history snapshot
+    (`history`, default history_for_store(store)), written once at the end.
+
+    Per-set progress goes to METRICS (ingest.set_* labelled by set code) for
+    the Metrics dock; the HTTP side is recorded by the client/transport.
+
     NOTE: We intentionally sample card-name logging to keep UI stable.
     Full fidelity details still go to app.log via log.exception().
     """
     log = get_logger("ingest.scryfall")
     log.info("Scryfall ingest starting")
 
-    client = ScryfallClient(user_agent="TCG Toolbox (Scryfall ingest)")
-    payload = client.list_sets()
+    store = store or ScryfallStore()
+    limiter = TokenBucket(requests_per_second) if requests_per_second else None
+    client = ScryfallClient(user_agent="TCG Toolbox (Scryfall ingest)", limiter=limiter,
+                            pool_size=max(4, concurrency))
+    # A delta sync decides from the listing, so it must be current, not the 24 h HTTP-cache copy
+    payload = client.list_sets(revalidate=delta)
     sets = payload.get("data", [])
+    store.upsert_sets(sets)
 
-    if max_sets and max_sets > 0:
+    if set_codes:
+        wanted = {c.lower() for c in set_codes}
+        sets = [s for s in sets if s.get("code", "").lower() in wanted]
+        missing = wanted - {s.get("code", "").lower() for s in sets}
+        if missing:
+            log.warning(f"Unknown set code(s): {', '.join(sorted(missing))}")
+    elif max_sets and max_sets > 0:
         sets = sets[:max_sets]
 
-    log.info(f"Fetched {len(sets)} sets to process")
-
-    for s in sets:
-        set_name = s.get("name", "Unknown Set")
-        search_uri = s.get("search_uri")
-        if not search_uri:
-            log.warning(f"Skipping set with no search_uri: {set_name}")
-            continue
+    skipped = 0
+    if delta:
+        plan = plan_sync(sets, store.load_manifests(), store.incomplete_sets(), reverify_days)
+        log.info(f"Delta sync: {plan.summary()}")
+        for s in plan.fetch:
+            log.debug(f"Delta sync: {s.get('code')} {plan.reasons[s.get('code', '')]}")
+        sets, skipped = plan.fetch, len(plan.skipped)
+        METRICS.counter("ingest.sets_skipped").inc(skipped)
 
-        log.info(f"Set start: {set_name}")
+    log.info(f"Fetched {len(sets)} sets to process (concurrency={concurrency})")
+    snapshot = (history if history is not None else history_for_store(store)).snapshot()
 
-        page_url = search_uri
-        count = 0
+    t0 = time.perf_counter()
+    total = 0
+    done = 0
+    failed = []
 
-        while page_url:
+    with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="scryfall-ingest") as pool:
+        futures = {pool.submit(_ingest_set, client, store, s, log, snapshot, delta): s for s in sets}
+        for fut in as_completed(futures):
+            set_name = futures[fut].get("name", "Unknown Set")
             try:
-                page = client.get_page(page_url)
+                count, complete = fut.result()
             except Exception:
-                # Full details go to file log; UI will show a short line
-                log.exception(f"Failed page fetch for set '{set_name}'")
-                break
+                log.exception(f"Set crashed: {set_name}")
+                count, complete = 0, False
+            total += count
+            done += 1
+            if not complete:
+                failed.append(set_name)
+            if on_progress is not None:
+                on_progress(done, len(sets), total)
+
+    elapsed = time.perf_counter() - t0
+    _commit_history(snapshot, log)
+    if failed:
+        log.warning(f"{len(failed)} set(s) incomplete: {', '.join(failed)}")
+    log.info(f"Scryfall ingest complete: {total} cards in {elapsed:.1f}s ({total / max(elapsed, 1e-9):.0f} cards/s)")
+
+    cs = client.cache_stats()
+    if cs:
+        log.info(
+            f"HTTP cache: {cs['hits']} hits, {cs['revalidated']} revalidated, {cs['misses']} misses, "
+            f"{cs['bytes_saved'] / 1e6:.1f} MB saved"
+        )
+    return IngestSummary(cards=total, sets=len(sets), failed=failed, elapsed=elapsed, skipped=skipped)
+
+
+def history_for_store(store: ScryfallStore) -> PriceHistory:
+    """
+    The price history kept alongside `store`: the default one for the default
+    database, otherwise <db stem>_price_history next to the database file.
+    """
+    if store.path.resolve() == default_store_path().resolve():
+        return PriceHistory(default_history_dir())
+    return PriceHistory(store.path.with_name(f"{store.path.stem}_price_history"))
+
+
+def _commit_history(snapshot: HistorySnapshot, log) -> None:
+    # Price history is a side product; a failure here mustn't fail the sync
+    try:
+        snapshot.commit()
+    except Exception:
+        log.exception("Failed to write price history")
+
+
+class _ProgressSink(Sink):
+    """Per-set METRICS for the Metrics dock, plus a sampled card-name log."""
+
+    def __init__(self, set_name: str, log):
+        self.set_name = set_name
+        self.log = log
+        self.t0 = time.perf_counter()
+        self.fetched = 0
+
+    def write(self, page: Page) -> None:
+        set_code = page.set_code
+        n = len(page.rows)
+        self.fetched += n
+        elapsed = time.perf_counter() - self.t0
+        METRICS.counter("ingest.cards").inc(n)
+        METRICS.counter("ingest.set_pages", label=set_code).inc()
+        METRICS.gauge("ingest.set_cards", label=set_code).set(page.start + n)
+        METRICS.gauge("ingest.set_elapsed_s", label=set_code).set(elapsed)
+        METRICS.gauge("ingest.set_cards_per_s", label=set_code).set(self.fetched / max(elapsed, 1e-9))
 
-            for card in page.get("data", []):
-                count += 1
-                card_name = card.get("name", "Unknown Card")
+        # Sample output (first 10 + every 50th) to keep UI from melting
+        for i, card in enumerate(page.cards, page.start + 1):
+            if i <= 10 or i % 50 == 0:
+                self.log.info(f"{self.set_name} : {card.get('name', 'Unknown Card')}")
 
-                # Sample output (first 10 + every 50th) to keep UI from melting
-                if count <= 10 or count % 50 == 0:
-                    log.info(f"{set_name} : {card_name}")
 
-            if page.get("has_more"):
-                page_url = page.get("next_page")
-                time.sleep(throttle_seconds)
+def _ingest_set(client: ScryfallClient, store: ScryfallStore, s: dict, log,
+                snapshot: Optional[HistorySnapshot] = None, revalidate: bool = False) -> Tuple[int, bool]:
+    """
+    Stream one set into the store (and price history) through the pipeline.
+    Returns (cards in the store for this run, completed).
+    revalidate: conditional GETs even for fresh cached pages (a delta sync
+    only fetches sets it expects to have changed).
+    """
+    set_name = s.get("name", "Unknown Set")
+    search_uri = s.get("search_uri")
+    if not search_uri:
+        log.warning(f"Skipping set with no search_uri: {set_name}")
+        return 0, True
+
+    set_code = s.get("code", "")
+    resume = store.resume_point(set_code)
+    if resume:
+        page_url, start, started_at = resume
+        log.info(f"Set resume: {set_name} (from card {start})")
+    else:
+        page_url, start, started_at = search_uri, 0, utc_now()
+        log.info(f"Set start: {set_name}")
+
+    METRICS.gauge("ingest.set_state", label=set_code).set(SET_RUNNING)
+
+    sinks: List[Sink] = [StoreSink(store), _ProgressSink(set_name, log)]
+    if snapshot is not None:
+        sinks.append(HistorySink(snapshot))
+    result = run_set(client, set_code, page_url, sinks, start=start, started_at=started_at,
+                     revalidate=revalidate)
+    count = start + result.cards
+
+    METRICS.gauge("ingest.set_state", label=set_code).set(SET_DONE if result.complete else SET_INCOMPLETE)
+    if result.error is not None:
+        # Transport already retried transient failures; the checkpoint stays on the
+        # failed page so the next run picks up right there. Full details go to the file log.
+        log.error(f"Set '{set_name}' stopped early (will resume at card {count})", exc_info=result.error)
+    if not result.complete:
+        log.warning(f"{set_name} : incomplete, not marked synced")
+
+    log.info(f"{set_name} : processed {count} cards")
+    return count, result.complete
+
+
+# Bulk types that list every printing: only these can mark a set as fully synced
+COMPLETE_BULK_TYPES = ("default_cards", "all_cards")
+
+
+def run_scryfall_bulk(source: Union[str, Path] = "default_cards", batch_size: int = 2000,
+                      store: Optional[ScryfallStore] = None,
+                      on_progress: Optional[Callable[[int], None]] = None,
+                      history: Optional[PriceHistory] = None) -> IngestSummary:
+    """
+    Ingest the whole card corpus from a Scryfall bulk-data file in one pass.
+
+    `source` is either a local JSON file path or a bulk type name
+    ('default_cards', 'all_cards', ...) which is downloaded first into
+    ~/.tcg_toolbox/bulk/. Cards are stream-parsed and written in batches, so
+    memory stays flat regardless of file size. on_progress(cards) fires per batch.
+    Prices go to today's price-history snapshot as for the per-set sync.
+
+    Only a downloaded COMPLETE_BULK_TYPES file marks its sets synced (and
+    drops their cards it no longer lists). Other types (oracle_cards,
+    unique_artwork) and local files may hold only some printings, so their
+    cards are upserted without positions and the sets stay unsynced.
+    """
+    log = get_logger("ingest.scryfall")
+    log.info(f"Scryfall bulk ingest starting ({source})")
+
+    store = store or ScryfallStore()
+    path = Path(source)
+    complete = False
+
+    if not path.is_file():
+        client = ScryfallClient(user_agent="TCG Toolbox (Scryfall ingest)")
+        meta = client.get_bulk_data(str(source))
+        bulk_type = meta.get("type", source)
+        complete = bulk_type in COMPLETE_BULK_TYPES
+        path = app_dir() / "bulk" / f"{bulk_type}.json"
+        log.info(f"Downloading bulk file ({meta.get('size', 0) / 1e6:.0f} MB, updated {meta.get('updated_at')})")
+        client.download(meta["download_uri"], path)
+
+    t0 = time.perf_counter()
+    started_at = utc_now()
+    positions: Dict[str, int] = {}
+    seen_sets: Dict[str, dict] = {}
+    new_sets = []
+    batch = []
+    count = 0
+    snapshot = (history if history is not None else history_for_store(store)).snapshot()
+    n_prices = len(PRICE_FIELDS)
+
+    def flush():
+        if new_sets:
+            store.ensure_sets(new_sets, synced_at=started_at)
+            new_sets.clear()
+        store.upsert_card_rows(batch)
+        snapshot.add([r[0] for r in batch], [r[-n_prices:] for r in batch])  # card_row() ends with the prices
+        METRICS.counter("ingest.cards").inc(len(batch))
+        batch.clear()
+
+    with path.open("r", encoding="utf-8") as fp:
+        for card in iter_json_array(fp):
+            set_code = card.get("set", "")
+            if set_code not in seen_sets:
+                seen_sets[set_code] = {
+                    "code": set_code,
+                    "id": card.get("set_id", ""),
+                    "name": card.get("set_name", ""),
+                    "search_uri": card.get("set_search_uri"),
+                }
+                new_sets.append(seen_sets[set_code])
+
+            if complete:
+                pos = positions.get(set_code, 0)
+                positions[set_code] = pos + 1
             else:
-                page_url = None
+                pos = -1  # keeps a stored card's position (see _UPSERT_CARD)
+            batch.append(card_row(card, set_code, pos, started_at))
+            count += 1
+
+            if len(batch) >= batch_size:
+                flush()
+                log.info(f"Bulk ingest: {count} cards")
+                if on_progress is not None:
+                    on_progress(count)
+
+    flush()
 
-        log.info(f"{set_name} : processed {count} cards")
+    if complete:
+        for set_code in seen_sets:
+            store.finish_set(set_code, started_at)
+    else:
+        log.info("Bulk source may not list every printing; sets left for a full sync")
+    _commit_history(snapshot, log)
 
-    log.info("Scryfall ingest complete")
\ No newline at end of file
+    log.info(f"Scryfall bulk ingest complete: {count} cards across {len(seen_sets)} sets")
+    return IngestSummary(cards=count, sets=len(seen_sets), elapsed=time.perf_counter() - t0)
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Set
+
+# Sets released within this many days (or announced for later) are refetched
+# even when their listing hasn't changed: Scryfall fills in previews, prices
+# and late additions for a while after release without touching /sets.
+REVERIFY_DAYS = 30
+
+
+def listing_hash(s: dict) -> str:
+    """Stable hash of a /sets entry (key order doesn't matter)."""
+    data = json.dumps(s, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+@dataclass(frozen=True)
+class SetManifest:
+    """What a set's /sets entry looked like when its cards were last fully synced."""
+    code: str
+    card_count: Optional[int]
+    released_at: Optional[str]
+    content_hash: str
+    synced_at: str
+
+
+@dataclass
+class SyncPlan:
+    fetch: List[dict] = field(default_factory=list)
+    reasons: Dict[str, str] = field(default_factory=dict)  # set code -> new/incomplete/changed/recent
+    skipped: List[dict] = field(default_factory=list)
+
+    def summary(self) -> str:
+        counts = Counter(self.reasons.values())
+        parts = [f"{reason} {n}" for reason, n in counts.most_common()]
+        return f"{len(self.fetch)} to fetch ({', '.join(parts) or 'none'}), {len(self.skipped)} unchanged"
+
+
+def plan_sync(sets: Iterable[dict], manifests: Dict[str, SetManifest], incomplete: Set[str],
+              reverify_days: int = REVERIFY_DAYS, today: Optional[date] = None) -> SyncPlan:
+    """Split a fresh /sets listing into sets to fetch (with why) and sets to skip."""
+    cutoff = ((today or date.today()) - timedelta(days=reverify_days)).isoformat()
+    plan = SyncPlan()
+    for s in sets:
+        code = s.get("code", "")
+        m = manifests.get(code)
+        if m is None:
+            reason = "new"
+        elif code in incomplete:
+            reason = "incomplete"
+        elif m.content_hash != listing_hash(s):
+            reason = "changed"
+        elif reverify_days >= 0 and (s.get("released_at") or "") >= cutoff:
+            reason = "recent"
+        else:
+            plan.skipped.append(s)
+            continue
+        plan.fetch.append(s)
+        plan.reasons[code] = reason
+    return plan
@@ -0,0 +1,327 @@
+"""
+Streaming set ingest: Scryfall search pages -> card rows -> sinks.
+
+    fetch     client.get_page() along next_page (HTTP + JSON decode; the next
+              URL is only known once a page is decoded, so these are one stage)
+    normalize card dicts -> card_row() tuples
+    sinks     store, price history, CardTable / name index for the UI,
+              JSONL / CSV / columnar files
+
+fetch and normalize each run on their own thread with a bounded queue in
+between, so page N+1 downloads while page N is normalized and page N-1 is
+written; a slow sink stalls the stages behind it instead of piling pages up
+in memory. Sinks run on the caller's thread, in page order.
+"""
+from __future__ import annotations
+
+import csv
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Callable, Iterable, Iterator, List, Optional, Sequence
+
+from core.log import get_logger
+from core.metrics import METRICS
+from core.portfolio.prices import PRICE_FIELDS
+from core.workers import CancelToken, Cancelled
+from providers.scryfall.store import ScryfallStore, card_row, utc_now
+
+if TYPE_CHECKING:
+    from core.models import CardTable
+    from core.portfolio.history import HistorySnapshot
+    from core.search import CardNameIndex
+    from providers.scryfall.client import ScryfallClient
+
+QUEUE_SIZE = 2  # pages buffered between two stages
+# How long an early exit waits for stage threads; a fetch stuck in transport retries is left to finish alone
+JOIN_TIMEOUT = 0.5
+
+# card_row() layout
+_ID, _SET, _POS, _NAME, _NUMBER, _RAW = range(6)
+_PRICES = slice(-len(PRICE_FIELDS), None)
+
+
+@dataclass
+class Page:
+    set_code: str
+    number: int              # 1-based, within this run
+    start: int               # store position of the first card
+    cards: List[dict]
+    next_page: Optional[str]
+    rows: List[tuple] = field(default_factory=list)  # card_row() tuples, set by the normalize stage
+
+
+@dataclass
+class SetResult:
+    cards: int = 0
+    pages: int = 0
+    complete: bool = False
+    error: Optional[BaseException] = None  # what ended the run early (a failed page, a sink error)
+
+
+# ---------- sinks ----------
+class Sink:
+    """Gets one set's pages in order. open/close bracket each set; a sink may see several sets."""
+
+    def open(self, set_code: str, started_at: str) -> None:
+        pass
+
+    def write(self, page: Page) -> None:
+        pass
+
+    def close(self, set_code: str, complete: bool) -> None:
+        pass
+
+
+class StoreSink(Sink):
+    """Upserts each page with its resume checkpoint; marks the set synced once complete."""
+
+    def __init__(self, store: ScryfallStore):
+        self.store = store
+        self._started_at = ""
+
+    def open(self, set_code: str, started_at: str) -> None:
+        self._started_at = started_at
+
+    def write(self, page: Page) -> None:
+        t0 = time.perf_counter()
+        self.store.write_page_rows(page.set_code, page.rows, page.start, self._started_at, page.next_page)
+        METRICS.histogram("ingest.page_write_s").observe(time.perf_counter() - t0)
+
+    def close(self, set_code: str, complete: bool) -> None:
+        if complete:
+            self.store.finish_set(set_code, self._started_at)
+
+
+class HistorySink(Sink):
+    """Feeds prices into a price-history snapshot (committed by its owner)."""
+
+    def __init__(self, snapshot: "HistorySnapshot"):
+        self.snapshot = snapshot
+
+    def write(self, page: Page) -> None:
+        self.snapshot.add([r[_ID] for r in page.rows], [r[_PRICES] for r in page.rows])
+
+
+class CardTableSink(Sink):
+    """Grows a CardTable in place; on_page(table) after every page lets a UI stream it."""
+
+    def __init__(self, table: "CardTable", on_page: Optional[Callable[["CardTable"], None]] = None):
+        self.table = table
+        self.on_page = on_page
+
+    def write(self, page: Page) -> None:
+        self.table.extend((r[_ID], r[_NAME]) for r in page.rows)
+        if self.on_page is not None:
+            self.on_page(self.table)
+
+
+class NameIndexSink(Sink):
+    def __init__(self, index: "CardNameIndex"):
+        self.index = index
+        self.added = 0
+
+    def write(self, page: Page) -> None:
+        self.index.add_many((r[_ID], r[_NAME], r[_SET]) for r in page.rows)
+        self.added += len(page.rows)
+
+
+class JsonlSink(Sink):
+    """One Scryfall card object per line."""
+
+    def __init__(self, fp: IO[str]):
+        self.fp = fp
+
+    def write(self, page: Page) -> None:
+        self.fp.writelines(r[_RAW] + "\n" for r in page.rows)
+
+
+class CsvSink(Sink):
+    COLUMNS = ("set_code", "position", "collector_number", "name", "id", *PRICE_FIELDS)
+
+    def __init__(self, fp: IO[str]):
+        self.writer = csv.writer(fp)
+        self.writer.writerow(self.COLUMNS)
+
+    def write(self, page: Page) -> None:
+        self.writer.writerows(
+            (r[_SET], r[_POS], r[_NUMBER], r[_NAME], r[_ID], *("" if p is None else p for p in r[_PRICES]))
+            for r in page.rows
+        )
+
+
+class ColumnarSink(Sink):
+    """
+    <directory>/<set>.npz per complete set: id, name, collector_number (str
+    arrays) and prices (float64 (n, len(PRICE_FIELDS)), NaN = none).
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._rows: List[tuple] = []
+
+    def open(self, set_code: str, started_at: str) -> None:
+        self._rows = []
+
+    def write(self, page: Page) -> None:
+        self._rows.extend(page.rows)
+
+    def close(self, set_code: str, complete: bool) -> None:
+        import numpy as np
+
+        rows, self._rows = self._rows, []
+        if not complete:
+            return
+        np.savez(
+            self.directory / f"{set_code}.npz",
+            id=np.array([r[_ID] for r in rows], dtype=str),
+            name=np.array([r[_NAME] for r in rows], dtype=str),
+            collector_number=np.array([r[_NUMBER] or "" for r in rows], dtype=str),
+            prices=np.array([r[_PRICES] for r in rows], dtype=np.float64).reshape(len(rows), len(PRICE_FIELDS)),
+        )
+
+
+# ---------- stages ----------
+_END = object()
+
+
+class _Stages:
+    """Bounded hand-off queues between stage threads, all stopped by one event."""
+
+    def __init__(self, size: int):
+        self.size = max(1, size)
+        self.stop = threading.Event()
+        self.threads: List[threading.Thread] = []
+
+    def run(self, source: Iterable, name: str) -> Iterator:
+        """Iterate `source` on a new thread; the returned iterator yields its items (and re-raises its error)."""
+        q: "queue.Queue" = queue.Queue(maxsize=self.size)
+
+        def pump():
+            try:
+                for item in source:
+                    if not self._put(q, item):
+                        return
+            except BaseException as e:
+                self._put(q, _Failure(e))
+                return
+            self._put(q, _END)
+
+        t = threading.Thread(target=pump, name=name, daemon=True)
+        self.threads.append(t)
+        t.start()
+        return self._drain(q)
+
+    def _put(self, q: "queue.Queue", item) -> bool:
+        while not self.stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _drain(self, q: "queue.Queue") -> Iterator:
+        while not self.stop.is_set():
+            try:
+                item = q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if item is _END:
+                return
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+
+    def close(self) -> None:
+        self.stop.set()
+        deadline = time.monotonic() + JOIN_TIMEOUT
+        for t in self.threads:
+            t.join(max(0.0, deadline - time.monotonic()))
+
+
+@dataclass
+class _Failure:
+    error: BaseException
+
+
+def _fetch(client: "ScryfallClient", set_code: str, url: str, start: int,
+           cancel: Optional[CancelToken], revalidate: bool, stop: threading.Event) -> Iterator[Page]:
+    number, position = 0, start
+    while url and not stop.is_set():
+        if cancel is not None:
+            cancel.check()
+        payload = client.get_page(url, revalidate=revalidate)
+        cards = payload.get("data", [])
+        next_page = payload.get("next_page") if payload.get("has_more") else None
+        number += 1
+        yield Page(set_code, number, position, cards, next_page)
+        position += len(cards)
+        url = next_page
+
+
+def _normalize(pages: Iterable[Page], started_at: str) -> Iterator[Page]:
+    for page in pages:
+        page.rows = [card_row(c, page.set_code, page.start + i, started_at) for i, c in enumerate(page.cards)]
+        yield page
+
+
+def run_set(client: "ScryfallClient", set_code: str, url: str, sinks: Sequence[Sink],
+            start: int = 0, started_at: Optional[str] = None, cancel: Optional[CancelToken] = None,
+            revalidate: bool = False, queue_size: int = QUEUE_SIZE) -> SetResult:
+    """
+    Stream one set from `url` (its search_uri, or a resume checkpoint at
+    position `start`) into `sinks`.
+
+    A page that still fails after the transport's retries ends the run with
+    complete=False and the error in SetResult.error; sinks are closed either
+    way. Raises Cancelled if `cancel` fires (checked between pages).
+    """
+    started_at = started_at or utc_now()
+    result = SetResult()
+    for sink in sinks:
+        sink.open(set_code, started_at)
+
+    stages = _Stages(queue_size)
+    try:
+        pages = stages.run(_fetch(client, set_code, url, start, cancel, revalidate, stages.stop),
+                           f"fetch-{set_code}")
+        pages = stages.run(_normalize(pages, started_at), f"normalize-{set_code}")
+        waited = time.perf_counter()
+        for page in pages:
+            METRICS.histogram("pipeline.wait_s").observe(time.perf_counter() - waited)
+            for sink in sinks:
+                sink.write(page)
+            result.cards += len(page.rows)
+            result.pages += 1
+            if cancel is not None:
+                cancel.check()
+            waited = time.perf_counter()
+        result.complete = True
+    except Cancelled:
+        raise
+    except Exception as e:
+        result.error = e
+    finally:
+        stages.close()
+        for sink in sinks:
+            sink.close(set_code, result.complete)
+    return result
+
+
+def run_sets(client: "ScryfallClient", sets: Iterable[dict], sinks: Sequence[Sink],
+             cancel: Optional[CancelToken] = None) -> List[SetResult]:
+    """Stream several /sets entries one after another (no store checkpoints needed); e.g. for file export."""
+    log = get_logger("scryfall.pipeline")
+    results = []
+    for s in sets:
+        if not s.get("search_uri"):
+            continue
+        result = run_set(client, s.get("code", ""), s["search_uri"], sinks, cancel=cancel)
+        if result.error is not None:
+            log.error(f"{s.get('name', s.get('code'))}: stopped after {result.cards} cards", exc_info=result.error)
+        results.append(result)
+    return results
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    acquire() reserves a token up front (the balance may go negative) and then
+    sleeps outside the lock, so concurrent callers queue up fairly and the
+    aggregate rate stays at `rate` per second. pause() sets a deadline no
+    token is handed out before; overlapping pauses don't add up.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("rate must be > 0")
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Block until `tokens` are available. Returns the seconds spent waiting."""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._paused_until)
+            self._tokens = min(self.capacity, self._tokens + max(0.0, start - self._last) * self.rate)
+            self._last = max(self._last, start)
+            self._tokens -= tokens
+            wait = (start - now) + (-self._tokens / self.rate if self._tokens < 0 else 0.0)
+
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def pause(self, seconds: float) -> None:
+        """
+        Hold every caller until `seconds` from now (e.g. after a 429 with
+        Retry-After). Several workers reporting the same 429 wait once.
+        """
+        with self._lock:
+            until = time.monotonic() + seconds
+            if until > self._paused_until:
+                self._paused_until = until
+                # No burst when the pause ends: one token at the deadline, none accrue while paused
+                self._tokens = min(self._tokens, 1.0)
+                self._last = max(self._last, until)
+
+
+# Scryfall asks for ~10 requests/second; every client in the process shares this by default.
+SCRYFALL_LIMITER = TokenBucket(rate=10.0, capacity=5.0)
@@ -1,30 +1,83 @@
 from __future__ import annotations
-from typing import Optional
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Iterable, List, Optional
 
-from core.models import Game, Set, Card
-from providers.scryfall.client import ScryfallClient
+from core.card_list import ListEntry
+from core.log import get_logger
+from core.models import Game, Set, CardTable
+from core.paths import app_dir
+from core.search import CardNameIndex, SearchHit
+from core.workers import CancelToken
+from providers.scryfall.pipeline import CardTableSink, NameIndexSink, Sink, StoreSink, run_set
+from providers.scryfall.store import ScryfallStore, default_store_path, utc_now
+
+if TYPE_CHECKING:
+    from providers.scryfall.client import ScryfallClient
+    from providers.scryfall.importer import ImportResult
 
 
 class ScryfallRepository:
     """
     Scryfall -> populates a Game(Set(Card)).
+
+    Reads from the local store first; only goes to the network for sets/cards
+    that were never synced (and writes what it fetched back to the store).
     """
 
-    def __init__(self):
-        self.client = ScryfallClient(user_agent="TCG Toolbox (Catalog Browser)")
+    SETS_MAX_AGE = timedelta(days=1)
+    INDEX_SAVE_INTERVAL = 60.0  # seconds between persisting incremental index adds
+
+    def __init__(self, store: Optional[ScryfallStore] = None):
+        self.log = get_logger("scryfall.repository")
+        self._client: Optional["ScryfallClient"] = None
+        self._client_lock = threading.Lock()
+        self.store = store or ScryfallStore()
+
+        self.name_index: Optional[CardNameIndex] = None
+        self._index_lock = threading.Lock()
+        self._index_dirty = False
+        self._index_saved_at = 0.0
 
-    def load_mtg_sets(self) -> Game:
-        payload = self.client.list_sets()
+    @property
+    def client(self) -> "ScryfallClient":
+        # requests + the transport stack are only imported once something needs the network
+        with self._client_lock:
+            if self._client is None:
+                from providers.scryfall.client import ScryfallClient
+
+                self._client = ScryfallClient(user_agent="TCG Toolbox (Catalog Browser)")
+            return self._client
+
+    def load_mtg_sets(self, refresh: bool = False, allow_stale: bool = False) -> Game:
+        """
+        Sets from the local store, refreshed from Scryfall when older than
+        SETS_MAX_AGE (or `refresh`). With allow_stale, any cached list is
+        returned as-is - the caller refreshes in the background (sets_stale()).
+        """
+        rows = self.store.load_sets()
+
+        if refresh or not rows or (not allow_stale and self.sets_stale()):
+            try:
+                payload = self.client.list_sets()
+                self.store.upsert_sets(payload.get("data", []))
+                rows = self.store.load_sets()
+            except Exception:
+                if not rows:
+                    raise
+                self.log.exception("Set list refresh failed; using cached sets")
 
         game = Game(id="mtg", name="Magic: The Gathering")
 
-        for s in payload.get("data", []):
+        for r in rows:
             set_obj = Set(
-                id=s.get("id", ""),
-                code=s.get("code", ""),
-                name=s.get("name", ""),
-                released_at=s.get("released_at"),
-                search_uri=s.get("search_uri", None),
+                id=r["id"],
+                code=r["code"],
+                name=r["name"],
+                released_at=r["released_at"],
+                search_uri=r["search_uri"],
             )
 
             if set_obj.code:
@@ -32,29 +85,130 @@ class ScryfallRepository:
 
         return game
 
-    def load_cards_for_set(self, set_obj: Set) -> None:
+    def sets_stale(self) -> bool:
+        synced_at = self.store.sets_synced_at()
+        if not synced_at:
+            return True
+        return datetime.now(timezone.utc) - datetime.fromisoformat(synced_at) > self.SETS_MAX_AGE
+
+    def load_cards_for_set(self, set_obj: Set,
+                           on_page: Optional[Callable[[CardTable], None]] = None,
+                           cancel: Optional[CancelToken] = None) -> None:
         """
         Mutates set_obj: fills cards + sets cards_loaded=True.
-        Uses search_uri pagination. Safe if a page fails (partial results ok for MVP).
+        Served from the local store when the set was synced before; otherwise
+        uses search_uri pagination and persists each page as it arrives.
+        on_page(cards) is called after every page with the table filled so far
+        (same object each time, grows in place) so callers can stream it.
+        Raises if a page still fails after retries, or Cancelled if `cancel`
+        fires between pages (progress is checkpointed either way).
         """
+        rows = self.store.load_cards(set_obj.code)
+        if rows is not None:
+            set_obj.cards = CardTable((r["id"], r["name"]) for r in rows)
+            set_obj.cards_loaded = True
+            return
+
         if not set_obj.search_uri:
-            set_obj.cards = []
+            set_obj.cards = CardTable()
             set_obj.cards_loaded = True
             return
 
-        cards = []
-        page_url: Optional[str] = set_obj.search_uri
+        # Pick up an interrupted sync (ours or the ingest's) instead of starting over
+        resume = self.store.resume_point(set_obj.code)
+        if resume:
+            page_url, start, started_at = resume
+            cards = CardTable((r["id"], r["name"]) for r in self.store.load_partial_cards(set_obj.code, started_at))
+        else:
+            page_url, start, started_at = set_obj.search_uri, 0, utc_now()
+            cards = CardTable()
+
+        sinks: List[Sink] = [StoreSink(self.store)]
+        if self.name_index is not None:
+            sinks.append(NameIndexSink(self.name_index))
+        sinks.append(CardTableSink(cards, on_page))
+        result = run_set(self.client, set_obj.code, page_url, sinks, start=start, started_at=started_at,
+                         cancel=cancel)
+        if result.error is not None:
+            # Failures propagate (after the transport's retries): never hand back a partial set
+            raise result.error
+        if result.pages and self.name_index is not None:
+            self._index_dirty = True
+
+        set_obj.cards = cards
+        set_obj.cards_loaded = True
+        self._maybe_save_index()
+
+    # ---------- name search ----------
+    def build_name_index(self) -> CardNameIndex:
+        """
+        Load the persisted name index, or rebuild it from the store if the
+        store has changed since it was saved. Safe to call from a worker.
+        """
+        with self._index_lock:
+            if self.name_index is not None:
+                return self.name_index
 
-        while page_url:
-            page = self.client.get_page(page_url)
+            path = self._index_path()
+            stamp = self.store.cards_stamp()
+            t0 = time.perf_counter()
 
-            for c in page.get("data", []):
-                cards.append(Card(id=c.get("id", ""), name=c.get("name", "")))
+            index = None
+            if path.exists():
+                try:
+                    index, meta = CardNameIndex.load(path)
+                    if {k: meta.get(k) for k in stamp} != stamp:
+                        index = None
+                except Exception:
+                    self.log.exception("Failed to load name index; rebuilding")
+                    index = None
 
-            if page.get("has_more"):
-                page_url = page.get("next_page")
+            if index is None:
+                index = CardNameIndex()
+                index.add_many(self.store.iter_card_names())
+                index.save(path, meta=stamp)
+                self._index_saved_at = time.monotonic()
+                how = "built"
             else:
-                page_url = None
+                how = "loaded"
 
-        set_obj.cards = cards
-        set_obj.cards_loaded = True
+            self.log.info(
+                f"Name index {how}: {len(index)} names / {index.printing_count} printings "
+                f"in {(time.perf_counter() - t0) * 1000:.0f} ms"
+            )
+            self.name_index = index
+            return index
+
+    def search_cards(self, query: str, limit: int = 50) -> List[SearchHit]:
+        """Ranked name search across every known card ([] until the index is built)."""
+        if self.name_index is None:
+            return []
+        return self.name_index.search(query, limit=limit)
+
+    def import_list(self, entries: Iterable[ListEntry]) -> "ImportResult":
+        """Resolve parsed list entries (core.card_list) to card ids; see ListImporter."""
+        from providers.scryfall.importer import ListImporter
+
+        result = ListImporter(self.store, index=self.build_name_index(), client=self.client).resolve(entries)
+        if result.requests:
+            self._index_dirty = True
+            self._maybe_save_index()
+        return result
+
+    def _index_path(self) -> Path:
+        """The persisted name index for this store: shared default, or <db stem>_name_index.json.gz beside it."""
+        if self.store.path.resolve() == default_store_path().resolve():
+            return app_dir() / "name_index.json.gz"
+        return self.store.path.with_name(f"{self.store.path.stem}_name_index.json.gz")
+
+    def _maybe_save_index(self) -> None:
+        if self.name_index is None or not self._index_dirty:
+            return
+        if time.monotonic() - self._index_saved_at < self.INDEX_SAVE_INTERVAL:
+            return
+        try:
+            self._index_dirty = False
+            self._index_saved_at = time.monotonic()
+            self.name_index.save(self._index_path(), meta=self.store.cards_stamp())
+        except Exception:
+            self.log.exception("Failed to persist name index")
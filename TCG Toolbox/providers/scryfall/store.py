@@ -0,0 +1,503 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from core.paths import app_dir
+from core.portfolio.prices import PRICE_FIELDS
+from providers.scryfall.manifest import SetManifest, listing_hash
+
+
+SCHEMA_VERSION = 5
+
+# Bound parameters per "IN (...)" query (SQLite's default limit is 999 on older builds)
+_IN_CHUNK = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sets (
+    code            TEXT PRIMARY KEY,
+    id              TEXT NOT NULL,
+    name            TEXT NOT NULL,
+    released_at     TEXT,
+    search_uri      TEXT,
+    card_count      INTEGER,
+    raw             TEXT,
+    synced_at       TEXT NOT NULL,
+    cards_synced_at TEXT
+);
+
+CREATE TABLE IF NOT EXISTS cards (
+    id               TEXT PRIMARY KEY,
+    set_code         TEXT NOT NULL,
+    position         INTEGER NOT NULL,
+    name             TEXT NOT NULL,
+    collector_number TEXT,
+    raw              TEXT,
+    synced_at        TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_cards_set ON cards(set_code, position);
+CREATE INDEX IF NOT EXISTS idx_cards_name ON cards(name);
+"""
+
+# user_version -> statements that bring the schema up to that version
+_MIGRATIONS = {
+    2: [
+        # Pagination checkpoint so an interrupted set resumes instead of restarting
+        "ALTER TABLE sets ADD COLUMN resume_uri TEXT",
+        "ALTER TABLE sets ADD COLUMN resume_position INTEGER",
+        "ALTER TABLE sets ADD COLUMN resume_started_at TEXT",
+    ],
+    3: [
+        # Prices as columns so valuation doesn't parse every card's raw JSON
+        *(f"ALTER TABLE cards ADD COLUMN {f} REAL" for f in PRICE_FIELDS),
+        "UPDATE cards SET " + ", ".join(
+            f"{f} = CAST(json_extract(raw, '$.prices.{f}') AS REAL)" for f in PRICE_FIELDS
+        ) + " WHERE raw IS NOT NULL",
+        """
+        CREATE TABLE IF NOT EXISTS holdings (
+            portfolio   TEXT NOT NULL,
+            card_id     TEXT NOT NULL,
+            finish      TEXT NOT NULL,
+            quantity    INTEGER NOT NULL,
+            PRIMARY KEY (portfolio, card_id, finish)
+        )
+        """,
+    ],
+    4: [
+        # List-import lookups that needed fuzzy matching or failed, so a re-import is free
+        """
+        CREATE TABLE IF NOT EXISTS import_aliases (
+            key         TEXT PRIMARY KEY,
+            card_id     TEXT,
+            resolved_at TEXT NOT NULL
+        )
+        """,
+    ],
+    5: [
+        # Per-set sync manifest: the /sets entry as of the last complete sync, for delta syncs
+        """
+        CREATE TABLE IF NOT EXISTS set_manifest (
+            code         TEXT PRIMARY KEY,
+            card_count   INTEGER,
+            released_at  TEXT,
+            content_hash TEXT NOT NULL,
+            synced_at    TEXT NOT NULL
+        )
+        """,
+    ],
+}
+
+_UPSERT_CARD = f"""
+INSERT INTO cards (id, set_code, position, name, collector_number, raw, synced_at, {", ".join(PRICE_FIELDS)})
+VALUES (?, ?, ?, ?, ?, ?, ?, {", ".join("?" * len(PRICE_FIELDS))})
+ON CONFLICT(id) DO UPDATE SET
+    set_code=excluded.set_code, name=excluded.name,
+    position=CASE WHEN excluded.position < 0 THEN cards.position ELSE excluded.position END,
+    collector_number=excluded.collector_number, raw=excluded.raw,
+    synced_at=excluded.synced_at,
+    {", ".join(f"{f}=excluded.{f}" for f in PRICE_FIELDS)}
+"""
+
+
+def utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def default_store_path() -> Path:
+    return app_dir() / "scryfall.db"
+
+
+def _price(value) -> Optional[float]:
+    # Scryfall sends prices as decimal strings, or null
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def card_row(c: dict, set_code: str, position: int, synced_at: str) -> tuple:
+    prices = c.get("prices") or {}
+    return (
+        c.get("id", ""),
+        set_code,
+        position,
+        c.get("name", ""),
+        c.get("collector_number"),
+        json.dumps(c, separators=(",", ":")),
+        synced_at,
+        *(_price(prices.get(f)) for f in PRICE_FIELDS),
+    )
+
+
+class ScryfallStore:
+    """
+    Local SQLite cache of Scryfall sets/cards.
+
+    WAL mode so the ingest thread can write while the UI reads. One connection
+    per thread (sqlite3 connections aren't shareable across threads).
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else default_store_path()
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialized = False
+
+    # ---------- connection ----------
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+            self._ensure_schema(conn)
+        return conn
+
+    def _ensure_schema(self, conn: sqlite3.Connection) -> None:
+        with self._init_lock:
+            if self._initialized:
+                return
+            conn.executescript(_SCHEMA)
+            # One transaction per step, re-reading the version inside it: another
+            # process may be migrating the same file, and a crash mid-step rolls back
+            for target in range(2, SCHEMA_VERSION + 1):
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    if (conn.execute("PRAGMA user_version").fetchone()[0] or 1) < target:
+                        for stmt in _MIGRATIONS.get(target, []):
+                            conn.execute(stmt)
+                        conn.execute(f"PRAGMA user_version={target}")
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+                else:
+                    conn.execute("COMMIT")
+            self._initialized = True
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        else:
+            conn.execute("COMMIT")
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    # ---------- sets ----------
+    def upsert_sets(self, sets: Iterable[dict], synced_at: Optional[str] = None) -> int:
+        synced_at = synced_at or utc_now()
+        rows = [
+            (
+                s.get("code", ""),
+                s.get("id", ""),
+                s.get("name", ""),
+                s.get("released_at"),
+                s.get("search_uri"),
+                s.get("card_count"),
+                json.dumps(s, separators=(",", ":")),
+                synced_at,
+            )
+            for s in sets
+            if s.get("code")
+        ]
+        with self.transaction() as conn:
+            conn.executemany(
+                """
+                INSERT INTO sets (code, id, name, released_at, search_uri, card_count, raw, synced_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(code) DO UPDATE SET
+                    id=excluded.id, name=excluded.name, released_at=excluded.released_at,
+                    search_uri=excluded.search_uri, card_count=excluded.card_count,
+                    raw=excluded.raw, synced_at=excluded.synced_at
+                """,
+                rows,
+            )
+        return len(rows)
+
+    def load_sets(self) -> List[sqlite3.Row]:
+        return self._conn().execute(
+            "SELECT code, id, name, released_at, search_uri, card_count, synced_at, cards_synced_at FROM sets"
+        ).fetchall()
+
+    def sets_synced_at(self) -> Optional[str]:
+        """When the set list was last refreshed from /sets (ensure_sets() stubs don't count)."""
+        row = self._conn().execute("SELECT MAX(synced_at) FROM sets WHERE raw IS NOT NULL").fetchone()
+        return row[0] if row else None
+
+    # ---------- cards ----------
+    def upsert_cards(self, set_code: str, cards: Iterable[dict], start_position: int = 0,
+                     synced_at: Optional[str] = None) -> int:
+        """Write one batch (typically one search page) in a single transaction."""
+        synced_at = synced_at or utc_now()
+        return self.upsert_card_rows(
+            card_row(c, set_code, start_position + i, synced_at) for i, c in enumerate(cards)
+        )
+
+    def upsert_card_rows(self, rows: Iterable[tuple]) -> int:
+        """Write prebuilt card_row() tuples in a single transaction."""
+        rows = list(rows)
+        if not rows:
+            return 0
+        with self.transaction() as conn:
+            conn.executemany(_UPSERT_CARD, rows)
+        return len(rows)
+
+    def ensure_sets(self, sets: Iterable[dict], synced_at: Optional[str] = None) -> None:
+        """
+        Insert minimal set rows for codes we haven't seen (e.g. from bulk card
+        payloads). These stubs have no raw /sets entry, so they don't make the
+        set list look fresh (see sets_synced_at()).
+        """
+        synced_at = synced_at or utc_now()
+        rows = [
+            (s.get("code", ""), s.get("id", ""), s.get("name", ""), s.get("search_uri"), synced_at)
+            for s in sets
+            if s.get("code")
+        ]
+        with self.transaction() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO sets (code, id, name, search_uri, synced_at) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def write_page(self, set_code: str, cards: Iterable[dict], start_position: int, synced_at: str,
+                   next_page: Optional[str]) -> int:
+        """Upsert one search page and move the set's resume checkpoint past it, atomically."""
+        rows = [card_row(c, set_code, start_position + i, synced_at) for i, c in enumerate(cards)]
+        return self.write_page_rows(set_code, rows, start_position, synced_at, next_page)
+
+    def write_page_rows(self, set_code: str, rows: List[tuple], start_position: int, synced_at: str,
+                        next_page: Optional[str]) -> int:
+        """write_page() with prebuilt card_row() tuples (e.g. from the ingest pipeline's normalize stage)."""
+        with self.transaction() as conn:
+            conn.executemany(_UPSERT_CARD, rows)
+            conn.execute(
+                "UPDATE sets SET resume_uri = ?, resume_position = ?, resume_started_at = ? WHERE code = ?",
+                (next_page, start_position + len(rows), synced_at, set_code),
+            )
+        return len(rows)
+
+    def resume_point(self, set_code: str) -> Optional[Tuple[str, int, str]]:
+        """(next page url, position, started_at) of an interrupted sync, if any."""
+        row = self._conn().execute(
+            "SELECT resume_uri, resume_position, resume_started_at FROM sets WHERE code = ?", (set_code,)
+        ).fetchone()
+        if not row or not row["resume_uri"]:
+            return None
+        return row["resume_uri"], row["resume_position"] or 0, row["resume_started_at"]
+
+    def finish_set(self, set_code: str, started_at: str) -> None:
+        """
+        Mark a set's cards complete and drop cards that weren't seen this run.
+        The set's stored /sets entry becomes its sync manifest.
+        """
+        now = utc_now()
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM cards WHERE set_code = ? AND synced_at < ?", (set_code, started_at))
+            conn.execute(
+                """
+                UPDATE sets SET cards_synced_at = ?, resume_uri = NULL, resume_position = NULL,
+                    resume_started_at = NULL
+                WHERE code = ?
+                """,
+                (now, set_code),
+            )
+            row = conn.execute("SELECT card_count, released_at, raw FROM sets WHERE code = ?", (set_code,)).fetchone()
+            if row and row["raw"]:  # bulk ingest only knows a stub of the set
+                conn.execute(
+                    "INSERT OR REPLACE INTO set_manifest (code, card_count, released_at, content_hash, synced_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (set_code, row["card_count"], row["released_at"], listing_hash(json.loads(row["raw"])), now),
+                )
+
+    def load_manifests(self) -> Dict[str, SetManifest]:
+        return {
+            r["code"]: SetManifest(r["code"], r["card_count"], r["released_at"], r["content_hash"], r["synced_at"])
+            for r in self._conn().execute(
+                "SELECT code, card_count, released_at, content_hash, synced_at FROM set_manifest"
+            )
+        }
+
+    def incomplete_sets(self) -> Set[str]:
+        """Sets with an interrupted sync, or whose cards were never fully synced."""
+        return {
+            r[0] for r in self._conn().execute(
+                "SELECT code FROM sets WHERE resume_uri IS NOT NULL OR cards_synced_at IS NULL"
+            )
+        }
+
+    def is_set_synced(self, set_code: str) -> bool:
+        row = self._conn().execute(
+            "SELECT cards_synced_at FROM sets WHERE code = ?", (set_code,)
+        ).fetchone()
+        return bool(row and row["cards_synced_at"])
+
+    def load_partial_cards(self, set_code: str, started_at: str) -> List[sqlite3.Row]:
+        """Cards already written by an interrupted sync that started at `started_at`."""
+        return self._conn().execute(
+            "SELECT id, name, collector_number FROM cards WHERE set_code = ? AND synced_at >= ? ORDER BY position",
+            (set_code, started_at),
+        ).fetchall()
+
+    def load_cards(self, set_code: str) -> Optional[List[sqlite3.Row]]:
+        """Cards for a set in ingest order, or None if the set was never fully synced."""
+        if not self.is_set_synced(set_code):
+            return None
+        return self._conn().execute(
+            "SELECT id, name, collector_number FROM cards WHERE set_code = ? ORDER BY position",
+            (set_code,),
+        ).fetchall()
+
+    def iter_card_names(self) -> Iterator[Tuple[str, str, str]]:
+        """(id, name, set_code) for every stored card; feeds the name index."""
+        yield from self._conn().execute("SELECT id, name, set_code FROM cards")
+
+    def cards_stamp(self) -> dict:
+        """Card count and newest card write; changes whenever the cards table does (name-index freshness)."""
+        count, synced_at = self._conn().execute("SELECT COUNT(*), MAX(synced_at) FROM cards").fetchone()
+        return {"cards": count, "synced_at": synced_at}
+
+    def iter_cards(self, set_codes: Optional[Iterable[str]] = None) -> Iterator[sqlite3.Row]:
+        """Stored cards (set_code, position, id, name, collector_number, raw), by set then position."""
+        sql = "SELECT set_code, position, id, name, collector_number, raw FROM cards"
+        params: tuple = ()
+        if set_codes:
+            params = tuple(set_codes)
+            sql += f" WHERE set_code IN ({','.join('?' * len(params))})"
+        yield from self._conn().execute(sql + " ORDER BY set_code, position", params)
+
+    def existing_card_ids(self, card_ids: Iterable[str]) -> Set[str]:
+        """The subset of `card_ids` the store has."""
+        found: Set[str] = set()
+        ids = list(dict.fromkeys(card_ids))
+        conn = self._conn()
+        for i in range(0, len(ids), _IN_CHUNK):
+            chunk = ids[i:i + _IN_CHUNK]
+            sql = f"SELECT id FROM cards WHERE id IN ({','.join('?' * len(chunk))})"
+            found.update(r[0] for r in conn.execute(sql, chunk))
+        return found
+
+    def card_ids_by_number(self, set_codes: Iterable[str]) -> Dict[Tuple[str, str], str]:
+        """(set_code, collector_number) -> card id for every stored card in `set_codes`."""
+        out: Dict[Tuple[str, str], str] = {}
+        codes = list(dict.fromkeys(set_codes))
+        conn = self._conn()
+        for i in range(0, len(codes), _IN_CHUNK):
+            chunk = codes[i:i + _IN_CHUNK]
+            sql = f"SELECT set_code, collector_number, id FROM cards WHERE set_code IN ({','.join('?' * len(chunk))})"
+            for code, number, card_id in conn.execute(sql, chunk):
+                out[(code, number)] = card_id
+        return out
+
+    def set_release_dates(self) -> Dict[str, str]:
+        return {r[0]: r[1] or "" for r in self._conn().execute("SELECT code, released_at FROM sets")}
+
+    def insert_missing_cards(self, cards: Iterable[dict], synced_at: Optional[str] = None) -> int:
+        """
+        Store cards fetched one by one (e.g. /cards/collection) that we don't
+        have yet. Existing rows are left alone; new ones get position -1 until
+        their set is synced in full.
+        """
+        synced_at = synced_at or utc_now()
+        cards = [c for c in cards if c.get("id")]
+        self.ensure_sets(
+            ({"code": c.get("set", ""), "id": c.get("set_id", ""), "name": c.get("set_name", ""),
+              "search_uri": c.get("set_search_uri")} for c in cards),
+            synced_at=synced_at,
+        )
+        rows = [card_row(c, c.get("set", ""), -1, synced_at) for c in cards]
+        with self.transaction() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                f"INSERT OR IGNORE INTO cards (id, set_code, position, name, collector_number, raw, synced_at, "
+                f"{', '.join(PRICE_FIELDS)}) VALUES (?, ?, ?, ?, ?, ?, ?, {', '.join('?' * len(PRICE_FIELDS))})",
+                rows,
+            )
+            return conn.total_changes - before
+
+    def price_rows(self) -> List[tuple]:
+        """(id, set_code, *PRICE_FIELDS) for every stored card; feeds the portfolio PriceTable."""
+        cur = self._conn().cursor()
+        cur.row_factory = None  # plain tuples: ~3x faster than sqlite3.Row for 100k+ rows
+        return cur.execute(f"SELECT id, set_code, {', '.join(PRICE_FIELDS)} FROM cards").fetchall()
+
+    # ---------- import aliases ----------
+    def load_aliases(self, keys: Iterable[str], negative_since: str) -> Dict[str, Optional[str]]:
+        """
+        Remembered import lookups: key -> card id, or None for a miss. Misses
+        recorded before `negative_since` are ignored (the card may exist now).
+        """
+        out: Dict[str, Optional[str]] = {}
+        keys = list(dict.fromkeys(keys))
+        conn = self._conn()
+        for i in range(0, len(keys), _IN_CHUNK):
+            chunk = keys[i:i + _IN_CHUNK]
+            sql = f"SELECT key, card_id, resolved_at FROM import_aliases WHERE key IN ({','.join('?' * len(chunk))})"
+            for key, card_id, resolved_at in conn.execute(sql, chunk):
+                if card_id is not None or resolved_at >= negative_since:
+                    out[key] = card_id
+        return out
+
+    def save_aliases(self, rows: Iterable[Tuple[str, Optional[str]]]) -> None:
+        now = utc_now()
+        with self.transaction() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO import_aliases (key, card_id, resolved_at) VALUES (?, ?, ?)",
+                [(key, card_id, now) for key, card_id in rows],
+            )
+
+    # ---------- holdings ----------
+    def upsert_holdings(self, portfolio: str, rows: Iterable[Tuple[str, str, int]]) -> int:
+        """Set (card_id, finish, quantity) holdings; a quantity <= 0 removes the row."""
+        rows = list(rows)
+        with self.transaction() as conn:
+            conn.executemany(
+                """
+                INSERT INTO holdings (portfolio, card_id, finish, quantity) VALUES (?, ?, ?, ?)
+                ON CONFLICT(portfolio, card_id, finish) DO UPDATE SET quantity=excluded.quantity
+                """,
+                [(portfolio, card_id, finish, qty) for card_id, finish, qty in rows if qty > 0],
+            )
+            conn.executemany(
+                "DELETE FROM holdings WHERE portfolio = ? AND card_id = ? AND finish = ?",
+                [(portfolio, card_id, finish) for card_id, finish, qty in rows if qty <= 0],
+            )
+        return len(rows)
+
+    def load_holdings(self, portfolio: str) -> List[tuple]:
+        """(card_id, finish, quantity) rows of one portfolio."""
+        return self._conn().execute(
+            "SELECT card_id, finish, quantity FROM holdings WHERE portfolio = ?", (portfolio,)
+        ).fetchall()
+
+    def portfolios(self) -> List[str]:
+        return [r[0] for r in self._conn().execute("SELECT DISTINCT portfolio FROM holdings ORDER BY portfolio")]
+
+    def counts(self) -> dict:
+        conn = self._conn()
+        return {
+            "sets": conn.execute("SELECT COUNT(*) FROM sets").fetchone()[0],
+            "sets_synced": conn.execute("SELECT COUNT(*) FROM sets WHERE cards_synced_at IS NOT NULL").fetchone()[0],
+            "sets_resumable": conn.execute("SELECT COUNT(*) FROM sets WHERE resume_uri IS NOT NULL").fetchone()[0],
+            "cards": conn.execute("SELECT COUNT(*) FROM cards").fetchone()[0],
+            "sets_synced_at": conn.execute("SELECT MAX(synced_at) FROM sets WHERE raw IS NOT NULL").fetchone()[0],
+            "cards_synced_at": conn.execute("SELECT MAX(cards_synced_at) FROM sets").fetchone()[0],
+        }
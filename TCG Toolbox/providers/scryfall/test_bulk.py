@@ -0,0 +1,28 @@
+import io
+import json
+
+import pytest
+
+from providers.scryfall.bulk import BulkFormatError, iter_json_array
+
+CASES = [
+    "[]",
+    "[ 7 ]",
+    "[1.5, 20]",
+    "[1e+5,2E-3,-0.25,3,0]",
+    '[{"id": "a", "prices": {"usd": "1.25", "eur": null}}, {"id": "b", "n": 12.5e1}]',
+    '["x", true, false, null, "\\u00e9\\"]", [1, [2.75]]]',
+    "\n[\n  1.5 ,\n  -20\n]\n",
+]
+
+
+@pytest.mark.parametrize("chunk_size", range(1, 8))
+@pytest.mark.parametrize("text", CASES)
+def test_matches_json_loads_across_chunk_sizes(text, chunk_size):
+    assert list(iter_json_array(io.StringIO(text), chunk_size=chunk_size)) == json.loads(text)
+
+
+@pytest.mark.parametrize("text", ['{"a": 1}', "[1 2]"])
+def test_rejects_non_arrays(text):
+    with pytest.raises(BulkFormatError):
+        list(iter_json_array(io.StringIO(text), chunk_size=3))
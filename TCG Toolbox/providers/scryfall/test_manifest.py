@@ -0,0 +1,27 @@
+from datetime import date
+
+from providers.scryfall.manifest import SetManifest, listing_hash, plan_sync
+
+
+def _set(code, released_at="2020-01-01", card_count=100):
+    return {"code": code, "name": code.upper(), "released_at": released_at, "card_count": card_count}
+
+
+def _manifest(s):
+    return SetManifest(s["code"], s["card_count"], s["released_at"], listing_hash(s), "2026-01-01T00:00:00+00:00")
+
+
+def test_plan_sync_reasons():
+    unchanged, changed, partial, recent = _set("aaa"), _set("bbb"), _set("ccc"), _set("ddd", "2026-09-30")
+    manifests = {s["code"]: _manifest(s) for s in (unchanged, changed, partial, recent)}
+    listing = [unchanged, dict(changed, card_count=120), partial, recent, _set("eee")]
+
+    plan = plan_sync(listing, manifests, incomplete={"ccc"}, reverify_days=30, today=date(2026, 10, 18))
+
+    assert plan.reasons == {"bbb": "changed", "ccc": "incomplete", "ddd": "recent", "eee": "new"}
+    assert [s["code"] for s in plan.fetch] == ["bbb", "ccc", "ddd", "eee"]
+    assert [s["code"] for s in plan.skipped] == ["aaa"]
+    # Key order in the listing doesn't count as a change
+    assert listing_hash(dict(reversed(list(unchanged.items())))) == listing_hash(unchanged)
+    # reverify_days=-1 never refetches a set just for being recent
+    assert "ddd" not in plan_sync(listing, manifests, {"ccc"}, reverify_days=-1, today=date(2026, 10, 18)).reasons
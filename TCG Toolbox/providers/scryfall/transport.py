@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import random
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import FrozenSet, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from core.log import get_logger
+from core.metrics import METRICS
+from providers.scryfall.ratelimit import TokenBucket
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_attempts: int = 6
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+    retry_statuses: FrozenSet[int] = frozenset({429, 500, 502, 503, 504})
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff: uniform(0, min(max_delay, base * 2^attempt))."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After is either delta-seconds or an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def build_session(user_agent: str, pool_size: int = 16) -> requests.Session:
+    session = requests.Session()
+    # Retries are ours (below), so urllib3's own are off. pool_block makes extra
+    # concurrent callers wait for a connection instead of opening throwaway ones.
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0, pool_block=True)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        "User-Agent": user_agent,
+        "Accept": "application/json;q=0.9,*/*;q=0.8",
+    })
+    return session
+
+
+class Transport:
+    """
+    Rate-limited, retrying HTTP transport shared by the Scryfall client.
+
+    Connection errors, timeouts and retryable statuses (429/5xx) are retried
+    with jittered exponential backoff. A Retry-After header wins over the
+    backoff and also pauses the shared limiter, so every concurrent caller
+    backs off, not just the one that got throttled.
+
+    Records into METRICS: http.request_s, http.responses[status],
+    http.throttle_s (limiter waits), http.retries[reason], http.backoff_s.
+    """
+
+    def __init__(self, session: requests.Session, limiter: TokenBucket,
+                 policy: Optional[RetryPolicy] = None):
+        self.session = session
+        self.limiter = limiter
+        self.policy = policy or RetryPolicy()
+        self.log = get_logger("scryfall.transport")
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        policy = self.policy
+        last = policy.max_attempts - 1
+
+        for attempt in range(policy.max_attempts):
+            retry_after = None
+            waited = self.limiter.acquire()
+            if waited:
+                METRICS.counter("http.throttle_s").inc(waited)
+            t0 = time.perf_counter()
+            try:
+                resp = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                METRICS.counter("http.errors", label=type(e).__name__).inc()
+                if attempt == last:
+                    raise
+                delay = policy.backoff(attempt)
+                reason = type(e).__name__
+            else:
+                METRICS.histogram("http.request_s").observe(time.perf_counter() - t0)
+                METRICS.counter("http.responses", label=str(resp.status_code)).inc()
+                if resp.status_code not in policy.retry_statuses or attempt == last:
+                    return resp
+
+                retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+                if retry_after is not None:
+                    delay = min(retry_after, policy.max_delay)
+                    self.limiter.pause(delay)
+                else:
+                    delay = policy.backoff(attempt)
+                reason = f"HTTP {resp.status_code}"
+                resp.close()
+
+            self.log.warning(f"{reason} for {url}; retry {attempt + 1}/{last} in {delay:.2f}s")
+            METRICS.counter("http.retries", label=reason).inc()
+            METRICS.counter("http.backoff_s").inc(delay)
+            if retry_after is None:
+                time.sleep(delay)
+            # else: the paused limiter makes the next acquire() wait it out
+
+        raise AssertionError("unreachable")
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
@@ -1,11 +1,17 @@
-from PySide6.QtWidgets import QMainWindow, QDockWidget, QStatusBar, QWidget
+import time
+from typing import Callable
+
+from PySide6.QtWidgets import QMainWindow, QDockWidget, QStatusBar, QWidget, QLabel
 from PySide6.QtGui import QAction
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
+
+from core.log import get_logger
 
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("TCG Toolbox")
+        self.log = get_logger("ui")
 
         # Dock registry so we can re-open panels from the View menu
         self._dock_actions = {}   # title -> QAction
@@ -26,8 +32,45 @@ class MainWindow(QMainWindow):
         self.setCentralWidget(QWidget(self))
 
     def add_dock(self, title: str, widget, area=Qt.LeftDockWidgetArea) -> QDockWidget:
-        dock = QDockWidget(title, self)
+        dock = self._new_dock(title, area)
         dock.setWidget(widget)
+        return dock
+
+    def add_lazy_dock(self, title: str, factory: Callable[[], QWidget],
+                      area=Qt.LeftDockWidgetArea) -> QDockWidget:
+        """
+        Dock whose widget is only imported/built the first time it's shown,
+        one event-loop turn later so the window paints first.
+        """
+        dock = self._new_dock(title, area)
+        placeholder = QLabel("Loading…")
+        placeholder.setAlignment(Qt.AlignCenter)
+        dock.setWidget(placeholder)
+
+        def build():
+            if dock.widget() is not placeholder:
+                return
+            t0 = time.perf_counter()
+            try:
+                widget = factory()
+            except Exception:
+                self.log.exception(f"Failed to load panel: {title}")
+                placeholder.setText(f"{title} failed to load (see log)")
+                return
+            dock.setWidget(widget)
+            placeholder.deleteLater()
+            self.log.info(f"Panel loaded: {title} in {(time.perf_counter() - t0) * 1000:.0f} ms")
+
+        def on_visibility(visible: bool):
+            if visible and dock.widget() is placeholder:
+                QTimer.singleShot(0, build)
+
+        dock.visibilityChanged.connect(on_visibility)
+        return dock
+
+    def _new_dock(self, title: str, area) -> QDockWidget:
+        dock = QDockWidget(title, self)
+        dock.setObjectName(title)
         dock.setAllowedAreas(Qt.AllDockWidgetAreas)
         dock.setFeatures(
             QDockWidget.DockWidgetMovable
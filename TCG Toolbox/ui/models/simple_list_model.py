@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import Callable, Generic, List, Optional, TypeVar
+from difflib import SequenceMatcher
+from typing import Callable, Generic, Hashable, Optional, Sequence, TypeVar
 from PySide6.QtCore import QAbstractListModel, QModelIndex, Qt
 
 T = TypeVar("T")
@@ -9,27 +10,34 @@ T = TypeVar("T")
 class SimpleListModel(QAbstractListModel, Generic[T]):
     """
     Reusable list model:
-      - items: list[T]
+      - items: Sequence[T] (lists are copied; other sequences, e.g. a
+        CardTable, are used in place so rows are read straight from columns)
       - display_fn: T -> str
       - tooltip_fn: T -> str (optional)
+
+    Besides set_items() (full reset) it supports row-level updates that keep
+    scroll position and selection: append/insert/remove, update_items()
+    (batched diff), and grow_to() for a shared sequence that is being filled
+    by a worker (only rows announced through grow_to() are visible).
     """
 
     def __init__(
         self,
-        items: Optional[List[T]] = None,
+        items: Optional[Sequence[T]] = None,
         display_fn: Optional[Callable[[T], str]] = None,
         tooltip_fn: Optional[Callable[[T], str]] = None,
         parent=None,
     ):
         super().__init__(parent)
-        self._items: List[T] = list(items or [])
+        self._items: Sequence[T] = self._adopt(items)
+        self._count = len(self._items)
         self._display_fn = display_fn or (lambda x: str(x))
         self._tooltip_fn = tooltip_fn  # optional
 
     def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
         if parent.isValid():
             return 0
-        return len(self._items)
+        return self._count
 
     def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
         if not index.isValid():
@@ -49,7 +57,78 @@ class SimpleListModel(QAbstractListModel, Generic[T]):
     def item_at(self, row: int) -> T:
         return self._items[row]
 
-    def set_items(self, items: Optional[List[T]]) -> None:
+    @property
+    def items(self) -> Sequence[T]:
+        return self._items
+
+    def set_items(self, items: Optional[Sequence[T]]) -> None:
         self.beginResetModel()
-        self._items = list(items or [])
+        self._items = self._adopt(items)
+        self._count = len(self._items)
         self.endResetModel()
+
+    # ---------- incremental updates ----------
+    def grow_to(self, count: int) -> None:
+        """The (shared, in-place) sequence now has `count` rows; announce the new tail."""
+        if count <= self._count:
+            return
+        self.beginInsertRows(QModelIndex(), self._count, count - 1)
+        self._count = count
+        self.endInsertRows()
+
+    def append_items(self, items: Sequence[T]) -> None:
+        self.insert_items(self._count, items)
+
+    def insert_items(self, row: int, items: Sequence[T]) -> None:
+        if not items:
+            return
+        self._own_items()
+        self.beginInsertRows(QModelIndex(), row, row + len(items) - 1)
+        self._items[row:row] = list(items)
+        self._count = len(self._items)
+        self.endInsertRows()
+
+    def remove_rows(self, row: int, count: int) -> None:
+        if count <= 0:
+            return
+        self._own_items()
+        self.beginRemoveRows(QModelIndex(), row, row + count - 1)
+        del self._items[row:row + count]
+        self._count = len(self._items)
+        self.endRemoveRows()
+
+    def update_items(self, items: Sequence[T], key_fn: Optional[Callable[[T], Hashable]] = None) -> None:
+        """
+        Move to `items` with the minimal insert/remove/dataChanged batches
+        instead of a reset, matching rows by key_fn (identity by default).
+        """
+        key_fn = key_fn or id
+        self._own_items()
+        new = list(items)
+        old_keys = [key_fn(x) for x in self._items]
+        new_keys = [key_fn(x) for x in new]
+
+        opcodes = SequenceMatcher(None, old_keys, new_keys, autojunk=False).get_opcodes()
+        # Apply back to front so earlier row numbers stay valid
+        for tag, i1, i2, j1, j2 in reversed(opcodes):
+            if tag == "equal":
+                self._items[i1:i2] = new[j1:j2]
+                self.dataChanged.emit(self.index(i1), self.index(i2 - 1))
+                continue
+            if tag in ("replace", "delete"):
+                self.remove_rows(i1, i2 - i1)
+            if tag in ("replace", "insert"):
+                self.insert_items(i1, new[j1:j2])
+
+    def _own_items(self) -> None:
+        # Row edits need a private list; a shared sequence is copied (visible rows only) once
+        if not isinstance(self._items, list):
+            self._items = [self._items[i] for i in range(self._count)]
+
+    @staticmethod
+    def _adopt(items: Optional[Sequence[T]]) -> Sequence[T]:
+        if items is None:
+            return []
+        if isinstance(items, list):
+            return list(items)
+        return items
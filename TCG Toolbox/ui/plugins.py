@@ -0,0 +1,41 @@
+import importlib
+import importlib.util
+import pkgutil
+from types import ModuleType
+from typing import List
+
+from core.log import get_logger
+
+log = get_logger("plugins")
+
+
+def discover_plugins(package: str = "modules") -> List[ModuleType]:
+    """
+    Import every `<package>.<name>.plugin` module, sorted by its ORDER.
+
+    Plugin modules are kept import-light (panels are imported inside their
+    factory), so discovery costs milliseconds; see add_lazy_dock().
+    """
+    pkg = importlib.import_module(package)
+    found = []
+    for info in pkgutil.iter_modules(pkg.__path__):
+        if not info.ispkg:
+            continue
+        name = f"{package}.{info.name}.plugin"
+        if importlib.util.find_spec(name) is None:
+            continue
+        try:
+            found.append(importlib.import_module(name))
+        except Exception:
+            log.exception(f"Failed to import plugin {name}")
+    return sorted(found, key=lambda m: getattr(m, "ORDER", 100))
+
+
+def register_plugins(main_window, package: str = "modules") -> List[ModuleType]:
+    plugins = discover_plugins(package)
+    for plugin in plugins:
+        try:
+            plugin.register(main_window)
+        except Exception:
+            log.exception(f"Failed to register plugin {plugin.__name__}")
+    return plugins
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from PySide6.QtCore import QObject, QTimer
+
+from core.log import get_logger
+from core.metrics import METRICS
+
+log = get_logger("ui.watchdog")
+
+SLOW_TASK = 0.05        # a timer callback longer than this gets logged
+STALL = 0.25            # main thread unresponsive this long = a stall
+REPORT_EVERY = 5.0      # per callable, at most one slow-task line per this many seconds
+_APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_SELF = os.path.abspath(__file__)
+
+_last_report: Dict[str, float] = {}
+_suppressed: Counter = Counter()
+
+
+def _callable_name(fn: Callable) -> str:
+    owner = getattr(fn, "__self__", None)
+    name = getattr(fn, "__qualname__", None) or getattr(fn, "__name__", None) or repr(fn)
+    if owner is not None and "." not in name:
+        name = f"{type(owner).__name__}.{name}"
+    return name
+
+
+def watch_timer(timer: QTimer, fn: Callable[[], None], name: Optional[str] = None) -> Callable[[], None]:
+    """
+    Connect `fn` to timer.timeout, timing each call. Records ui.task_s and
+    ui.timer_lateness_s (labelled by callable name) and logs calls slower
+    than SLOW_TASK. Returns the wrapper that was connected.
+    """
+    name = name or _callable_name(fn)
+    # Metrics are looked up per call, not held: METRICS.reset() drops the objects
+    last: List[float] = []
+
+    def watched():
+        start = time.perf_counter()
+        if last and not timer.isSingleShot():
+            METRICS.histogram("ui.timer_lateness_s", label=name).observe(max(0.0, start - last[0] - timer.interval() / 1000))
+        try:
+            fn()
+        finally:
+            end = time.perf_counter()
+            last[:] = [end]
+            METRICS.histogram("ui.task_s", label=name).observe(end - start)
+            if end - start >= SLOW_TASK:
+                _report_slow(name, end - start)
+
+    timer.timeout.connect(watched)
+    return watched
+
+
+def _throttled(key: str) -> Optional[int]:
+    """None if `key` was reported within REPORT_EVERY, else how many reports were skipped since."""
+    now = time.monotonic()
+    if now - _last_report.get(key, 0.0) < REPORT_EVERY:
+        _suppressed[key] += 1
+        return None
+    _last_report[key] = now
+    return _suppressed.pop(key, 0)
+
+
+def _report_slow(name: str, seconds: float) -> None:
+    skipped = _throttled(name)
+    if skipped is not None:
+        extra = f" (+{skipped} more since last report)" if skipped else ""
+        log.warning(f"Slow UI task: {name} took {seconds * 1000:.0f} ms{extra}")
+
+
+def _app_frames(frame) -> List[str]:
+    """'file.py:function' for the frames of our own code, outermost first."""
+    out = []
+    while frame is not None:
+        code = frame.f_code
+        if code.co_filename.startswith(_APP_ROOT) and code.co_filename != _SELF:
+            out.append(f"{Path(code.co_filename).name}:{code.co_name}")
+        frame = frame.f_back
+    return out[::-1]
+
+
+def _innermost(frame) -> str:
+    code = frame.f_code
+    return f"{Path(code.co_filename).name}:{code.co_name}:{frame.f_lineno}"
+
+
+class UiWatchdog(QObject):
+    """
+    Detects main-thread stalls of any origin, not just watched timers.
+
+    A heartbeat QTimer on the GUI thread stamps the time every `interval`;
+    a monitor thread notices when the stamp goes stale for more than
+    `stall` seconds and samples the GUI thread's stack while it is still
+    stuck, so the log names the code that blocked the event loop.
+    """
+
+    def __init__(self, parent: Optional[QObject] = None, interval: float = 0.05, stall: float = STALL):
+        super().__init__(parent)
+        self.interval = interval
+        self.stall = stall
+        self._beat = time.monotonic()
+        self._main_id = threading.main_thread().ident
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(int(interval * 1000))
+        self._timer.timeout.connect(self._heartbeat)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._beat = time.monotonic()
+        self._timer.start()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._monitor, name="ui-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._timer.stop()
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(1.0)
+            self._thread = None
+
+    def _heartbeat(self) -> None:
+        now = time.monotonic()
+        METRICS.histogram("ui.heartbeat_lateness_s").observe(max(0.0, now - self._beat - self.interval))
+        self._beat = now
+
+    # ---------- monitor thread ----------
+    def _monitor(self) -> None:
+        stacks: Counter = Counter()
+        where = ""
+        stalled_since: Optional[float] = None
+
+        while not self._stop.wait(self.interval):
+            beat = self._beat
+            age = time.monotonic() - beat
+            if age > self.stall:
+                if stalled_since is None:
+                    stalled_since, stacks, where = beat, Counter(), ""
+                frame = sys._current_frames().get(self._main_id)
+                if frame is not None:
+                    stacks[" > ".join(_app_frames(frame)) or "(Qt / library code)"] += 1
+                    where = where or _innermost(frame)
+                    del frame
+            elif stalled_since is not None:
+                self._report(max(0.0, beat - stalled_since - self.interval), stacks, where)
+                stalled_since = None
+
+    @staticmethod
+    def _report(seconds: float, stacks: Counter, where: str) -> None:
+        METRICS.counter("ui.stalls").inc()
+        METRICS.histogram("ui.stall_s").observe(seconds)
+        stack = stacks.most_common(1)[0][0] if stacks else "(no sample)"
+        skipped = _throttled(f"stall:{stack}")
+        if skipped is None:
+            return
+        extra = f" (+{skipped} more since last report)" if skipped else ""
+        log.warning(f"UI stalled {seconds * 1000:.0f} ms in {stack} [{where}]{extra}")
+        if len(stacks) > 1:
+            others = "; ".join(f"{s} x{n}" for s, n in stacks.most_common()[1:4])
+            log.debug(f"Other stacks seen during the stall: {others}")